@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Parser Vectorized Angka Format Akuntansi
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Export CSV dataset BPP (contoh: DATABASE BPP.csv) menyimpan angka dalam
+format akuntansi:
+- "  1,958,599,245 "  -> 1958599245
+- "  (135,948,923)"   -> -135948923
+- "  -   "            -> 0
+dan nama kolom dengan spasi berlebih (" Produksi (kWh) ").
+
+Parser di modul ini mengubah satu kolom utuh sekaligus lewat kernel
+string pyarrow.compute (tanpa loop per sel di Python). Sel yang
+tidak bisa di-parse menjadi NaN dan dicatat di laporan (baris, kolom,
+nilai asli) agar bisa ditelusuri.
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Pola angka yang valid setelah tanda kurung & spasi dibuang
+# (pemisah ribuan harus berkelompok 3 digit, contoh: 1,958,599,245.5)
+NUMBER_PATTERN = r"^[+-]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?$"
+
+# Nilai yang berarti nol di format akuntansi
+ZERO_TOKENS = pa.array(["-", "–"])
+
+
+def normalize_header(name):
+    """Membuang spasi di awal/akhir dan spasi ganda di tengah nama kolom."""
+    return " ".join(str(name).split())
+
+
+def normalize_headers(df):
+    """Return salinan ringan df dengan nama kolom yang sudah dinormalisasi."""
+    return df.rename(columns=normalize_header)
+
+
+def parse_accounting_column(series, downcast_int=True):
+    """
+    Mengubah satu kolom format akuntansi menjadi angka dalam satu pass.
+
+    Return (values, invalid_mask):
+    - values: float64, atau int64 jika downcast_int=True dan semua nilai
+      bulat tanpa NaN
+    - invalid_mask: True untuk sel berisi teks yang tidak bisa di-parse
+      (sel kosong / NaN dianggap data hilang, bukan error)
+    Kolom yang sudah numerik dikembalikan apa adanya.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series, pd.Series(False, index=series.index)
+
+    arr = _to_arrow_strings(series)
+    text = pc.utf8_trim_whitespace(arr)
+    missing = pc.fill_null(pc.equal(text, ""), True)
+
+    # Tanda kurung hanya dibuang sebagai pasangan pembuka-penutup; kurung
+    # lain (contoh: "(5" atau "1,958)") tersisa di core sehingga tidak valid
+    negative = pc.fill_null(
+        pc.and_(pc.starts_with(text, "("), pc.ends_with(text, ")")), False
+    )
+    core = pc.if_else(negative, pc.utf8_slice_codeunits(text, 1, -1), text)
+    core = pc.utf8_trim_whitespace(core)
+    core = pc.if_else(pc.is_in(core, value_set=ZERO_TOKENS), "0", core)
+    valid = pc.fill_null(pc.match_substring_regex(core, NUMBER_PATTERN), False)
+    # Tanda minus / plus di dalam kurung (contoh: "(-5)") ambigu, tidak valid
+    signed = pc.fill_null(pc.match_substring_regex(core, r"^[+-]"), False)
+    valid = pc.and_(valid, pc.invert(pc.and_(negative, signed)))
+
+    numbers = pc.replace_substring(pc.if_else(valid, core, None), ",", "")
+    values = pc.cast(numbers, pa.float64())
+    values = pc.if_else(negative, pc.negate(values), values)
+    values = values.to_numpy(zero_copy_only=False)
+
+    invalid = pc.and_(pc.invert(valid), pc.invert(missing)).to_numpy(zero_copy_only=False)
+    invalid = pd.Series(invalid, index=series.index)
+    result = pd.Series(values, index=series.index, name=series.name)
+    if downcast_int and not np.isnan(values).any() and np.array_equal(values, np.round(values)):
+        result = result.astype(np.int64)
+    return result, invalid
+
+
+def _to_arrow_strings(series):
+    """Kolom string[pyarrow] dipakai langsung, kolom object dikonversi sekali."""
+    if isinstance(series.dtype, pd.StringDtype) and series.dtype.storage == "pyarrow":
+        return pa.array(series.array)
+    return pa.array(series.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+
+
+def parse_accounting_frame(df, columns=None, downcast_int=True):
+    """
+    Normalisasi header lalu parse kolom format akuntansi.
+
+    columns: daftar kolom (nama setelah normalisasi) yang di-parse; default
+    semua kolom bertipe teks yang mayoritas isinya angka akuntansi.
+
+    Return (frame, report), report berisi sel yang gagal di-parse dengan
+    kolom row, column, value.
+    """
+    frame = normalize_headers(df)
+    if columns is None:
+        columns = [c for c in frame.columns if _looks_numeric(frame[c])]
+
+    issues = []
+    for col in columns:
+        values, invalid = parse_accounting_column(frame[col], downcast_int)
+        if invalid.any():
+            issues.append(
+                pd.DataFrame(
+                    {
+                        "row": frame.index[invalid.to_numpy()],
+                        "column": col,
+                        "value": frame.loc[invalid, col].to_numpy(),
+                    }
+                )
+            )
+        frame[col] = values
+
+    report = (
+        pd.concat(issues, ignore_index=True)
+        if issues
+        else pd.DataFrame(columns=["row", "column", "value"])
+    )
+    return frame, report
+
+
+def _looks_numeric(series, sample_size=100):
+    """Kolom teks dianggap angka akuntansi jika >50% sampel bisa di-parse."""
+    if pd.api.types.is_numeric_dtype(series):
+        return False
+    sample = series.dropna().head(sample_size)
+    if sample.empty:
+        return False
+    _, invalid = parse_accounting_column(sample, downcast_int=False)
+    return invalid.mean() < 0.5
+
+
+def read_accounting_csv(path_or_buffer, **kwargs):
+    """
+    pd.read_csv untuk export berformat akuntansi. Semua sel dibaca sebagai
+    string Arrow agar langsung bisa diproses parser. Return (frame, report).
+    """
+    df = pd.read_csv(path_or_buffer, dtype="string[pyarrow]", keep_default_na=False, **kwargs)
+    return parse_accounting_frame(df)
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Bundle Artefak Model BPP
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Semua artefak (model, scaler, nilai SHAP, bobot NN) digabung ke satu file
+zip (tanpa kompresi) berisi manifest.json. Manifest mencatat urutan fitur,
+hash dataset training, versi setiap model dan checksum SHA-256 per file,
+sehingga artefak yang tidak cocok langsung terdeteksi saat load.
+
+Loader membaca & memverifikasi semua member secara paralel dalam satu
+pass; deserialisasi tetap lazy per artefak (lihat model_registry.py).
+
+Cara build / verifikasi bundle:
+    python artifact_bundle.py build
+    python artifact_bundle.py verify
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import hashlib
+import io
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from nn_engine import load_compiled_keras, load_numpy_network
+
+# Versi format bundle
+FORMAT_VERSION = 1
+
+# Nama file bundle & manifest
+BUNDLE_FILE = "model_bpp_bundle.zip"
+MANIFEST_NAME = "manifest.json"
+
+# Dataset yang dipakai saat training (untuk hash dataset di manifest)
+DATASET_FILE = "DATABASE BPP_EXCEL.xlsx"
+
+# Jumlah thread untuk membaca member bundle
+MAX_WORKERS = 4
+
+
+class BundleIntegrityError(ValueError):
+    """Isi bundle tidak sesuai manifest (checksum, ukuran atau file hilang)."""
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ============ DESERIALISASI DARI BYTES ============
+def _loads_keras(data):
+    """load_model keras butuh path, jadi bytes ditulis ke file sementara."""
+    fd, path = tempfile.mkstemp(suffix=".keras")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return load_compiled_keras(path)
+    finally:
+        os.remove(path)
+
+
+LOADERS = {
+    ".keras": _loads_keras,
+    ".npz": lambda data: load_numpy_network(io.BytesIO(data)),
+}
+
+
+def deserialize(file_name, data):
+    """Mengubah bytes artefak menjadi objek sesuai ekstensi (default: pickle)."""
+    loader = LOADERS.get(os.path.splitext(file_name)[1], pickle.loads)
+    return loader(data)
+
+
+# ============ BUNDLE ============
+class ArtifactBundle:
+    """
+    Isi bundle yang sudah dibaca & diverifikasi: manifest + bytes per file.
+    """
+
+    def __init__(self, path, manifest, members, read_seconds):
+        self.path = path
+        self.manifest = manifest
+        self._members = members
+        self.read_seconds = read_seconds
+
+    def has(self, file_name):
+        return file_name in self._members
+
+    def read(self, file_name):
+        if file_name not in self._members:
+            raise BundleIntegrityError(f"File {file_name} tidak ada di bundle")
+        return self._members[file_name]
+
+    def load(self, file_name):
+        return deserialize(file_name, self.read(file_name))
+
+    def version(self, file_name):
+        return self.manifest["artifacts"][file_name]["version"]
+
+    @property
+    def feature_columns(self):
+        return self.manifest.get("feature_columns")
+
+    def stats(self):
+        return {
+            "bundle_file": os.path.basename(self.path),
+            "format_version": self.manifest.get("format_version"),
+            "created_at": self.manifest.get("created_at"),
+            "members": len(self._members),
+            "bytes": sum(len(b) for b in self._members.values()),
+            "read_seconds": self.read_seconds,
+        }
+
+
+def _read_member(path, name, expected):
+    """Membaca satu member (handle zip per thread) dan verifikasi checksum."""
+    with zipfile.ZipFile(path) as zf:
+        data = zf.read(name)
+    if len(data) != expected["bytes"] or sha256_bytes(data) != expected["sha256"]:
+        raise BundleIntegrityError(f"Checksum {name} tidak sesuai manifest")
+    return name, data
+
+
+def load_bundle(path, max_workers=MAX_WORKERS):
+    """
+    Membaca manifest lalu semua member secara paralel, sekaligus
+    memverifikasi ukuran & checksum SHA-256 setiap file.
+    """
+    start = time.perf_counter()
+    with zipfile.ZipFile(path) as zf:
+        manifest = json.loads(zf.read(MANIFEST_NAME))
+        names = set(zf.namelist())
+
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise BundleIntegrityError(
+            f"Format bundle {manifest.get('format_version')} tidak didukung"
+        )
+
+    artifacts = manifest["artifacts"]
+    missing = [name for name in artifacts if name not in names]
+    if missing:
+        raise BundleIntegrityError(f"File hilang dari bundle: {missing}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_read_member, path, name, info)
+            for name, info in artifacts.items()
+        ]
+        members = dict(f.result() for f in futures)
+
+    return ArtifactBundle(path, manifest, members, time.perf_counter() - start)
+
+
+def build_bundle(base_dir=".", dst=BUNDLE_FILE):
+    """
+    Menggabungkan semua artefak di ARTIFACT_FILES ke satu bundle zip
+    beserta manifest (urutan fitur, hash dataset, versi & checksum).
+    """
+    from model_registry import ARTIFACT_FILES
+
+    file_names = sorted(set(ARTIFACT_FILES.values()) | {"model_bpp.keras", "model_bpp_nn.npz"})
+
+    artifacts = {}
+    for name in file_names:
+        digest = sha256_file(os.path.join(base_dir, name))
+        artifacts[name] = {
+            "sha256": digest,
+            "bytes": os.path.getsize(os.path.join(base_dir, name)),
+            "version": digest[:12],
+        }
+
+    with open(os.path.join(base_dir, "preprocess_bpp_columntransformer.pkl"), "rb") as f:
+        scaler = pickle.load(f)
+
+    dataset_path = os.path.join(base_dir, DATASET_FILE)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "feature_columns": [str(c) for c in scaler.feature_names_in_],
+        "target": "BPP",
+        "dataset": {
+            "file": DATASET_FILE,
+            "sha256": sha256_file(dataset_path) if os.path.exists(dataset_path) else None,
+        },
+        "artifacts": artifacts,
+    }
+
+    dst_path = os.path.join(base_dir, dst)
+    with zipfile.ZipFile(dst_path, "w", compression=zipfile.ZIP_STORED) as zf:
+        zf.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+        for name in file_names:
+            zf.write(os.path.join(base_dir, name), arcname=name)
+    return manifest
+
+
+def verify_bundle(base_dir=".", path=BUNDLE_FILE):
+    """
+    Memverifikasi bundle dan membandingkan dengan file artefak lepas
+    di base_dir. Mengembalikan daftar file yang berbeda dari bundle.
+    """
+    bundle = load_bundle(os.path.join(base_dir, path))
+    mismatched = []
+    for name, info in bundle.manifest["artifacts"].items():
+        loose = os.path.join(base_dir, name)
+        if os.path.exists(loose) and sha256_file(loose) != info["sha256"]:
+            mismatched.append(name)
+    return bundle, mismatched
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "verify"
+    if command == "build":
+        manifest = build_bundle()
+        print(f"Bundle {BUNDLE_FILE} dibuat dengan {len(manifest['artifacts'])} artefak")
+    elif command == "verify":
+        bundle, mismatched = verify_bundle()
+        print(json.dumps(bundle.stats(), indent=2))
+        if mismatched:
+            sys.exit(f"Artefak berbeda dengan bundle (jalankan build ulang): {mismatched}")
+    else:
+        sys.exit(f"Perintah tidak dikenal: {command} (gunakan build/verify)")
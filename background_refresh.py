@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Refresh Background (Stale-While-Revalidate)
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Data yang berasal dari Google (dataset BPP & sheet logs) disajikan dari
+salinan terakhir yang berhasil dimuat. Setelah TTL habis, salinan baru
+diambil di thread background lalu di-swap sekaligus, sehingga interaksi
+user tidak pernah menunggu round-trip Google API (kecuali load pertama
+dan setelah penulisan data, agar user langsung melihat perubahannya).
+
+- RefreshableValue   : satu nilai ber-TTL beserta timestamp update terakhir
+- BackgroundRefresher: satu thread daemon per proses yang me-refresh semua
+  item terdaftar yang sudah basi dan masih dipakai (tidak idle)
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import os
+import threading
+import time
+
+import streamlit as st
+
+# Interval thread refresher mengecek item yang basi (detik)
+REFRESH_INTERVAL = float(os.environ.get("BPP_REFRESH_INTERVAL", "1"))
+
+# Item yang tidak diakses selama ini (detik) tidak di-refresh lagi di background
+IDLE_TIMEOUT = float(os.environ.get("BPP_REFRESH_IDLE_TIMEOUT", "600"))
+
+
+class RefreshableValue:
+    """
+    Nilai hasil loader dengan TTL. get() selalu langsung mengembalikan
+    salinan terakhir; jika sudah basi, loader dijalankan di background.
+    Jika loader gagal, salinan lama tetap dipakai dan error dicatat.
+    """
+
+    def __init__(self, name, loader, ttl, initial=None):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self.initial = initial
+
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._dirty = False
+
+        # (nilai, waktu update dalam epoch detik) di-swap sebagai satu tuple
+        self._current = (initial, None)
+        self.validated_at = None
+        self.last_access = None
+        self._stats = {
+            "refreshes": 0,
+            "failures": 0,
+            "last_error": None,
+            "last_refresh_seconds": None,
+        }
+
+    def _run_loader(self):
+        start = time.perf_counter()
+        try:
+            value = self.loader()
+            self._current = (value, time.time())
+            self._stats["refreshes"] += 1
+        except Exception as e:
+            # Loader bisa gagal karena jaringan / kuota API: salinan lama tetap dipakai
+            self._stats["failures"] += 1
+            self._stats["last_error"] = str(e)
+        finally:
+            self._stats["last_refresh_seconds"] = time.perf_counter() - start
+            self.validated_at = time.monotonic()
+            self._refreshing = False
+
+    def is_stale(self):
+        return self.validated_at is None or time.monotonic() - self.validated_at >= self.ttl
+
+    def refresh(self, wait=False):
+        """Menjalankan loader (sekali jalan, tidak dobel), di background jika wait=False."""
+        with self._lock:
+            if self._refreshing:
+                started = False
+            else:
+                self._refreshing = started = True
+                self._dirty = False
+
+        if not started:
+            if wait:
+                while self._refreshing:
+                    time.sleep(0.01)
+            return False
+
+        if wait:
+            self._run_loader()
+        else:
+            threading.Thread(
+                target=self._run_loader, name=f"bpp-refresh-{self.name}", daemon=True
+            ).start()
+        return True
+
+    def invalidate(self):
+        """
+        Menandai salinan sudah tidak berlaku (contoh: setelah menulis ke sheet).
+        get() berikutnya menunggu data baru agar perubahan langsung terlihat.
+        """
+        self._dirty = True
+
+    def snapshot(self):
+        """Return (nilai, waktu update terakhir dalam epoch detik)."""
+        self.last_access = time.monotonic()
+        if self.validated_at is None or self._dirty:
+            # Load pertama / setelah penulisan: tunggu sampai data baru tersedia
+            while self.validated_at is None or self._dirty:
+                self.refresh(wait=True)
+        elif self.is_stale():
+            self.refresh()
+        return self._current
+
+    def get(self):
+        return self.snapshot()[0]
+
+    @property
+    def value(self):
+        """Salinan terakhir tanpa memicu refresh."""
+        return self._current[0]
+
+    @property
+    def updated_at(self):
+        return self._current[1]
+
+    def stats(self):
+        updated_at = self._current[1]
+        return {
+            "name": self.name,
+            "ttl_seconds": self.ttl,
+            "age_seconds": None if updated_at is None else time.time() - updated_at,
+            "refreshing": self._refreshing,
+            **self._stats,
+        }
+
+
+class BackgroundRefresher:
+    """
+    Satu thread daemon yang secara berkala me-refresh item terdaftar yang
+    sudah basi. Item cukup punya is_stale(), refresh(wait) dan last_access
+    (RefreshableValue maupun data_loader.DatasetLoader).
+    """
+
+    def __init__(self, interval=REFRESH_INTERVAL, idle_timeout=IDLE_TIMEOUT):
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self._items = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def register(self, name, item):
+        with self._lock:
+            self._items[name] = item
+        self._ensure_started()
+        return item
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="bpp-background-refresher", daemon=True
+                )
+                self._thread.start()
+
+    def _is_active(self, item):
+        last_access = getattr(item, "last_access", None)
+        return last_access is not None and time.monotonic() - last_access < self.idle_timeout
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                items = list(self._items.values())
+            for item in items:
+                if self._is_active(item) and item.is_stale():
+                    # Refresh berurutan di thread ini agar tidak membebani API
+                    item.refresh(wait=True)
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        with self._lock:
+            names = list(self._items)
+        return {
+            "items": ", ".join(names),
+            "interval_seconds": self.interval,
+            "idle_timeout_seconds": self.idle_timeout,
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
+
+    def item_stats(self):
+        """Ringkasan umur & status refresh setiap item terdaftar."""
+        with self._lock:
+            items = list(self._items.items())
+        rows = []
+        for name, item in items:
+            stats = item.stats()
+            rows.append(
+                {
+                    "item": name,
+                    "age_seconds": stats.get("age_seconds"),
+                    "ttl_seconds": stats.get("ttl_seconds"),
+                    "stale": item.is_stale(),
+                    "active": self._is_active(item),
+                    "refreshing": stats.get("refreshing"),
+                    "failures": stats.get("failures"),
+                    "last_error": stats.get("last_error"),
+                }
+            )
+        return rows
+
+
+@st.cache_resource
+def get_background_refresher():
+    """Refresher bersama untuk seluruh proses."""
+    return BackgroundRefresher()
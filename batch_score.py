@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Batch Scoring BPP (Command Line)
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Menilai setiap baris file dataset BPP (CSV / XLSX / Parquet dengan skema
+yang sama seperti DATABASE BPP) menggunakan keempat model sekaligus, lalu
+menulis prediksi beserta residual terhadap kolom BPP ke CSV atau Parquet.
+
+File dibaca & ditulis per chunk, sehingga memori yang dipakai tetap sama
+berapapun ukuran file input. Model & scaler dimuat sekali per proses.
+
+Contoh:
+    python batch_score.py "DATABASE BPP_EXCEL.xlsx" -o prediksi.csv
+    python batch_score.py skenario.parquet -o hasil.parquet --chunksize 50000
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from accounting_parser import normalize_headers, parse_accounting_frame
+from model_registry import ModelRegistry
+from prediction import FEATURE_COLUMNS, MODEL_ORDER, TARGET_COLUMN, BatchPredictor
+
+# Kolom identitas yang ikut disalin ke output jika ada
+ID_COLUMNS = ["Bulan"]
+
+DEFAULT_CHUNKSIZE = 10_000
+
+
+# ============ NORMALISASI CHUNK ============
+def normalize_chunk(chunk):
+    """
+    Merapikan nama kolom (spasi) dan mengubah fitur & target format
+    akuntansi menjadi angka. Return (chunk, laporan sel gagal parse).
+    """
+    chunk = normalize_headers(chunk).reset_index(drop=True)
+    columns = [c for c in FEATURE_COLUMNS + [TARGET_COLUMN] if c in chunk.columns]
+    return parse_accounting_frame(chunk, columns=columns, downcast_int=False)
+
+
+# ============ PEMBACA PER CHUNK ============
+def _unwrap_quoted_rows(chunk, columns):
+    """
+    Beberapa export CSV membungkus satu baris utuh dalam satu field
+    (contoh: DATABASE BPP_CSV.csv). Baris seperti ini di-parse ulang.
+    """
+    first = chunk.iloc[:, 0].astype(str)
+    if chunk.iloc[:, 1:].isna().all().all() and first.str.contains(",").all():
+        return pd.read_csv(io.StringIO("\n".join(first)), header=None, names=columns)
+    return chunk
+
+
+def iter_csv(path, chunksize):
+    columns = list(pd.read_csv(path, nrows=0).columns)
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        yield _unwrap_quoted_rows(chunk, columns)
+
+
+def iter_excel(path, chunksize):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        columns = list(next(rows))
+        buffer = []
+        for row in rows:
+            # Sheet export sering menyisakan baris kosong di bawah data
+            if all(v is None for v in row):
+                continue
+            buffer.append(row)
+            if len(buffer) >= chunksize:
+                yield pd.DataFrame(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_parquet(path, chunksize):
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunksize):
+        yield batch.to_pandas()
+
+
+READERS = {
+    ".csv": iter_csv,
+    ".xlsx": iter_excel,
+    ".xlsm": iter_excel,
+    ".parquet": iter_parquet,
+    ".pq": iter_parquet,
+}
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Membaca file input per chunk sesuai ekstensinya. Yield (chunk, laporan)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Format input tidak didukung: {ext}")
+    for chunk in READERS[ext](path, chunksize):
+        yield normalize_chunk(chunk)
+
+
+# ============ PENULIS OUTPUT ============
+class ChunkWriter:
+    """Menulis hasil per chunk ke CSV (append) atau Parquet (row group)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.ext = os.path.splitext(path)[1].lower()
+        if self.ext not in (".csv", ".parquet", ".pq"):
+            raise ValueError(f"Format output tidak didukung: {self.ext}")
+        self._parquet_writer = None
+        self._first = True
+
+    def write(self, frame):
+        if self.ext == ".csv":
+            frame.to_csv(self.path, mode="w" if self._first else "a", header=self._first, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet_writer is None:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pandas(
+                    frame, schema=self._parquet_writer.schema, preserve_index=False
+                )
+            self._parquet_writer.write_table(table)
+        self._first = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+# ============ SCORING ============
+def score_chunk(predictor, chunk, models):
+    """Prediksi satu chunk, ditambah residual jika kolom BPP tersedia."""
+    predictions = predictor.predict(chunk, models=models, use_cache=False)
+    output = chunk[[c for c in ID_COLUMNS if c in chunk.columns]].copy()
+
+    has_target = TARGET_COLUMN in chunk.columns
+    if has_target:
+        output[TARGET_COLUMN] = chunk[TARGET_COLUMN].to_numpy()
+    for key in predictions.columns:
+        output[f"pred_{key}"] = predictions[key].to_numpy()
+        if has_target:
+            output[f"residual_{key}"] = output[TARGET_COLUMN] - output[f"pred_{key}"]
+    return output
+
+
+def score_file(input_path, output_path, models=None, chunksize=DEFAULT_CHUNKSIZE, predictor=None):
+    """
+    Menilai seluruh file input per chunk dan menulis hasilnya.
+    Return ringkasan: jumlah baris, durasi dan MAE per model (jika ada BPP).
+    MAE hanya dihitung dari baris yang BPP aktual dan prediksinya terisi
+    (jumlahnya per model di mae_rows).
+    """
+    predictor = predictor or BatchPredictor(ModelRegistry())
+    models = models or MODEL_ORDER
+
+    writer = ChunkWriter(output_path)
+    n_rows = 0
+    abs_error_sum = {key: 0.0 for key in models}
+    n_scored = {key: 0 for key in models}
+    n_invalid = 0
+    invalid_samples = []
+
+    start = time.perf_counter()
+    try:
+        for chunk, report in iter_chunks(input_path, chunksize):
+            if len(report):
+                report["row"] += n_rows
+                n_invalid += len(report)
+                invalid_samples.extend(report.head(10 - len(invalid_samples)).to_dict("records"))
+
+            output = score_chunk(predictor, chunk, models)
+            writer.write(output)
+
+            n_rows += len(output)
+            if TARGET_COLUMN in output.columns:
+                for key in models:
+                    # Residual NaN jika BPP aktual atau prediksi kosong
+                    residual = output[f"residual_{key}"].to_numpy(dtype=np.float64)
+                    finite = np.isfinite(residual)
+                    n_scored[key] += int(finite.sum())
+                    abs_error_sum[key] += float(np.abs(residual[finite]).sum())
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    summary = {
+        "rows": n_rows,
+        "seconds": elapsed,
+        "invalid_cells": n_invalid,
+        "invalid_samples": invalid_samples,
+    }
+    mae = {key: abs_error_sum[key] / n_scored[key] for key in models if n_scored[key]}
+    if mae:
+        summary["mae"] = mae
+        summary["mae_rows"] = n_scored
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch scoring BPP dengan keempat model")
+    parser.add_argument("input", help="File input (.csv, .xlsx, .parquet)")
+    parser.add_argument("-o", "--output", required=True, help="File output (.csv / .parquet)")
+    parser.add_argument(
+        "--models", nargs="+", choices=MODEL_ORDER, default=None, help="Model yang dipakai"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Jumlah baris per chunk"
+    )
+    args = parser.parse_args()
+
+    try:
+        summary = score_file(args.input, args.output, args.models, args.chunksize)
+    except (KeyError, ValueError) as e:
+        sys.exit(f"Gagal memproses {args.input}: {e}")
+
+    rate = summary["rows"] / summary["seconds"] if summary["seconds"] else 0
+    print(f"{summary['rows']} baris dinilai dalam {summary['seconds']:.2f} detik ({rate:,.0f} baris/detik)")
+    for key, mae in summary.get("mae", {}).items():
+        print(f"  MAE {key:8s} = {mae:,.2f} ({summary['mae_rows'][key]} baris)")
+    if summary["invalid_cells"]:
+        print(f"Peringatan: {summary['invalid_cells']} sel tidak bisa di-parse dan dianggap kosong, contoh:")
+        for item in summary["invalid_samples"]:
+            print(f"  baris {item['row']}, kolom {item['column']!r}: {item['value']!r}")
+
+
+if __name__ == "__main__":
+    main()
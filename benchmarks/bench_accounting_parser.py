@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Parser Format Akuntansi: Vectorized vs Loop Per Sel
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Membuat kolom sintetis berformat akuntansi (angka, negatif dalam kurung,
+"-" untuk nol dan sebagian kecil sel rusak) sebanyak jutaan baris, lalu
+membandingkan accounting_parser.parse_accounting_column dengan parser
+Python per sel. Hasil kedua parser juga dicek harus identik.
+
+Jika waktu parse vectorized per juta baris melebihi batas
+"accounting_parse_seconds_per_million" di benchmarks/thresholds.json,
+script keluar dengan exit code 1.
+
+Cara menjalankan (dari root repo):
+    python benchmarks/bench_accounting_parser.py --rows 2000000
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_FILE = os.path.join(BENCH_DIR, "thresholds.json")
+
+_NUMBER = re.compile(r"^[+-]?(?:\d{1,3}(?:,\d{3})+|\d+)?(?:\.\d+)?$")
+
+
+def make_synthetic_column(n_rows, invalid_ratio=0.001, seed=0):
+    """Kolom teks format akuntansi seperti export CSV Google Sheets."""
+    rng = np.random.default_rng(seed)
+    values = rng.integers(-5_000_000_000, 50_000_000_000, size=n_rows)
+    values[rng.random(n_rows) < 0.1] = 0
+
+    text = pd.Series(values).map("{:,}".format)
+    text = text.where(values >= 0, "(" + text.str.lstrip("-") + ")")
+    text = text.where(values != 0, "-")
+    text = "  " + text + " "
+
+    invalid = rng.random(n_rows) < invalid_ratio
+    text[invalid] = "#REF!"
+    expected = np.where(invalid, np.nan, values.astype(np.float64))
+    return text, expected
+
+
+def parse_per_cell(series):
+    """Parser referensi: satu sel diproses per iterasi loop Python."""
+    out = np.empty(len(series), dtype=np.float64)
+    for i, raw in enumerate(series):
+        s = str(raw).strip()
+        negative = s.startswith("(") and s.endswith(")")
+        s = s.strip("()").strip()
+        if s == "-":
+            s = "0"
+        if not s or not _NUMBER.match(s):
+            out[i] = np.nan
+            continue
+        value = float(s.replace(",", ""))
+        out[i] = -value if negative else value
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser format akuntansi")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Jumlah baris sintetis")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE, help="File batas metrik")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_DIR)
+    from accounting_parser import parse_accounting_column
+
+    column, expected = make_synthetic_column(args.rows)
+
+    start = time.perf_counter()
+    vectorized, invalid = parse_accounting_column(column, downcast_int=False)
+    vectorized_seconds = time.perf_counter() - start
+
+    # Input string Arrow (seperti hasil read_accounting_csv) tanpa konversi object
+    arrow_column = column.astype("string[pyarrow]")
+    start = time.perf_counter()
+    vectorized_arrow, _ = parse_accounting_column(arrow_column, downcast_int=False)
+    arrow_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_cell = parse_per_cell(column)
+    per_cell_seconds = time.perf_counter() - start
+
+    np.testing.assert_array_equal(vectorized.to_numpy(), expected)
+    np.testing.assert_array_equal(vectorized_arrow.to_numpy(), expected)
+    np.testing.assert_array_equal(per_cell, expected)
+    assert int(invalid.sum()) == int(np.isnan(expected).sum())
+
+    per_million = vectorized_seconds / (args.rows / 1e6)
+    print(f"baris                 : {args.rows:,} ({int(invalid.sum()):,} sel rusak terdeteksi)")
+    print(f"vectorized            : {vectorized_seconds:8.3f}s ({per_million:.3f}s per juta baris)")
+    print(f"vectorized (arrow)    : {arrow_seconds:8.3f}s")
+    print(f"loop per sel          : {per_cell_seconds:8.3f}s")
+    print(f"speedup               : {per_cell_seconds / vectorized_seconds:8.1f}x")
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds, encoding="utf-8") as f:
+            thresholds = json.load(f)
+    limit = thresholds.get("accounting_parse_seconds_per_million")
+    if limit is not None and per_million > limit:
+        print(f"GAGAL: accounting_parse_seconds_per_million {per_million:.3f}s > {limit}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
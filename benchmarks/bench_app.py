@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Cold Start & Rerun bpp_app.py
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Menjalankan dashboard secara headless lewat Streamlit AppTest dengan
+gsheet_handler asli yang terhubung ke FakeClient (fake_gspread.py,
+satu baris periode berjalan yang lengkap) dan dataset lokal (fallback
+offline data_loader.py), lalu mencatat:
+- import_seconds        : waktu import modul level atas bpp_app.py
+- artifact_load_seconds : waktu memuat semua artefak model dari registry
+- first_render_seconds  : waktu render pertama aplikasi
+- rerun_*_seconds       : median latency rerun per interaksi utama
+
+Hasil ditulis ke file JSON. Jika ada metrik yang melebihi batas di
+benchmarks/thresholds.json, script keluar dengan exit code 1.
+
+Cara menjalankan (dari root repo, gunakan proses baru agar cold start valid):
+    python benchmarks/bench_app.py --output bench_results.json
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(REPO_DIR, "bpp_app.py")
+THRESHOLDS_FILE = os.path.join(BENCH_DIR, "thresholds.json")
+
+# Satu baris periode berjalan (semua komponen sudah terisi)
+CURRENT_PERIOD = {
+    "timestamp": "2025-09-30 08:00:00",
+    "komponen_a": 120_000_000_000,
+    "komponen_b": 95_000_000_000,
+    "komponen_c_batubara": 350_000_000_000,
+    "komponen_c_biomassa": 2_500_000_000,
+    "komponen_d": 1_200_000_000,
+    "harga_batubara_rp": 1023.82,
+    "harga_biomassa_rp": 605.84,
+    "koef_batubara": 0.99558,
+    "koef_biomassa": 0.00442,
+}
+
+
+def use_local_fakes():
+    """
+    gsheet_handler asli memakai FakeClient (tanpa kredensial Google), jadi
+    parsing snapshot, cache & rate limiter ikut terukur.
+    """
+    import gsheet_handler
+    from fake_gspread import FakeClient
+
+    row = [CURRENT_PERIOD.get(col, 0) for col in gsheet_handler.COLUMNS]
+    client = FakeClient([gsheet_handler.COLUMNS, row])
+    gsheet_handler.use_client_factory(lambda: client)
+
+
+def measure_app_imports():
+    """Menjalankan semua statement import level atas bpp_app.py dan mengukur durasinya."""
+    with open(APP_FILE, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    nodes = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            nodes.append(node)
+        elif isinstance(node, ast.Try):
+            nodes.extend(n for n in node.body if isinstance(n, (ast.Import, ast.ImportFrom)))
+
+    code = compile(ast.Module(body=nodes, type_ignores=[]), APP_FILE, "exec")
+    start = time.perf_counter()
+    exec(code, {"__name__": "bench_imports"})
+    return time.perf_counter() - start
+
+
+def measure_artifact_load():
+    """Memuat semua artefak yang dipakai dashboard di registry baru."""
+    from model_registry import MODEL_KEYS, ModelRegistry
+
+    registry = ModelRegistry()
+    keys = ["scaler"] + list(MODEL_KEYS.values())
+    keys += [f"shap_{k}" for k in MODEL_KEYS.values()]
+
+    start = time.perf_counter()
+    for key in keys:
+        registry.get(key)
+    return time.perf_counter() - start
+
+
+def _find(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"Widget {label!r} tidak ditemukan")
+
+
+def _timed_run(action):
+    start = time.perf_counter()
+    at = action()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"Aplikasi error: {at.exception[0].value}")
+    return elapsed
+
+
+def measure_app(repeat, timeout):
+    """Render pertama + rerun untuk setiap interaksi utama."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+    first_render = _timed_run(at.run)
+
+    models = ["Elastic", "Ridge", "KNN", "Neural Network"]
+    eda_vars = list(_find(at.selectbox, "Pilih variabel X").options)
+
+    samples = {
+        "rerun_model_switch_seconds": [],
+        "rerun_sidebar_edit_seconds": [],
+        "rerun_eda_select_seconds": [],
+        "rerun_modal_open_seconds": [],
+    }
+    for i in range(repeat):
+        model = models[i % len(models)]
+        samples["rerun_model_switch_seconds"].append(
+            _timed_run(lambda: _find(at.selectbox, "Pilih Model").select(model).run())
+        )
+
+        sewa = _find(at.number_input, "Beban Sewa")
+        samples["rerun_sidebar_edit_seconds"].append(
+            _timed_run(lambda: sewa.set_value(sewa.value + 1).run())
+        )
+
+        var = eda_vars[(i + 1) % len(eda_vars)]
+        samples["rerun_eda_select_seconds"].append(
+            _timed_run(lambda: _find(at.selectbox, "Pilih variabel X").select(var).run())
+        )
+
+        samples["rerun_modal_open_seconds"].append(
+            _timed_run(lambda: at.button(key="btn_komp_a").click().run())
+        )
+
+    return first_render, samples
+
+
+def check_thresholds(metrics, thresholds):
+    """Mengembalikan daftar metrik yang melebihi batas."""
+    failures = []
+    for name, limit in thresholds.items():
+        value = metrics.get(name)
+        if value is not None and value > limit:
+            failures.append({"metric": name, "value": value, "limit": limit})
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start & rerun bpp_app.py")
+    parser.add_argument("--output", default="bench_results.json", help="File JSON hasil")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah ulangan per interaksi")
+    parser.add_argument("--timeout", type=float, default=300, help="Timeout AppTest (detik)")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE, help="File batas metrik")
+    args = parser.parse_args()
+
+    os.chdir(REPO_DIR)
+    sys.path.insert(0, REPO_DIR)
+
+    # data_loader membaca flag offline saat import: dataset diambil dari file lokal
+    os.environ["BPP_DATASET_OFFLINE"] = "1"
+    # Simpan ke sheet palsu tidak boleh masuk journal app
+    os.environ["BPP_WRITE_JOURNAL"] = ""
+
+    # Import diukur sebelum apapun dimuat agar mencerminkan cold start
+    metrics = {"import_seconds": measure_app_imports()}
+    use_local_fakes()
+    metrics["artifact_load_seconds"] = measure_artifact_load()
+    first_render, samples = measure_app(args.repeat, args.timeout)
+    metrics["first_render_seconds"] = first_render
+    for name, values in samples.items():
+        metrics[name] = statistics.median(values)
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds, encoding="utf-8") as f:
+            thresholds = json.load(f)
+    failures = check_thresholds(metrics, thresholds)
+
+    result = {
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "metrics": metrics,
+        "samples": samples,
+        "thresholds": thresholds,
+        "failures": failures,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    for name, value in metrics.items():
+        limit = thresholds.get(name)
+        status = "" if limit is None else ("OK" if value <= limit else "GAGAL")
+        print(f"{name:32s} {value:8.3f}s  {status}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
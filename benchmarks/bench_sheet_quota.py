@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Rate Limiter Kuota Google Sheets
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Beberapa sesi (thread) menjalankan rerun terus-menerus terhadap
+FakeClient (fake_gspread) dengan TTL cache logs sangat pendek, sambil
+sesekali menyimpan komponen lewat antrian write-behind. Kuota baca &
+tulis sengaja dibuat kecil agar limiter bekerja.
+
+Yang dicek:
+- jumlah request baca / tulis yang benar-benar dikirim ke Google tidak
+  melebihi kuota (burst + laju per menit selama benchmark)
+- tidak ada rerun yang error, dan rerun tidak ikut menunggu kuota
+  (baca yang ditolak disajikan dari cache)
+- semua simpan tetap tertulis ke sheet (tulis diprioritaskan)
+
+Jika p95 waktu rerun melebihi "quota_rerun_p95_ms" di
+benchmarks/thresholds.json, atau salah satu cek di atas gagal, script
+keluar dengan exit code 1.
+
+Cara menjalankan (dari root repo):
+    python benchmarks/bench_sheet_quota.py
+    python benchmarks/bench_sheet_quota.py --sessions 8 --seconds 10
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_FILE = os.path.join(BENCH_DIR, "thresholds.json")
+
+
+def run(sessions, seconds, read_quota, write_quota, burst, latency):
+    # Konfigurasi dibaca modul saat import
+    os.environ.update(
+        BPP_LOGS_TTL="0.05",
+        BPP_REFRESH_INTERVAL="0.05",
+        BPP_SHEETS_READ_QUOTA=str(read_quota),
+        BPP_SHEETS_WRITE_QUOTA=str(write_quota),
+        BPP_SHEETS_QUOTA_BURST=str(burst),
+        BPP_WRITE_BACKOFF="0.05",
+        BPP_WRITE_JOURNAL="",
+    )
+    sys.path.insert(0, REPO_DIR)
+    import gsheet_handler
+    from fake_gspread import FakeClient, make_sheet
+    from rate_limiter import get_rate_limiter
+
+    client = FakeClient(make_sheet(gsheet_handler.COLUMNS, 100), latency=latency)
+    gsheet_handler.use_client_factory(lambda: client)
+    worksheet = client.logs
+    limiter = get_rate_limiter()
+
+    rerun_ms = []
+    errors = []
+    saved = {}
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def session(i):
+        n = 0
+        while time.monotonic() < stop:
+            n += 1
+            start = time.perf_counter()
+            try:
+                gsheet_handler.begin_rerun()
+                gsheet_handler.get_penjualan_value()
+                gsheet_handler.get_last_valid_prices()
+                if n % 20 == 0:
+                    # Sesi i menyimpan ke kolom miliknya sendiri
+                    col = gsheet_handler.COMPONENT_COLUMNS[i % len(gsheet_handler.COMPONENT_COLUMNS)]
+                    value = i * 1000 + n
+                    gsheet_handler.update_detailed_row({col: value})
+                    with lock:
+                        saved[col] = value
+            except Exception as e:
+                with lock:
+                    errors.append(f"{type(e).__name__}: {e}")
+            with lock:
+                rerun_ms.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Tulis yang masih antre tetap dijalankan (menunggu kuota tulis)
+    queue = gsheet_handler.get_write_queue()
+    while queue.pending() and not queue.failed():
+        time.sleep(0.05)
+    elapsed = time.monotonic() - start
+
+    data = worksheet.dump()
+    last = dict(zip(data[0], data[-1]))
+    lost = {col: v for col, v in saved.items() if last[col] != str(v)}
+
+    reads = worksheet.calls["get_all_values"] + worksheet.calls["batch_get"]
+    writes = sum(worksheet.calls.values()) - reads
+    rerun_ms.sort()
+    return {
+        "sessions": sessions,
+        "seconds": round(elapsed, 2),
+        "reruns": len(rerun_ms),
+        "rerun_p50_ms": rerun_ms[len(rerun_ms) // 2],
+        "rerun_p95_ms": rerun_ms[int(len(rerun_ms) * 0.95)],
+        "reads_sent": reads,
+        "reads_allowed": burst + read_quota * elapsed / 60,
+        "writes_sent": writes,
+        "writes_allowed": burst + write_quota * elapsed / 60,
+        "saves": len(saved),
+        "lost_saves": lost,
+        "failed_writes": len(queue.failed()),
+        "errors": errors[:5],
+        "limiter": limiter.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rate limiter kuota Google Sheets")
+    parser.add_argument("--sessions", type=int, default=6)
+    parser.add_argument("--seconds", type=float, default=6.0)
+    parser.add_argument("--read-quota", type=float, default=60, help="Request baca per menit")
+    parser.add_argument("--write-quota", type=float, default=60, help="Request tulis per menit")
+    parser.add_argument("--burst", type=float, default=3)
+    parser.add_argument("--latency", type=float, default=0.02, help="Latency per API call (detik)")
+    parser.add_argument("--output", default=None, help="File JSON hasil (opsional)")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE, help="File batas metrik")
+    args = parser.parse_args()
+
+    result = run(
+        args.sessions, args.seconds, args.read_quota, args.write_quota, args.burst, args.latency
+    )
+    for key, value in result.items():
+        print(f"{key:<16s} {value}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds, encoding="utf-8") as f:
+            thresholds = json.load(f)
+
+    failures = []
+    if result["reads_sent"] > result["reads_allowed"] + 1:
+        failures.append(f"baca {result['reads_sent']} > kuota {result['reads_allowed']:.1f}")
+    if result["writes_sent"] > result["writes_allowed"] + 1:
+        failures.append(f"tulis {result['writes_sent']} > kuota {result['writes_allowed']:.1f}")
+    if result["errors"]:
+        failures.append(f"rerun error: {result['errors']}")
+    if result["lost_saves"] or result["failed_writes"]:
+        failures.append(f"simpan hilang / gagal: {result['lost_saves']}")
+    limit = thresholds.get("quota_rerun_p95_ms")
+    if limit is not None and result["rerun_p95_ms"] > limit:
+        failures.append(f"quota_rerun_p95_ms {result['rerun_p95_ms']:.1f} > {limit}")
+    for failure in failures:
+        print(f"GAGAL: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
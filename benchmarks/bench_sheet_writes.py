@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark API Call & Latency Handler Sheet Logs
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Menjalankan fungsi gsheet_handler terhadap FakeClient (fake_gspread)
+yang dipasang lewat use_client_factory, tanpa kredensial Google:
+- baca: read_all_data (load ulang setelah cache ditandai basi) dan
+  get_penjualan_value (dari snapshot di cache)
+- simpan: update_component untuk Komponen A/D, update_detailed_row untuk
+  Komponen C dan delete_current_period_row untuk Reset Data
+terhadap sheet kecil maupun besar, dengan latency buatan per API call.
+Diukur jumlah request Google API dan waktu per fungsi; isi sheet setelah
+setiap simpan juga dicek.
+
+Bagian kedua mengukur antrian write-behind: beberapa divisi menyimpan
+hampir bersamaan ke sheet yang lambat dan sempat gagal (error 429).
+Diukur waktu simpan di sisi user, jumlah batch_update setelah intent
+digabung, dan dicek tidak ada penulisan yang hilang (termasuk intent
+yang gagal lalu diulang lewat retry_failed_writes).
+
+Budget API call per aksi di gsheet_handler.CALL_BUDGETS ditegakkan secara
+strict (sheet_metrics): aksi yang melebihi budget langsung raise
+SheetCallBudgetExceeded dan benchmark gagal.
+
+Jika jumlah API call per simpan / baca melebihi "sheet_api_calls_per_save"
+/ "sheet_api_calls_per_read", atau waktu simpan write-behind melebihi
+"write_behind_submit_ms" di benchmarks/thresholds.json, script keluar
+dengan exit code 1.
+
+Cara menjalankan (dari root repo):
+    python benchmarks/bench_sheet_writes.py
+    python benchmarks/bench_sheet_writes.py --rows 10 5000 --latency 0.1
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_FILE = os.path.join(BENCH_DIR, "thresholds.json")
+
+# Jenis aksi per fungsi handler (batas API call berbeda untuk baca & simpan)
+READ_ACTIONS = {"read_all_data", "get_penjualan_value"}
+
+
+def install_fake(n_rows, **options):
+    """Memasang FakeClient berisi n_rows baris data, return worksheet logs-nya."""
+    import gsheet_handler
+    from fake_gspread import FakeClient, make_sheet
+
+    client = FakeClient(make_sheet(gsheet_handler.COLUMNS, n_rows), **options)
+    gsheet_handler.use_client_factory(lambda: client)
+    return client.logs
+
+
+def measure(n_rows, latency):
+    import gsheet_handler
+
+    worksheet = install_fake(n_rows, latency=latency)
+    # API call per aksi diukur pada jalur tulis sinkron
+    gsheet_handler.WRITE_BEHIND = False
+
+    def reload_all():
+        gsheet_handler.invalidate_logs()
+        return gsheet_handler.read_all_data()
+
+    actions = [
+        ("read_all_data", reload_all),
+        ("get_penjualan_value", gsheet_handler.get_penjualan_value),
+        ("komponen_a", lambda: gsheet_handler.update_component("komponen_a", 111)),
+        ("komponen_d", lambda: gsheet_handler.update_component("komponen_d", 444)),
+        (
+            "komponen_c",
+            lambda: gsheet_handler.update_detailed_row(
+                {"komponen_c_batubara": 333, "vol_batubara_kg": "1.500", "harga_batubara_rp": 1023}
+            ),
+        ),
+        ("reset", gsheet_handler.delete_current_period_row),
+    ]
+    expected = {
+        "komponen_a": {"komponen_a": "111"},
+        "komponen_d": {"komponen_d": "444"},
+        "komponen_c": {"komponen_c_batubara": "333", "vol_batubara_kg": "1.500"},
+    }
+
+    results = []
+    for name, action in actions:
+        # Baca seperti rerun app sebelum user menyimpan (snapshot logs di cache)
+        gsheet_handler.get_logs_snapshot()
+        before = worksheet.api_calls
+        rows_before = len(worksheet.dump())
+
+        start = time.perf_counter()
+        ok = action()
+        seconds = time.perf_counter() - start
+        calls = worksheet.api_calls - before
+
+        data = worksheet.dump()
+        if name == "reset":
+            assert len(data) == rows_before - 1, "baris terakhir tidak terhapus"
+        elif name in expected:
+            last = dict(zip(data[0], data[-1]))
+            for col, value in expected[name].items():
+                assert last[col] == value, f"{name}: {col}={last[col]!r}, harusnya {value!r}"
+        results.append(
+            {
+                "rows": n_rows,
+                "action": name,
+                "ok": ok is not False,
+                "api_calls": calls,
+                "seconds": seconds,
+            }
+        )
+    return results
+
+
+def measure_write_behind(n_rows, latency):
+    """Simpan bersamaan dari beberapa divisi lewat antrian write-behind."""
+    import gsheet_handler
+
+    worksheet = install_fake(n_rows, latency=latency)
+    gsheet_handler.get_write_queue.clear()
+    gsheet_handler.WRITE_BEHIND = True
+    queue = gsheet_handler.get_write_queue()
+    queue.backoff = lambda attempt: 0.01
+    gsheet_handler.begin_rerun()
+    gsheet_handler.get_logs_snapshot()
+
+    # Empat divisi menyimpan hampir bersamaan, request pertama kena 429
+    saves = [
+        {"komponen_a": 111},
+        {"komponen_b": 222},
+        {"komponen_c_batubara": 333, "vol_batubara_kg": "1.500"},
+        {"komponen_d": 444},
+    ]
+    worksheet.reset_counters()
+    worksheet.fail_next = 1
+    submit_ms = []
+    for payload in saves:
+        start = time.perf_counter()
+        assert gsheet_handler.update_detailed_row(payload)
+        submit_ms.append((time.perf_counter() - start) * 1000)
+
+    # Optimistic update: rerun berikutnya langsung melihat semua nilai
+    gsheet_handler.begin_rerun()
+    current = gsheet_handler.get_current_period_row()
+    assert [current[c] for c in ("komponen_a", "komponen_b", "komponen_d")] == [111, 222, 444]
+
+    queue.wait_idle(30)
+    data = worksheet.dump()
+    last = dict(zip(data[0], data[-1]))
+    for payload in saves:
+        for col, value in payload.items():
+            assert last[col] == str(value), f"write-behind: {col}={last[col]!r}"
+
+    # Gagal terus sampai batas percobaan: intent tetap ada, lalu diulang
+    worksheet.fail_next = queue.max_attempts * 2
+    gsheet_handler.update_component("komponen_a", 555)
+    while not queue.failed():
+        time.sleep(0.01)
+    assert gsheet_handler.write_queue_status()["failed"] == 1
+    worksheet.fail_next = 0
+    gsheet_handler.retry_failed_writes()
+    while queue.pending():
+        time.sleep(0.01)
+    data = worksheet.dump()
+    assert dict(zip(data[0], data[-1]))["komponen_a"] == "555", "intent gagal hilang"
+
+    stats = queue.stats()
+    return {
+        "rows": n_rows,
+        "saves": len(saves),
+        "max_submit_ms": max(submit_ms),
+        "batch_updates": worksheet.calls["batch_update"],
+        "api_errors": sum(worksheet.errors.values()),
+        "coalesced": stats["coalesced"],
+        "retries": stats["retries"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API call & latency handler sheet")
+    parser.add_argument("--rows", type=int, nargs="+", default=[0, 10, 5000])
+    parser.add_argument(
+        "--latency", type=float, default=0.02, help="Latency buatan per API call (detik)"
+    )
+    parser.add_argument("--output", default=None, help="File JSON hasil (opsional)")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE, help="File batas metrik")
+    args = parser.parse_args()
+
+    # Kuota tanpa batas: biaya per handler diukur tanpa rate limiter
+    # (limiter dibenchmark terpisah di bench_sheet_quota.py)
+    os.environ.setdefault("BPP_SHEETS_READ_QUOTA", "0")
+    os.environ.setdefault("BPP_SHEETS_WRITE_QUOTA", "0")
+    # Simpan ke sheet palsu tidak boleh masuk journal app
+    os.environ.setdefault("BPP_WRITE_JOURNAL", "")
+    sys.path.insert(0, REPO_DIR)
+    from sheet_metrics import get_sheet_metrics
+
+    metrics = get_sheet_metrics()
+    metrics.strict_budget = True
+    results = [r for n_rows in args.rows for r in measure(n_rows, args.latency)]
+    write_behind = [measure_write_behind(n_rows, args.latency) for n_rows in args.rows]
+
+    for r in results:
+        print(
+            f"{r['rows']:>6,} baris  {r['action']:<20s} {r['api_calls']} API call"
+            f"  {r['seconds'] * 1000:8.1f} ms"
+        )
+    for r in write_behind:
+        print(
+            f"{r['rows']:>6,} baris  write-behind {r['saves']} simpan: "
+            f"maks {r['max_submit_ms']:.2f} ms/simpan, {r['batch_updates']} batch_update, "
+            f"{r['coalesced']} digabung, {r['retries']} retry"
+        )
+
+    print("\nAPI call per label (sheet_metrics):")
+    for r in metrics.call_stats():
+        print(
+            f"  {r['label']:<26s} {r['method']:<15s} {r['calls']:>4} call "
+            f"{r['errors']:>3} error  rata-rata {r['mean_ms']:7.1f} ms"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "actions": results,
+                    "write_behind": write_behind,
+                    "calls": metrics.call_stats(),
+                },
+                f,
+                indent=2,
+            )
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds, encoding="utf-8") as f:
+            thresholds = json.load(f)
+
+    checks = [
+        (
+            "sheet_api_calls_per_save",
+            max(r["api_calls"] for r in results if r["action"] not in READ_ACTIONS),
+        ),
+        (
+            "sheet_api_calls_per_read",
+            max(r["api_calls"] for r in results if r["action"] in READ_ACTIONS),
+        ),
+        ("write_behind_submit_ms", max(r["max_submit_ms"] for r in write_behind)),
+    ]
+    failed = False
+    for violation in metrics.budget_violations():
+        print(f"GAGAL: budget {violation['label']} {violation['calls']} > {violation['budget']}")
+        failed = True
+    for key, worst in checks:
+        limit = thresholds.get(key)
+        if limit is not None and worst > limit:
+            print(f"GAGAL: {key} {worst} > {limit}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
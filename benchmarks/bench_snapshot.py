@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark Load Dataset: XLSX vs Snapshot Arrow
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Membandingkan waktu baca dataset BPP dari XLSX (pd.read_excel / openpyxl)
+dengan snapshot Arrow yang di-memory map untuk beberapa ukuran dataset.
+Dataset besar dibuat dengan mengulang baris DATABASE BPP_EXCEL.xlsx
+(simulasi histori harian).
+
+Untuk snapshot diukur dua hal:
+- read: data_loader.read_snapshot saja
+- load: seluruh jalur start dari snapshot (DatasetLoader._load_snapshot),
+  termasuk frame tampilan & versi dataset yang siap dipakai render pertama
+
+Jika waktu load snapshot pada ukuran terbesar melebihi batas
+"snapshot_load_seconds" di benchmarks/thresholds.json, script keluar
+dengan exit code 1.
+
+Cara menjalankan (dari root repo):
+    python benchmarks/bench_snapshot.py
+    python benchmarks/bench_snapshot.py --rows 33 10000 1000000 --xlsx-max-rows 10000
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+THRESHOLDS_FILE = os.path.join(BENCH_DIR, "thresholds.json")
+
+
+def _median_seconds(func, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def measure(rows_list, xlsx_max_rows, repeat):
+    import pandas as pd
+
+    from data_loader import DatasetLoader, format_display_frame, read_snapshot, write_snapshot
+    from data_sources import LocalXlsxSource
+
+    source = LocalXlsxSource()
+    base = source.load()
+
+    def make_loader(snapshot_path):
+        return DatasetLoader(
+            source, views={"display": format_display_frame}, snapshot_path=snapshot_path
+        )
+
+    def load(snapshot_path):
+        loader = make_loader(snapshot_path)
+        assert loader._load_snapshot(), "snapshot tidak termuat"
+        assert loader._stats["snapshot_write_seconds"] is None, "view tidak tersimpan"
+        return loader
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in rows_list:
+            reps = -(-n_rows // len(base))
+            frame = pd.concat([base] * reps, ignore_index=True).iloc[:n_rows]
+
+            snapshot_path = os.path.join(tmp_dir, f"snapshot_{n_rows}.arrow")
+            views = make_loader(None)._build_views(frame)
+            info = {"content_hash": "bench", "location": source.location}
+            write_snapshot(frame, snapshot_path, info, views=views)
+            result = {
+                "rows": n_rows,
+                "snapshot_bytes": os.path.getsize(snapshot_path),
+                "snapshot_read_seconds": _median_seconds(
+                    lambda: read_snapshot(snapshot_path), repeat
+                ),
+                "snapshot_load_seconds": _median_seconds(lambda: load(snapshot_path), repeat),
+                "xlsx_read_seconds": None,
+            }
+
+            if n_rows <= xlsx_max_rows:
+                xlsx_path = os.path.join(tmp_dir, f"dataset_{n_rows}.xlsx")
+                frame.to_excel(xlsx_path, index=False)
+                result["xlsx_read_seconds"] = _median_seconds(
+                    lambda: pd.read_excel(xlsx_path), max(1, repeat // 3)
+                )
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark load XLSX vs snapshot Arrow")
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[33, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--xlsx-max-rows", type=int, default=10_000, help="Ukuran maksimum yang diuji untuk XLSX"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Jumlah ulangan per ukuran")
+    parser.add_argument("--output", default=None, help="File JSON hasil (opsional)")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE, help="File batas metrik")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_DIR)
+    results = measure(sorted(args.rows), args.xlsx_max_rows, args.repeat)
+
+    for r in results:
+        xlsx = "-" if r["xlsx_read_seconds"] is None else f"{r['xlsx_read_seconds'] * 1e3:10.1f}ms"
+        print(
+            f"{r['rows']:>10,} baris  snapshot read {r['snapshot_read_seconds'] * 1e3:8.1f}ms"
+            f"  load {r['snapshot_load_seconds'] * 1e3:8.1f}ms"
+            f"  xlsx {xlsx:>12s}  ({r['snapshot_bytes'] / 1e6:.1f} MB)"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds, encoding="utf-8") as f:
+            thresholds = json.load(f)
+    limit = thresholds.get("snapshot_load_seconds")
+    largest = results[-1]["snapshot_load_seconds"]
+    if limit is not None and largest > limit:
+        print(f"GAGAL: snapshot_load_seconds {largest:.3f}s > {limit}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,20 +9,11 @@ PT. PLN Indonesia Power Suralaya Unit 8
 # Menyiapkan library
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 import numpy as np
 import plotly.express as px
-import sklearn
-from sklearn import set_config
-import pickle
 import plotly.graph_objects as go
-import shap
-from scipy.stats import gaussian_kde
-import tensorflow as tf
-import matplotlib.ticker as mtick
 import os
-from tensorflow.keras.models import load_model
+import time
 from streamlit_js_eval import streamlit_js_eval
 from style import (
     custom_style,
@@ -33,6 +24,45 @@ from style import (
     info_card,
 )
 from config import apply_app_config
+from model_registry import MODEL_KEYS, get_model_registry
+from prediction import predict_bpp, prediction_cache_stats
+from lazy_imports import lazy_import, import_report
+from data_loader import load_datasets, dataset_changes, dataset_stats, dataset_checked_at
+from background_refresh import get_background_refresher
+from sheet_metrics import get_sheet_metrics
+from rate_limiter import get_rate_limiter
+
+# Library berat baru di-import saat widget yang membutuhkannya dirender
+sns = lazy_import("seaborn")
+plt = lazy_import("matplotlib.pyplot")
+shap = lazy_import("shap")
+scipy_stats = lazy_import("scipy.stats")
+
+# Panel admin (statistik API Google Sheets), opt-in dari sisi server saja:
+# BPP_ADMIN_PANEL=1 atau admin_panel = true di secrets.toml
+ADMIN_PANEL = os.environ.get("BPP_ADMIN_PANEL", "").lower() in ("1", "true", "yes")
+
+
+def panel_admin_aktif():
+    if ADMIN_PANEL:
+        return True
+    try:
+        return bool(st.secrets.get("admin_panel", False))
+    except FileNotFoundError:
+        # Tidak ada secrets.toml
+        return False
+
+
+def umur_data(waktu):
+    """Teks umur data dari waktu epoch (detik), contoh: "2 menit lalu"."""
+    if waktu is None:
+        return "belum dimuat"
+    detik = max(0, int(time.time() - waktu))
+    if detik < 60:
+        return f"{detik} detik lalu"
+    if detik < 3600:
+        return f"{detik // 60} menit lalu"
+    return f"{detik // 3600} jam lalu"
 
 # Import handler untuk koneksi Google Sheets (Multi-Divisi Input)
 try:
@@ -44,6 +74,10 @@ try:
         delete_current_period_row,
         update_detailed_row,
         get_last_valid_prices,
+        begin_rerun,
+        write_queue_status,
+        retry_failed_writes,
+        logs_updated_at,
     )
 
     GSHEET_AVAILABLE = True
@@ -529,9 +563,6 @@ def modal_detail_komponen_c():
                         "msg": "Komponen C (Batubara & Biomassa) berhasil disimpan!",
                     }
 
-                    # Clear SEMUA cache data agar GSheet terbaca ulang
-                    st.cache_data.clear()
-
                     st.rerun()
                 else:
                     st.error("Gagal menyimpan ke database.")
@@ -742,9 +773,6 @@ def modal_komponen_a():
                             "msg": "Komponen A berhasil disimpan!",
                         }
 
-                        # Clear SEMUA cache data agar GSheet terbaca ulang
-                        st.cache_data.clear()
-
                         st.rerun()
                     else:
                         st.error("Gagal menyimpan ke database.")
@@ -957,9 +985,6 @@ def modal_komponen_b():
                             "msg": "Komponen B berhasil disimpan!",
                         }
 
-                        # Clear SEMUA cache data agar GSheet terbaca ulang
-                        st.cache_data.clear()
-
                         st.rerun()
                     else:
                         st.error("Gagal menyimpan ke database.")
@@ -1189,9 +1214,6 @@ def modal_komponen_d():
                             "msg": "Komponen D berhasil disimpan!",
                         }
 
-                        # Clear SEMUA cache data agar GSheet terbaca ulang
-                        st.cache_data.clear()
-
                         st.rerun()
                     else:
                         st.error("Gagal menyimpan ke database.")
@@ -1228,7 +1250,6 @@ def modal_reset_data():
                         "msg": "Tidak ada data untuk direset.",
                     }
 
-                st.cache_data.clear()
                 st.rerun()
     with col2:
         if st.button("❌ Batal", use_container_width=True, key="cancel_reset"):
@@ -1236,13 +1257,29 @@ def modal_reset_data():
 
 
 # ============ PERSISTENSI TEMA ============
-# Data Loading
-link_file_tampilan = "https://docs.google.com/spreadsheets/d/16hZccWcjepE-Ac9Qd-9kBpJiJ8zhu2ON/export?format=csv"
-link_file = "https://docs.google.com/spreadsheets/d/16hZccWcjepE-Ac9Qd-9kBpJiJ8zhu2ON/export?format=xlsx"
-df_tampilan = pd.read_csv(link_file_tampilan)
-df = pd.read_excel(link_file)
+# Data Loading (satu unduhan, cache bersama per proses, revalidasi di background setelah TTL)
+df, df_tampilan, versi_data = load_datasets()
 df_selain_bulan = df.drop("Bulan", axis=1)
 
+# Snapshot sheet logs untuk rerun ini: diambil & di-parse sekali lalu dipakai
+# bersama oleh sidebar dan modal
+if GSHEET_AVAILABLE:
+    begin_rerun()
+
+
+# Hasil turunan dataset di-cache dengan kunci hash kolom yang dipakai (versi data),
+# sehingga refresh dataset hanya menghitung ulang hasil yang kolomnya berubah
+@st.cache_data(show_spinner=False, max_entries=16)
+def hitung_korelasi(kunci_data, _data):
+    return _data.corr()
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def hitung_kde(kunci_data, _data, n_titik=200):
+    kde = scipy_stats.gaussian_kde(_data)
+    x_range = np.linspace(_data.min(), _data.max(), n_titik)
+    return x_range, kde(x_range)
+
 # Mengaktifkan style
 custom_style()
 
@@ -1277,23 +1314,8 @@ error_ridge = 73.91
 error_knn = 85.59
 
 
-# Membuka model
-modelku_elastic = pickle.load(open("model_bpp_elastic.pkl", "rb"))
-modelku_ridge = pickle.load(open("model_bpp_ridge.pkl", "rb"))
-modelku_knn = pickle.load(open("model_bpp_knn.pkl", "rb"))
-modelku_keras = load_model("model_bpp.keras")
-
-
-# Membuka scaler khusus untuk model keras
-tf.keras.utils.set_random_seed(0)
-scaler = pickle.load(open("preprocess_bpp_columntransformer.pkl", "rb"))
-
-
-# Membuka explainer shap
-shap_values_keras = pickle.load(open("shap_values_keras.pkl", "rb"))
-shap_values_elastic = pickle.load(open("shap_values_elastic.pkl", "rb"))
-shap_values_ridge = pickle.load(open("shap_values_ridge.pkl", "rb"))
-shap_values_knn = pickle.load(open("shap_values_knn.pkl", "rb"))
+# Registry model bersama (dimuat sekali per proses, lazy per model)
+registry = get_model_registry()
 
 
 # Bagian Judul Halaman Utama
@@ -1590,6 +1612,24 @@ with st.sidebar:
             else:
                 st.error("❌ Status data tidak valid.")
 
+            # Status antrian simpan (write-behind): menunggu ditulis / gagal
+            antrian = write_queue_status()
+            if antrian["failed"]:
+                st.warning(
+                    f"⚠️ {antrian['failed']} penyimpanan gagal ditulis ke Google Sheets: {antrian['intents'][0]['error']}"
+                )
+                if st.button("🔄 Coba Simpan Lagi", use_container_width=True, key="btn_retry_simpan"):
+                    retry_failed_writes()
+                    st.rerun()
+            elif antrian["waiting"]:
+                st.caption(f"⏳ {antrian['waiting']} penyimpanan sedang ditulis ke Google Sheets...")
+
+            # Umur salinan data (sheet & dataset di-refresh di background)
+            st.caption(
+                f"🕒 Data Google Sheets: {umur_data(logs_updated_at())} · "
+                f"Dataset: {umur_data(dataset_checked_at())}"
+            )
+
             # Tombol-tombol untuk input komponen
             st.markdown("**Input per Komponen:**")
 
@@ -1690,6 +1730,33 @@ with st.sidebar:
             ):
                 modal_reset_data()
 
+            # --- PANEL ADMIN: API GOOGLE SHEETS (opt-in) ---
+            if panel_admin_aktif():
+                sheet_metrics = get_sheet_metrics()
+                with st.expander("🛠️ Admin: API Google Sheets"):
+                    rerun_ini = sheet_metrics.current_rerun()
+                    if rerun_ini is not None:
+                        st.caption("Rerun ini:")
+                        st.json(rerun_ini.summary(), expanded=False)
+                    st.caption("Total proses:")
+                    st.dataframe([sheet_metrics.totals()])
+                    st.caption("Per label & method:")
+                    st.dataframe(sheet_metrics.call_stats())
+                    st.caption("Histogram latency:")
+                    st.dataframe(sheet_metrics.latency_histogram())
+                    st.caption("Sebaran API call per rerun:")
+                    st.dataframe(sheet_metrics.rerun_histogram())
+                    if sheet_metrics.budget_violations():
+                        st.caption("Aksi yang melebihi budget API call:")
+                        st.dataframe(sheet_metrics.budget_violations())
+                    st.caption("Rate limiter kuota (baca ditolak = disajikan dari cache):")
+                    st.dataframe([get_rate_limiter().stats()])
+                    # Termasuk intent "failed" (menahan simpan berikutnya) & error journal
+                    st.caption("Antrian simpan ke Google Sheets (write-behind):")
+                    st.dataframe([{k: v for k, v in antrian.items() if k != "intents"}])
+                    if antrian["intents"]:
+                        st.dataframe(antrian["intents"])
+
             # --- GLOBAL ALERT AREA ---
             # Menampilkan alert sebagai TOAST (Auto-dismiss) sesuai request user
             if "app_alert" in st.session_state and st.session_state.app_alert:
@@ -1773,62 +1840,67 @@ with tab1:
     # Opsi garis regresi
     tampil_regresi = st.checkbox("Tampilkan garis regresi", value=False)
 
+    # Grafik seaborn/matplotlib hanya dibuat (dan library-nya di-import) jika diminta
+    tampil_scatter = st.toggle("Tampilkan scatter plot", value=False, key="tampil_scatter")
+
     # Penentuan jumlah kolom
     col1, col2 = st.columns([2, 1], gap="large")
 
     # Kolom pertama
     with col1:
+        if not tampil_scatter:
+            st.caption("Aktifkan \"Tampilkan scatter plot\" untuk menampilkan grafik.")
+        else:
+            # Style seaborn
+            sns.set_style("white")
 
-        # Style seaborn
-        sns.set_style("white")
-
-        # Menyiapkan canvasnya
-        fig, ax = plt.subplots(figsize=(4, 3))
-
-        # Scatter seaborn (lebih halus dan estetis)
-        sns.scatterplot(
-            data=df,
-            x=x_var,
-            y=y_var,
-            s=15,  # ukuran marker kecil
-            color="#2252F0",  # warna marker (bisa diganti)
-            ax=ax,
-        )
+            # Menyiapkan canvasnya
+            fig, ax = plt.subplots(figsize=(4, 3))
 
-        # Jika user memilih, tampilkan garis regresi
-        if tampil_regresi:
-            sns.regplot(
+            # Scatter seaborn (lebih halus dan estetis)
+            sns.scatterplot(
                 data=df,
                 x=x_var,
                 y=y_var,
-                scatter=False,  # supaya tidak menggandakan scatter
+                s=15,  # ukuran marker kecil
+                color="#2252F0",  # warna marker (bisa diganti)
                 ax=ax,
-                color="#e63946",  # warna garis regresi
-                line_kws={"linewidth": 1.2},
             )
 
-        # Hilangkan border sisi atas & kanan
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+            # Jika user memilih, tampilkan garis regresi
+            if tampil_regresi:
+                sns.regplot(
+                    data=df,
+                    x=x_var,
+                    y=y_var,
+                    scatter=False,  # supaya tidak menggandakan scatter
+                    ax=ax,
+                    color="#e63946",  # warna garis regresi
+                    line_kws={"linewidth": 1.2},
+                )
 
-        # Rapikan garis sumbu
-        ax.spines["left"].set_linewidth(0.8)
-        ax.spines["bottom"].set_linewidth(0.8)
+            # Hilangkan border sisi atas & kanan
+            ax.spines["top"].set_visible(False)
+            ax.spines["right"].set_visible(False)
 
-        # Label
-        ax.set_xlabel(f"{x_var}", fontsize=6)
-        ax.set_ylabel(f"{y_var}", fontsize=6)
-        ax.set_title(f"{x_var} vs {y_var}", fontsize=7)
+            # Rapikan garis sumbu
+            ax.spines["left"].set_linewidth(0.8)
+            ax.spines["bottom"].set_linewidth(0.8)
 
-        # ukuran tick
-        ax.tick_params(axis="both", labelsize=6)
+            # Label
+            ax.set_xlabel(f"{x_var}", fontsize=6)
+            ax.set_ylabel(f"{y_var}", fontsize=6)
+            ax.set_title(f"{x_var} vs {y_var}", fontsize=7)
 
-        # Kecilkan tulisan scientific notaion (misal: 1e10)
-        ax.xaxis.offsetText.set_fontsize(6)
-        ax.yaxis.offsetText.set_fontsize(6)
+            # ukuran tick
+            ax.tick_params(axis="both", labelsize=6)
 
-        # Memunculkan visualisasinya
-        st.pyplot(fig, use_container_width=False)
+            # Kecilkan tulisan scientific notaion (misal: 1e10)
+            ax.xaxis.offsetText.set_fontsize(6)
+            ax.yaxis.offsetText.set_fontsize(6)
+
+            # Memunculkan visualisasinya
+            st.pyplot(fig, use_container_width=False)
 
     # Kolom kedua
     with col2:
@@ -1950,10 +2022,8 @@ with tab1:
         # Ambil data
         data = df_selain_bulan[y_dist].dropna()
 
-        # Hitung KDE
-        kde = gaussian_kde(data)
-        x_range = np.linspace(data.min(), data.max(), 200)
-        y_kde = kde(x_range)
+        # Hitung KDE (di-cache per versi kolom terpilih)
+        x_range, y_kde = hitung_kde(versi_data.columns_key(y_dist), data)
 
         # Buat figure
         fig_hist_kde = go.Figure()
@@ -2065,27 +2135,34 @@ with tab1:
     # Judul awal
     st.subheader("Korelasi Heatmap")
 
+    tampil_heatmap = st.toggle("Tampilkan heatmap korelasi", value=False, key="tampil_heatmap")
+
     # Penentuan kolom
     col1, col2 = st.columns([2, 1], gap="large")
 
     # kolom pertama
     with col1:
-        fig_corr, ax_corr = plt.subplots(figsize=(6, 5))
-        sns.heatmap(
-            df_selain_bulan.corr(),
-            cmap="coolwarm",
-            annot=True,  # tampilkan nilai korelasi
-            fmt=".2f",  # 2 angka desimal
-            annot_kws={"size": 4},  # ukuran font angka annotasi
-            cbar=True,  # menyalakan color bar
-            cbar_kws={"shrink": 0.7},  # tinggi colorbar
-            ax=ax_corr,
-        )
-        cbar = ax_corr.collections[0].colorbar
-        cbar.ax.tick_params(labelsize=4)
-        ax_corr.tick_params(axis="both", labelsize=4)
-        ax_corr.set_title("Correlation Heatmap", fontsize=8)
-        st.pyplot(fig_corr, use_container_width=False)
+        if not tampil_heatmap:
+            st.caption("Aktifkan \"Tampilkan heatmap korelasi\" untuk menampilkan grafik.")
+        else:
+            fig_corr, ax_corr = plt.subplots(figsize=(6, 5))
+            sns.heatmap(
+                hitung_korelasi(
+                    versi_data.columns_key(list(df_selain_bulan.columns)), df_selain_bulan
+                ),
+                cmap="coolwarm",
+                annot=True,  # tampilkan nilai korelasi
+                fmt=".2f",  # 2 angka desimal
+                annot_kws={"size": 4},  # ukuran font angka annotasi
+                cbar=True,  # menyalakan color bar
+                cbar_kws={"shrink": 0.7},  # tinggi colorbar
+                ax=ax_corr,
+            )
+            cbar = ax_corr.collections[0].colorbar
+            cbar.ax.tick_params(labelsize=4)
+            ax_corr.tick_params(axis="both", labelsize=4)
+            ax_corr.set_title("Correlation Heatmap", fontsize=8)
+            st.pyplot(fig_corr, use_container_width=False)
 
     # Kolom kedua
     with col2:
@@ -2153,21 +2230,18 @@ with tab2:
 
         kolom = list(data.keys())
         df_final = pd.DataFrame([data.values()], columns=kolom)
-        df_final_scaling = scaler.transform(df_final)
 
         # Memprediksi model (Unconditional)
-        if pilihan_model == "Neural Network":
-            hasil = round(float(modelku_keras.predict(df_final_scaling)), 2)
-            nilai_error = error_keras
-        elif pilihan_model == "Elastic":
-            hasil = round(float(modelku_elastic.predict(df_final)), 2)
-            nilai_error = error_elastic
-        elif pilihan_model == "Ridge":
-            hasil = round(float(modelku_ridge.predict(df_final)), 2)
-            nilai_error = error_ridge
-        else:
-            hasil = round(float(modelku_knn.predict(df_final)), 2)
-            nilai_error = error_knn
+        # Hanya model yang dipilih yang dimuat & dijalankan lewat API batch
+        model_key = MODEL_KEYS[pilihan_model]
+        prediksi = predict_bpp(df_final, models=[model_key])
+        hasil = round(float(prediksi[model_key].iloc[0]), 2)
+        nilai_error = {
+            "keras": error_keras,
+            "elastic": error_elastic,
+            "ridge": error_ridge,
+            "knn": error_knn,
+        }[model_key]
 
         # Mengeluarkan prediksi
         st.metric(
@@ -2180,6 +2254,26 @@ with tab2:
         with st.expander("Lihat detail input mentah yang dikirim ke model"):
             st.dataframe(data)
 
+        # Statistik pemuatan artefak (waktu load & memori per model); berisi
+        # error & lokasi sumber data, jadi hanya untuk admin
+        if panel_admin_aktif():
+            with st.expander("Lihat statistik pemuatan model"):
+                st.dataframe(registry.stats())
+                if registry.bundle_stats() is not None:
+                    st.caption("Bundle artefak (terverifikasi checksum):")
+                    st.dataframe([registry.bundle_stats()])
+                st.caption("Waktu import library berat (lazy):")
+                st.dataframe(import_report())
+                st.caption("Cache prediksi:")
+                st.dataframe([prediction_cache_stats()])
+                st.caption("Cache dataset:")
+                st.dataframe([dataset_stats()])
+                st.caption(f"Versi dataset: {versi_data.short_hash}")
+                if dataset_changes():
+                    st.json(dataset_changes(), expanded=False)
+                st.caption("Refresh data di background:")
+                st.dataframe(get_background_refresher().item_stats())
+
         # Keterangan tips
         custom_caption(
             "Tips: Perhatikan Plot SHAP Summary, naikkan nilai variabel yang berperan positif dan turunkan nilai yang berperan negatif untuk mendapatkan nilai BPP yang dikehendaki!",
@@ -2195,75 +2289,83 @@ with tab2:
             "Visualisasi berikut adalah hasil analisis dari semua rentang data yang ada sesuai model yang dipilih"
         )
 
-        # Jika dipilih model Neural Network
-        if pilihan_model == "Neural Network":
-
-            # Plot pertama
-            st.subheader("🔹 Plot SHAP Bar")
-            fig1, ax1 = plt.subplots()
-            shap.plots.bar(shap_values_keras, max_display=20, show=False)
-            ax1.set_title(
-                "Model Neural Network - Urutan Bobot Pengaruh Setiap Variabel"
-            )
-            st.pyplot(fig1)
-
-            # Plot kedua
-            st.subheader("🔹 Plot SHAP Summary")
-            fig2, ax2 = plt.subplots()
-            shap.summary_plot(shap_values_keras, show=False)
-            ax2.set_title("Model Neural Network - Interaksi Variabel Terhadap BPP")
-            st.pyplot(fig2)
-
-        # Jika dipilih model elastic
-        elif pilihan_model == "Elastic":
-
-            # Plot pertama
-            st.subheader("🔹 Plot SHAP Bar")
-            fig1, ax1 = plt.subplots()
-            shap.plots.bar(shap_values_elastic, max_display=20, show=False)
-            ax1.set_title("Model Elastic - Urutan Bobot Pengaruh Setiap Variabel")
-            st.pyplot(fig1)
-
-            # Plot kedua
-            st.subheader("🔹 Plot SHAP Summary")
-            fig2, ax2 = plt.subplots()
-            shap.summary_plot(shap_values_elastic, show=False)
-            ax2.set_title("Model Elastic - Interaksi Variabel Terhadap BPP")
-            st.pyplot(fig2)
-
-        # Jika dipilih model ridge
-        elif pilihan_model == "Ridge":
-
-            # Plot pertama
-            st.subheader("🔹 Plot SHAP Bar")
-            fig1, ax1 = plt.subplots()
-            shap.plots.bar(shap_values_ridge, max_display=20, show=False)
-            ax1.set_title("Model Ridge - Urutan Bobot Pengaruh Setiap Variabel")
-            st.pyplot(fig1)
-
-            # Plot kedua
-            st.subheader("🔹 Plot SHAP Summary")
-            fig2, ax2 = plt.subplots()
-            shap.summary_plot(shap_values_ridge, show=False)
-            ax2.set_title("Model Ridge - Interaksi Variabel Terhadap BPP")
-            st.pyplot(fig2)
-
-        # Jika dipilih knn
+        # Plot SHAP (shap & matplotlib) hanya dirender jika diminta
+        tampil_shap = st.toggle("Tampilkan plot SHAP", value=False, key="tampil_shap")
+        if not tampil_shap:
+            st.caption("Aktifkan \"Tampilkan plot SHAP\" untuk menampilkan grafik.")
         else:
+            # Nilai SHAP hanya dimuat untuk model yang dipilih
+            shap_values_terpilih = registry.get_shap_values(MODEL_KEYS[pilihan_model])
+
+            # Jika dipilih model Neural Network
+            if pilihan_model == "Neural Network":
+
+                # Plot pertama
+                st.subheader("🔹 Plot SHAP Bar")
+                fig1, ax1 = plt.subplots()
+                shap.plots.bar(shap_values_terpilih, max_display=20, show=False)
+                ax1.set_title(
+                    "Model Neural Network - Urutan Bobot Pengaruh Setiap Variabel"
+                )
+                st.pyplot(fig1)
+
+                # Plot kedua
+                st.subheader("🔹 Plot SHAP Summary")
+                fig2, ax2 = plt.subplots()
+                shap.summary_plot(shap_values_terpilih, show=False)
+                ax2.set_title("Model Neural Network - Interaksi Variabel Terhadap BPP")
+                st.pyplot(fig2)
+
+            # Jika dipilih model elastic
+            elif pilihan_model == "Elastic":
+
+                # Plot pertama
+                st.subheader("🔹 Plot SHAP Bar")
+                fig1, ax1 = plt.subplots()
+                shap.plots.bar(shap_values_terpilih, max_display=20, show=False)
+                ax1.set_title("Model Elastic - Urutan Bobot Pengaruh Setiap Variabel")
+                st.pyplot(fig1)
+
+                # Plot kedua
+                st.subheader("🔹 Plot SHAP Summary")
+                fig2, ax2 = plt.subplots()
+                shap.summary_plot(shap_values_terpilih, show=False)
+                ax2.set_title("Model Elastic - Interaksi Variabel Terhadap BPP")
+                st.pyplot(fig2)
+
+            # Jika dipilih model ridge
+            elif pilihan_model == "Ridge":
+
+                # Plot pertama
+                st.subheader("🔹 Plot SHAP Bar")
+                fig1, ax1 = plt.subplots()
+                shap.plots.bar(shap_values_terpilih, max_display=20, show=False)
+                ax1.set_title("Model Ridge - Urutan Bobot Pengaruh Setiap Variabel")
+                st.pyplot(fig1)
+
+                # Plot kedua
+                st.subheader("🔹 Plot SHAP Summary")
+                fig2, ax2 = plt.subplots()
+                shap.summary_plot(shap_values_terpilih, show=False)
+                ax2.set_title("Model Ridge - Interaksi Variabel Terhadap BPP")
+                st.pyplot(fig2)
+
+            # Jika dipilih knn
+            else:
 
-            # Plot pertama
-            st.subheader("🔹 Plot SHAP Bar")
-            fig1, ax1 = plt.subplots()
-            shap.plots.bar(shap_values_knn, max_display=20, show=False)
-            ax1.set_title("Model KNN - Urutan Bobot Pengaruh Setiap Variabel")
-            st.pyplot(fig1)
-
-            # Plot kedua
-            st.subheader("🔹 Plot SHAP Summary")
-            fig2, ax2 = plt.subplots()
-            shap.summary_plot(shap_values_knn, show=False)
-            ax2.set_title("Model KNN - Interaksi Variabel Terhadap BPP")
-            st.pyplot(fig2)
+                # Plot pertama
+                st.subheader("🔹 Plot SHAP Bar")
+                fig1, ax1 = plt.subplots()
+                shap.plots.bar(shap_values_terpilih, max_display=20, show=False)
+                ax1.set_title("Model KNN - Urutan Bobot Pengaruh Setiap Variabel")
+                st.pyplot(fig1)
+
+                # Plot kedua
+                st.subheader("🔹 Plot SHAP Summary")
+                fig2, ax2 = plt.subplots()
+                shap.summary_plot(shap_values_terpilih, show=False)
+                ax2.set_title("Model KNN - Interaksi Variabel Terhadap BPP")
+                st.pyplot(fig2)
 
 # Tab ketiga
 with tab3:
@@ -2320,19 +2422,25 @@ with tab3:
     pilihan_waktu = st.selectbox("Pilih waktu yang mau diinvestigasi", (rentang_waktu))
     index_pilihan = rentang_waktu.index(pilihan_waktu)
 
+    # Plot SHAP waterfall (shap & matplotlib) hanya dirender jika diminta
+    tampil_waterfall = st.toggle(
+        "Tampilkan plot SHAP waterfall", value=False, key="tampil_waterfall"
+    )
+
     # Jika yang terpilih neural network
     if pilihan_model2 == "Neural Network (NN)":
 
         # Plot Waterfall
         st.write(f"Nilai BPP Asli = {df.BPP[index_pilihan]:.2f}")
         st.write(f"Error model {str(pilihan_model2)} = ± {error_keras}")
-        st.subheader("🔹 Plot SHAP Bar")
-        fig, ax = plt.subplots()
-        shap.plots.waterfall(
-            shap_values_keras[index_pilihan], max_display=20, show=False
-        )
-        ax.set_title("Model Neural Network - Pengaruh Setiap Variabel Terhadap BPP")
-        st.pyplot(fig)
+        if tampil_waterfall:
+            st.subheader("🔹 Plot SHAP Bar")
+            fig, ax = plt.subplots()
+            shap.plots.waterfall(
+                registry.get_shap_values("keras")[index_pilihan], max_display=20, show=False
+            )
+            ax.set_title("Model Neural Network - Pengaruh Setiap Variabel Terhadap BPP")
+            st.pyplot(fig)
 
         st.markdown(
             f"<b>Cara Kerja Model {pilihan_model2}</b>:", unsafe_allow_html=True
@@ -2355,13 +2463,14 @@ with tab3:
         # Plot Waterfall
         st.write(f"Nilai BPP Asli = {df.BPP[index_pilihan]:.2f}")
         st.write(f"Error model {str(pilihan_model2)} = ± {error_elastic}")
-        st.subheader("🔹 Plot SHAP Bar")
-        fig, ax = plt.subplots()
-        shap.plots.waterfall(
-            shap_values_elastic[index_pilihan], max_display=20, show=False
-        )
-        ax.set_title("Model Elastic Net - Pengaruh Setiap Variabel Terhadap BPP")
-        st.pyplot(fig)
+        if tampil_waterfall:
+            st.subheader("🔹 Plot SHAP Bar")
+            fig, ax = plt.subplots()
+            shap.plots.waterfall(
+                registry.get_shap_values("elastic")[index_pilihan], max_display=20, show=False
+            )
+            ax.set_title("Model Elastic Net - Pengaruh Setiap Variabel Terhadap BPP")
+            st.pyplot(fig)
 
         st.markdown(
             f"<b>Cara Kerja Model {pilihan_model2}</b>:", unsafe_allow_html=True
@@ -2385,13 +2494,14 @@ with tab3:
         # Plot Waterfall
         st.write(f"Nilai BPP Asli = {df.BPP[index_pilihan]:.2f}")
         st.write(f"Error model {str(pilihan_model2)} = ± {error_ridge}")
-        st.subheader("🔹 Plot SHAP Bar")
-        fig, ax = plt.subplots()
-        shap.plots.waterfall(
-            shap_values_ridge[index_pilihan], max_display=20, show=False
-        )
-        ax.set_title("Model Ridge Regression - Pengaruh Setiap Variabel Terhadap BPP")
-        st.pyplot(fig)
+        if tampil_waterfall:
+            st.subheader("🔹 Plot SHAP Bar")
+            fig, ax = plt.subplots()
+            shap.plots.waterfall(
+                registry.get_shap_values("ridge")[index_pilihan], max_display=20, show=False
+            )
+            ax.set_title("Model Ridge Regression - Pengaruh Setiap Variabel Terhadap BPP")
+            st.pyplot(fig)
 
         st.markdown(
             f"<b>Cara Kerja Model {pilihan_model2}</b>:", unsafe_allow_html=True
@@ -2414,11 +2524,14 @@ with tab3:
         # Plot Waterfall
         st.write(f"Nilai BPP Asli = {df.BPP[index_pilihan]:.2f}")
         st.write(f"Error model {str(pilihan_model2)} = ± {error_knn}")
-        st.subheader("🔹 Plot SHAP Bar")
-        fig, ax = plt.subplots()
-        shap.plots.waterfall(shap_values_knn[index_pilihan], max_display=20, show=False)
-        ax.set_title("Model KNN - Pengaruh Setiap Variabel Terhadap BPP")
-        st.pyplot(fig)
+        if tampil_waterfall:
+            st.subheader("🔹 Plot SHAP Bar")
+            fig, ax = plt.subplots()
+            shap.plots.waterfall(
+                registry.get_shap_values("knn")[index_pilihan], max_display=20, show=False
+            )
+            ax.set_title("Model KNN - Pengaruh Setiap Variabel Terhadap BPP")
+            st.pyplot(fig)
 
         st.markdown(
             f"<b>Cara Kerja Model {pilihan_model2}</b>:", unsafe_allow_html=True
@@ -0,0 +1,487 @@
+# -*- coding: utf-8 -*-
+"""
+Loader Dataset BPP dari Google Sheets
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Dataset BPP diunduh sekali (export XLSX Google Sheets) lalu disimpan di
+cache bersama per proses. Frame tampilan (angka berformat akuntansi untuk
+st.dataframe) diturunkan dari frame numerik yang sama, sehingga hanya ada
+satu unduhan & satu parse dan kedua tampilan tidak pernah berbeda.
+
+Selama umur cache (TTL) belum habis, setiap rerun langsung memakai frame
+di memori tanpa menyentuh jaringan.
+
+Setelah TTL habis, revalidasi dijalankan di thread background:
+- request kondisional (If-None-Match / If-Modified-Since) jika server
+  mengirim ETag / Last-Modified, respons 304 berarti data tidak berubah
+- jika tidak ada header tersebut, isi file dibandingkan lewat hash SHA-256
+  sehingga parse ulang hanya terjadi jika isi dataset benar-benar berubah
+Selama revalidasi berjalan, rerun tetap memakai frame lama.
+
+Setiap kali isi dataset berubah, frame numerik juga disimpan sebagai
+snapshot kolumnar lokal (Arrow IPC / Feather, tanpa kompresi) beserta hash
+isi sumbernya, frame tampilan dan versi datanya. Saat proses baru start,
+snapshot ini dibuka lewat memory map sehingga render pertama tidak perlu
+menunggu unduhan, parse XLSX (openpyxl), format tampilan maupun hash
+versi; revalidasi ke sumber langsung berjalan di background.
+
+Setiap frame juga diberi versi berbasis hash isi (data_version.py) yang
+ikut di-swap bersama frame. Jika isi sumber berubah tetapi datanya sama
+(contoh: metadata XLSX), frame lama dipertahankan; jika berbeda, bulan
+dan kolom yang berubah dicatat (changes) sehingga cache hasil turunan
+cukup dihitung ulang untuk bagian yang berubah.
+
+Pengambilan & parse data dilakukan oleh backend di data_sources.py
+(remote export, XLSX/CSV lokal, in-memory). Jika belum ada snapshot dan
+backend utama gagal (offline), dataset lokal yang ikut di repo
+(DATABASE BPP_EXCEL.xlsx) dipakai sebagai fallback.
+
+Konfigurasi lewat environment:
+- BPP_DATASET_TTL      : umur cache dalam detik (default 300)
+- BPP_DATASET_TIMEOUT  : timeout unduhan dalam detik (default 10)
+- BPP_DATASET_SOURCE   : backend utama: remote (default), remote-csv, xlsx, csv
+- BPP_DATASET_OFFLINE  : "1" untuk langsung memakai XLSX lokal
+- BPP_SNAPSHOT_FILE    : lokasi snapshot Arrow (kosongkan untuk menonaktifkan)
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import streamlit as st
+
+from background_refresh import get_background_refresher
+from data_sources import CAP_NETWORK, LocalXlsxSource, make_source
+from data_version import DatasetVersion, diff_versions
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DATASET_TTL = float(os.environ.get("BPP_DATASET_TTL", "300"))
+OFFLINE = os.environ.get("BPP_DATASET_OFFLINE", "").lower() in ("1", "true", "yes")
+
+# Backend dataset (lihat data_sources.SOURCES); mode offline = XLSX lokal
+DATASET_SOURCE = "xlsx" if OFFLINE else os.environ.get("BPP_DATASET_SOURCE", "remote")
+SNAPSHOT_FILE = os.environ.get(
+    "BPP_SNAPSHOT_FILE", os.path.join(BASE_DIR, "bpp_dataset_snapshot.arrow")
+)
+
+# Key metadata schema Arrow untuk informasi sumber, versi dataset dan
+# daftar kolom view turunan (contoh: frame tampilan) di snapshot
+SNAPSHOT_META_KEY = b"bpp_source"
+SNAPSHOT_VERSION_KEY = b"bpp_version"
+SNAPSHOT_VIEWS_KEY = b"bpp_views"
+
+# Jumlah desimal per kolom di frame tampilan (mengikuti format di spreadsheet),
+# kolom lain tampil tanpa desimal
+DISPLAY_DECIMALS = {"BPP": 3, "Rumus": 3}
+
+
+# ============ FRAME TAMPILAN ============
+def format_amount_column(series, decimals):
+    """
+    Format akuntansi satu kolom sekaligus (pyarrow.compute, tanpa loop per
+    sel): 1,958,599,245 / (135,948,923) untuk negatif / - untuk nol /
+    string kosong untuk NaN.
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    missing = np.isnan(values)
+    scale = 10**decimals
+    scaled = np.round(np.abs(np.where(missing, 0.0, values)) * scale).astype(np.int64)
+
+    # Pemisah ribuan: digit diberi nol di depan sampai kelipatan 3, dipotong
+    # per 3 digit, digabung dengan koma, lalu nol & koma di depan dibuang
+    whole = pc.cast(pa.array(scaled // scale), pa.string())
+    digits = pc.max(pc.utf8_length(whole)).as_py() or 1
+    width = 3 * -(-digits // 3)
+    padded = pc.utf8_lpad(whole, width, "0")
+    groups = [pc.utf8_slice_codeunits(padded, i, i + 3) for i in range(0, width, 3)]
+    text = pc.utf8_ltrim(pc.binary_join_element_wise(*groups, ","), "0,")
+    text = pc.if_else(pc.equal(text, ""), "0", text)
+    if decimals:
+        fraction = pc.utf8_lpad(pc.cast(pa.array(scaled % scale), pa.string()), decimals, "0")
+        text = pc.binary_join_element_wise(text, fraction, ".")
+
+    text = pc.if_else(pa.array(values < 0), pc.binary_join_element_wise("(", text, ")", ""), text)
+    text = pc.if_else(pa.array(values == 0), "-", text)
+    text = pc.if_else(pa.array(missing), "", text)
+    return pd.Series(pd.arrays.ArrowExtensionArray(text), index=series.index, name=series.name)
+
+
+def format_display_frame(df):
+    """
+    Menurunkan frame tampilan dari frame numerik: Bulan menjadi "Jan-23",
+    angka diberi pemisah ribuan dengan format akuntansi dan jumlah desimal
+    sesuai DISPLAY_DECIMALS. Setiap kolom diformat utuh sekaligus.
+    """
+    display = pd.DataFrame(index=df.index)
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            month = pc.strftime(pa.array(series), format="%b-%y")
+            display[col] = pd.Series(pd.arrays.ArrowExtensionArray(month), index=df.index)
+        elif pd.api.types.is_numeric_dtype(series):
+            display[col] = format_amount_column(series, DISPLAY_DECIMALS.get(col, 0))
+        else:
+            display[col] = series
+    return display
+
+
+# ============ SNAPSHOT KOLUMNAR ============
+def write_snapshot(frame, path, source_info, views=None):
+    """
+    Menyimpan frame sebagai file Arrow IPC tanpa kompresi (bisa di-memory map)
+    dengan info sumber (hash isi, URL, ETag, Last-Modified) di metadata schema.
+    views (opsional) ikut disimpan agar start berikutnya tidak menghitungnya
+    ulang: view berupa DataFrame sebagai kolom "<nama>:<kolom>", DatasetVersion
+    ("version") sebagai JSON di metadata.
+    Ditulis ke file sementara lalu di-rename agar pembaca tidak melihat
+    file setengah jadi.
+    """
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SNAPSHOT_META_KEY] = json.dumps(source_info).encode("utf-8")
+    view_columns = {}
+    for name, view in (views or {}).items():
+        if isinstance(view, DatasetVersion):
+            metadata[SNAPSHOT_VERSION_KEY] = json.dumps(view.to_dict()).encode("utf-8")
+        elif isinstance(view, pd.DataFrame):
+            view_table = pa.Table.from_pandas(view, preserve_index=False)
+            view_columns[name] = view_table.column_names
+            for col, column in zip(view_table.column_names, view_table.columns):
+                table = table.append_column(f"{name}:{col}", column)
+    metadata[SNAPSHOT_VIEWS_KEY] = json.dumps(view_columns).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = f"{path}.tmp"
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path):
+    """
+    Membuka snapshot lewat memory map. Return (frame, views, info sumber);
+    views hanya berisi view yang tersimpan di snapshot. Kolom view dibaca
+    sebagai string Arrow tanpa copy.
+    """
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+        metadata = table.schema.metadata or {}
+        view_columns = json.loads(metadata.get(SNAPSHOT_VIEWS_KEY, b"{}"))
+        stored = {f"{name}:{col}" for name, columns in view_columns.items() for col in columns}
+        data_columns = [col for col in table.column_names if col not in stored]
+        frame = table.select(data_columns).to_pandas(split_blocks=True)
+
+        views = {}
+        for name, columns in view_columns.items():
+            view = table.select([f"{name}:{col}" for col in columns])
+            views[name] = view.to_pandas(types_mapper=pd.ArrowDtype).set_axis(columns, axis=1)
+    if SNAPSHOT_VERSION_KEY in metadata:
+        views["version"] = DatasetVersion.from_dict(json.loads(metadata[SNAPSHOT_VERSION_KEY]))
+    info = json.loads(metadata.get(SNAPSHOT_META_KEY, b"{}"))
+    return frame, views, info
+
+
+class DatasetLoader:
+    """
+    Cache satu dataset dari sebuah DataSource beserta validator (ETag,
+    Last-Modified, hash isi). get() tidak pernah menunggu sumber kecuali
+    saat pertama kali dimuat; revalidasi setelah TTL berjalan di background.
+
+    views berisi fungsi turunan frame (nama -> fungsi) yang dihitung
+    sekali setiap isi dataset berubah dan di-swap bersama frame-nya.
+
+    Frame yang dikembalikan dipakai bersama oleh semua sesi,
+    jangan diubah in-place.
+    """
+
+    def __init__(
+        self,
+        source,
+        fallback=None,
+        views=None,
+        ttl=DATASET_TTL,
+        snapshot_path=SNAPSHOT_FILE,
+    ):
+        self.source = source
+        self.fallback = fallback
+        self.view_builders = views or {}
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path or None
+
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        # (frame, views) disimpan dalam satu tuple agar selalu konsisten;
+        # views["version"] berisi DatasetVersion frame tersebut
+        self._current = (None, {})
+        self.changes = None
+        self.origin = None
+        self.validators = {}
+        self.content_hash = None
+        self.validated_at = None
+        # Waktu (epoch detik) data terakhir dipastikan sama dengan sumber
+        self.checked_at = None
+        self.last_access = None
+
+        self._stats = {
+            "fetches": 0,
+            "not_modified": 0,
+            "unchanged": 0,
+            "updated": 0,
+            "failures": 0,
+            "last_error": None,
+            "last_fetch_seconds": None,
+            "last_parse_seconds": None,
+            "snapshot_load_seconds": None,
+            "snapshot_write_seconds": None,
+            "snapshot_error": None,
+        }
+
+    def _apply(self, source, body):
+        """Parse isi sumber hanya jika hash-nya berbeda dari frame saat ini."""
+        content_hash = hashlib.sha256(body).hexdigest()
+        if self.frame is not None and content_hash == self.content_hash:
+            self._stats["unchanged"] += 1
+            self.origin = source.name
+            return
+
+        frame = source.parse(body)
+        start = time.perf_counter()
+        version = DatasetVersion.from_frame(frame)
+        old_version = self._current[1].get("version")
+        if old_version is not None and version.hash == old_version.hash:
+            # Bytes berbeda tetapi isi data sama: frame & cache turunan tetap dipakai
+            self._stats["unchanged"] += 1
+            self.content_hash, self.origin = content_hash, source.name
+            return
+
+        views = self._build_views(frame, {"version": version})
+        self._stats["last_parse_seconds"] = source.timings["parse_seconds"] + (
+            time.perf_counter() - start
+        )
+        self.changes = diff_versions(old_version, version)
+
+        # Swap referensi sekaligus agar pembaca tidak melihat frame setengah jadi
+        self._current = (frame, views)
+        self.content_hash, self.origin = content_hash, source.name
+        self._stats["updated"] += 1
+        self._save_snapshot()
+
+    def _build_views(self, frame, views=None):
+        """Melengkapi views (versi & view_builders) yang belum ada untuk frame."""
+        views = dict(views or {})
+        if "version" not in views:
+            views["version"] = DatasetVersion.from_frame(frame)
+        for name, build in self.view_builders.items():
+            if name not in views:
+                views[name] = build(frame)
+        return views
+
+    # ============ SNAPSHOT ============
+    def _save_snapshot(self):
+        """Menyimpan frame saat ini ke snapshot; gagal tulis tidak menghentikan app."""
+        if self.snapshot_path is None:
+            return
+        info = {
+            "content_hash": self.content_hash,
+            "location": self.source.location,
+            "validators": self.validators,
+        }
+        start = time.perf_counter()
+        try:
+            write_snapshot(self.frame, self.snapshot_path, info, views=self._current[1])
+            self._stats["snapshot_write_seconds"] = time.perf_counter() - start
+        except (OSError, pa.ArrowException) as e:
+            self._stats["snapshot_error"] = str(e)
+
+    def _load_snapshot(self):
+        """
+        Memuat snapshot lokal jika ada dan berasal dari sumber yang sama.
+        Return True jika berhasil; revalidasi ke sumber tetap diperlukan.
+        """
+        if self.snapshot_path is None or not os.path.exists(self.snapshot_path):
+            return False
+
+        start = time.perf_counter()
+        try:
+            frame, stored_views, info = read_snapshot(self.snapshot_path)
+        except (OSError, ValueError, KeyError, pa.ArrowException) as e:
+            self._stats["snapshot_error"] = str(e)
+            return False
+        if info.get("location") != self.source.location or not info.get("content_hash"):
+            return False
+
+        # Versi & frame tampilan tersimpan di snapshot; hanya snapshot lama
+        # (tanpa view) yang perlu menghitungnya di sini
+        views = self._build_views(frame, stored_views)
+        self._stats["snapshot_load_seconds"] = time.perf_counter() - start
+
+        self.validators = info.get("validators") or {}
+        self._current = (frame, views)
+        self.content_hash, self.origin = info["content_hash"], "snapshot"
+        self.checked_at = os.path.getmtime(self.snapshot_path)
+        if views.keys() != stored_views.keys():
+            self._save_snapshot()
+        return True
+
+    def _load_fallback(self):
+        body, _ = self.fallback.fetch()
+        self._apply(self.fallback, body)
+        self.checked_at = time.time()
+
+    def _revalidate(self):
+        """Satu siklus revalidasi; kegagalan sumber tidak membuang frame lama."""
+        try:
+            self._stats["fetches"] += 1
+            body, validators = self.source.fetch(self.validators)
+            self._stats["last_fetch_seconds"] = self.source.timings["fetch_seconds"]
+            if body is None:
+                self._stats["not_modified"] += 1
+                self.origin = self.source.name
+            else:
+                self.validators = validators
+                self._apply(self.source, body)
+            self.checked_at = time.time()
+        except Exception as e:
+            # Error apapun dari sumber (contoh: XLSX rusak -> BadZipFile, kolom
+            # hilang -> KeyError) dicatat; snapshot terakhir tetap disajikan
+            self._stats["failures"] += 1
+            self._stats["last_error"] = str(e)
+            if self.frame is None:
+                if self.fallback is None:
+                    raise
+                self._load_fallback()
+        finally:
+            self.validated_at = time.monotonic()
+            self._refreshing = False
+
+    # ============ API ============
+    @property
+    def frame(self):
+        return self._current[0]
+
+    def is_stale(self):
+        return self.validated_at is None or time.monotonic() - self.validated_at >= self.ttl
+
+    def refresh(self, wait=False):
+        """
+        Memulai revalidasi (sekali jalan, tidak dobel). Dengan wait=True
+        revalidasi dijalankan di thread pemanggil.
+        """
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+
+        if wait:
+            self._revalidate()
+        else:
+            threading.Thread(
+                target=self._revalidate, name="bpp-dataset-refresh", daemon=True
+            ).start()
+        return True
+
+    def snapshot(self):
+        """
+        Pasangan (frame, views) terbaru yang ada di cache. Keduanya selalu
+        berasal dari isi dataset yang sama.
+        """
+        self.last_access = time.monotonic()
+        if self.frame is None:
+            with self._lock:
+                first_load = self.frame is None and not self._refreshing
+                if first_load:
+                    self._refreshing = True
+            if first_load:
+                if self._load_snapshot():
+                    # Snapshot langsung dipakai, sumber dicek di background
+                    self._refreshing = False
+                    self.refresh()
+                else:
+                    self._revalidate()
+            else:
+                # Thread lain sedang memuat pertama kali, tunggu sampai selesai
+                while self.frame is None and self._refreshing:
+                    time.sleep(0.01)
+                if self.frame is None:
+                    return self.snapshot()
+        elif self.is_stale():
+            self.refresh()
+        return self._current
+
+    def get(self):
+        """Frame dataset terbaru yang ada di cache."""
+        return self.snapshot()[0]
+
+    @property
+    def version(self):
+        """DatasetVersion dari frame yang sedang dipakai."""
+        return self._current[1].get("version")
+
+    def stats(self):
+        age = None if self.checked_at is None else time.time() - self.checked_at
+        return {
+            "source": self.source.name,
+            "location": self.source.location,
+            "capabilities": ", ".join(sorted(self.source.capabilities)),
+            "origin": self.origin,
+            "rows": None if self.frame is None else len(self.frame),
+            "content_hash": self.content_hash[:12] if self.content_hash else None,
+            "version": self.version.short_hash if self.version else None,
+            "changed_months": None if self.changes is None else len(
+                self.changes["added_months"] + self.changes["changed_months"]
+            ),
+            "etag": self.validators.get("etag"),
+            "last_modified": self.validators.get("last_modified"),
+            "checked_at": self.checked_at,
+            "age_seconds": age,
+            "ttl_seconds": self.ttl,
+            "refreshing": self._refreshing,
+            "snapshot_file": self.snapshot_path and os.path.basename(self.snapshot_path),
+            **self._stats,
+        }
+
+
+@st.cache_resource
+def get_dataset_loader():
+    """
+    Loader bersama dataset BPP: satu kali fetch menghasilkan frame
+    numerik dan frame tampilan ("display"). Backend jaringan memakai
+    XLSX lokal sebagai fallback.
+    """
+    source = make_source(DATASET_SOURCE)
+    fallback = LocalXlsxSource() if source.has(CAP_NETWORK) else None
+    loader = DatasetLoader(source, fallback, views={"display": format_display_frame})
+    return get_background_refresher().register("dataset", loader)
+
+
+def load_datasets():
+    """
+    Return (frame numerik, frame tampilan, DatasetVersion) dari satu versi
+    dataset yang sama.
+    """
+    frame, views = get_dataset_loader().snapshot()
+    return frame, views["display"], views["version"]
+
+
+def dataset_changes():
+    """Bulan & kolom yang berubah pada refresh dataset terakhir (None jika belum ada)."""
+    return get_dataset_loader().changes
+
+
+def dataset_checked_at():
+    """Waktu (epoch detik) dataset terakhir dipastikan sama dengan sumbernya."""
+    return get_dataset_loader().checked_at
+
+
+def dataset_stats():
+    """Statistik cache dataset untuk ditampilkan di dashboard."""
+    return get_dataset_loader().stats()
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+Sumber Data Dataset BPP
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Abstraksi DataSource untuk dataset BPP dengan beberapa backend:
+- RemoteExportSource : export XLSX/CSV Google Sheets (butuh jaringan)
+- LocalXlsxSource    : file XLSX lokal (DATABASE BPP_EXCEL.xlsx)
+- LocalCsvSource     : file CSV lokal berformat akuntansi (DATABASE BPP.csv)
+- InMemorySource     : DataFrame di memori (benchmark / pengujian offline)
+
+Semua backend menghasilkan frame dengan schema yang sama (DATASET_SCHEMA),
+mencatat waktu fetch & parse, dan mendeklarasikan kemampuan (capabilities)
+sehingga deployment bisa memilih backend tercepat lewat BPP_DATASET_SOURCE.
+
+Setiap backend memisahkan fetch (mengambil bytes mentah, bisa kondisional)
+dan parse (bytes -> frame ber-schema), sehingga loader bisa membandingkan
+hash isi sebelum parse.
+
+Cara membandingkan backend:
+    python data_sources.py
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import io
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pyarrow as pa
+
+from accounting_parser import normalize_headers, read_accounting_csv
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# URL export Google Sheets dataset BPP
+SPREADSHEET_EXPORT_URL = "https://docs.google.com/spreadsheets/d/16hZccWcjepE-Ac9Qd-9kBpJiJ8zhu2ON/export?format={fmt}"
+
+# Dataset lokal yang ikut di repo
+LOCAL_XLSX_FILE = "DATABASE BPP_EXCEL.xlsx"
+LOCAL_CSV_FILE = "DATABASE BPP.csv"
+
+FETCH_TIMEOUT = float(os.environ.get("BPP_DATASET_TIMEOUT", "10"))
+
+# Kemampuan backend
+CAP_NETWORK = "network"  # butuh koneksi internet
+CAP_CONDITIONAL = "conditional"  # fetch bisa dilewati jika sumber tidak berubah
+CAP_OFFLINE = "offline"  # tetap bisa dipakai tanpa internet
+CAP_FULL_PRECISION = "full_precision"  # angka tidak dibulatkan format tampilan
+
+# Schema dataset BPP: kolom -> jenis nilai
+# Kolom "integer" disimpan int64, atau float64 jika ada sel kosong
+DATASET_SCHEMA = {
+    "Bulan": "datetime",
+    "Produksi (kWh)": "float",
+    "Penjualan (kWh)": "integer",
+    "BPP": "float",
+    "Rumus": "float",
+    "Pendapatan": "integer",
+    "Beban Pembelian Tenaga Listrik": "integer",
+    "Beban Sewa": "integer",
+    "Beban Bio Solar": "integer",
+    "Beban Batubara": "integer",
+    "Beban Biomassa": "integer",
+    "Beban Kimia": "integer",
+    "Beban Minyak Pelumas": "integer",
+    "Beban Pemeliharaan": "integer",
+    "Beban Kepegawaian": "integer",
+    "Beban Penyusutan Aset Tetap": "integer",
+    "Beban Penyusutan Aset Tetap (Sewa)": "integer",
+    "Beban Administrasi": "integer",
+    "Beban Emisi Carbon": "integer",
+    "Beban Fee EPI": "integer",
+    "Beban Lain-lain": "integer",
+    "Profit": "integer",
+}
+
+# Format kolom Bulan di export CSV (contoh: Jan-23)
+MONTH_FORMAT = "%b-%y"
+
+
+class SchemaError(ValueError):
+    """Frame dari sumber data tidak sesuai DATASET_SCHEMA."""
+
+
+def conform_to_schema(frame, schema=DATASET_SCHEMA):
+    """
+    Menyamakan frame dengan schema: nama kolom dinormalisasi, urutan
+    kolom mengikuti schema (kolom tambahan dibuang) dan tipe data dicast.
+    Raise SchemaError jika ada kolom yang hilang atau tidak bisa dicast.
+    """
+    frame = normalize_headers(frame)
+    missing = [c for c in schema if c not in frame.columns]
+    if missing:
+        raise SchemaError(f"Kolom dataset tidak ditemukan: {missing}")
+
+    out = {}
+    for col, kind in schema.items():
+        series = frame[col]
+        try:
+            if kind == "datetime":
+                if not pd.api.types.is_datetime64_any_dtype(series):
+                    series = pd.to_datetime(series, format=MONTH_FORMAT)
+                series = series.astype("datetime64[ns]")
+            elif kind == "integer" and not series.isna().any():
+                series = series.astype("int64")
+            else:
+                series = series.astype("float64")
+        except (TypeError, ValueError) as e:
+            raise SchemaError(f"Kolom {col!r} tidak sesuai tipe {kind}: {e}") from e
+        out[col] = series
+    return pd.DataFrame(out).reset_index(drop=True)
+
+
+def frame_to_ipc_bytes(frame):
+    """Serialisasi frame ke bytes Arrow IPC (dipakai InMemorySource)."""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# ============ BACKEND ============
+class DataSource:
+    """
+    Kontrak backend dataset BPP.
+
+    fetch(validators) -> (bytes atau None jika tidak berubah, validators baru)
+    parse(bytes)      -> frame mentah
+    load()            -> fetch + parse + conform_to_schema
+    """
+
+    name = "base"
+    capabilities = frozenset()
+
+    def __init__(self, location):
+        self.location = location
+        self.timings = {"fetch_seconds": None, "parse_seconds": None}
+
+    @property
+    def schema(self):
+        return DATASET_SCHEMA
+
+    def has(self, capability):
+        return capability in self.capabilities
+
+    def _fetch(self, validators):
+        raise NotImplementedError
+
+    def _parse(self, body):
+        raise NotImplementedError
+
+    def fetch(self, validators=None):
+        start = time.perf_counter()
+        try:
+            return self._fetch(dict(validators or {}))
+        finally:
+            self.timings["fetch_seconds"] = time.perf_counter() - start
+
+    def parse(self, body):
+        start = time.perf_counter()
+        try:
+            return conform_to_schema(self._parse(body))
+        finally:
+            self.timings["parse_seconds"] = time.perf_counter() - start
+
+    def load(self):
+        """Fetch tanpa validator lalu parse. Return frame ber-schema."""
+        body, _ = self.fetch()
+        return self.parse(body)
+
+    def describe(self):
+        return {
+            "source": self.name,
+            "location": self.location,
+            "capabilities": sorted(self.capabilities),
+            **self.timings,
+        }
+
+
+class RemoteExportSource(DataSource):
+    """Export Google Sheets; mendukung request kondisional (ETag / Last-Modified)."""
+
+    name = "remote"
+
+    def __init__(self, fmt="xlsx", url=None, timeout=FETCH_TIMEOUT):
+        if fmt not in ("xlsx", "csv"):
+            raise ValueError(f"Format export tidak didukung: {fmt}")
+        super().__init__(url or SPREADSHEET_EXPORT_URL.format(fmt=fmt))
+        self.fmt = fmt
+        self.timeout = timeout
+        self.capabilities = frozenset(
+            {CAP_NETWORK, CAP_CONDITIONAL}
+            | ({CAP_FULL_PRECISION} if fmt == "xlsx" else set())
+        )
+
+    def _fetch(self, validators):
+        request = urllib.request.Request(self.location)
+        if validators.get("etag"):
+            request.add_header("If-None-Match", validators["etag"])
+        if validators.get("last_modified"):
+            request.add_header("If-Modified-Since", validators["last_modified"])
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None, validators
+            raise
+
+        validators["etag"] = headers.get("ETag") or validators.get("etag")
+        validators["last_modified"] = headers.get("Last-Modified") or validators.get("last_modified")
+        return body, validators
+
+    def _parse(self, body):
+        if self.fmt == "xlsx":
+            return pd.read_excel(io.BytesIO(body))
+        frame, _ = read_accounting_csv(io.BytesIO(body))
+        return frame
+
+
+class _LocalFileSource(DataSource):
+    """File lokal; fetch dilewati jika mtime & ukuran file tidak berubah."""
+
+    def __init__(self, path):
+        if not os.path.isabs(path):
+            path = os.path.join(BASE_DIR, path)
+        super().__init__(path)
+
+    def _fetch(self, validators):
+        stat = os.stat(self.location)
+        signature = f"{stat.st_mtime_ns}-{stat.st_size}"
+        if validators.get("etag") == signature:
+            return None, validators
+        with open(self.location, "rb") as f:
+            body = f.read()
+        validators["etag"] = signature
+        return body, validators
+
+
+class LocalXlsxSource(_LocalFileSource):
+    name = "xlsx"
+    capabilities = frozenset({CAP_OFFLINE, CAP_CONDITIONAL, CAP_FULL_PRECISION})
+
+    def __init__(self, path=LOCAL_XLSX_FILE):
+        super().__init__(path)
+
+    def _parse(self, body):
+        return pd.read_excel(io.BytesIO(body))
+
+
+class LocalCsvSource(_LocalFileSource):
+    """CSV berformat akuntansi; angka sudah dibulatkan sesuai format tampilan."""
+
+    name = "csv"
+    capabilities = frozenset({CAP_OFFLINE, CAP_CONDITIONAL})
+
+    def __init__(self, path=LOCAL_CSV_FILE):
+        super().__init__(path)
+
+    def _parse(self, body):
+        frame, report = read_accounting_csv(io.BytesIO(body))
+        if len(report):
+            raise SchemaError(
+                f"{len(report)} sel tidak bisa di-parse, contoh: {report.head(3).to_dict('records')}"
+            )
+        return frame
+
+
+class InMemorySource(DataSource):
+    """Frame di memori, dipakai benchmark & pengujian tanpa file maupun jaringan."""
+
+    name = "memory"
+    capabilities = frozenset({CAP_OFFLINE, CAP_FULL_PRECISION})
+
+    def __init__(self, frame):
+        super().__init__("memory")
+        self.frame = conform_to_schema(frame)
+
+    def _fetch(self, validators):
+        return frame_to_ipc_bytes(self.frame), validators
+
+    def _parse(self, body):
+        return pa.ipc.open_file(pa.BufferReader(body)).read_all().to_pandas()
+
+
+SOURCES = {
+    "remote": lambda: RemoteExportSource("xlsx"),
+    "remote-csv": lambda: RemoteExportSource("csv"),
+    "xlsx": LocalXlsxSource,
+    "csv": LocalCsvSource,
+}
+
+
+def make_source(name):
+    """Membuat backend berdasarkan nama (lihat SOURCES)."""
+    if name not in SOURCES:
+        raise ValueError(f"Sumber data tidak dikenal: {name} (pilihan: {sorted(SOURCES)})")
+    return SOURCES[name]()
+
+
+def compare_sources(names=("xlsx", "csv", "remote")):
+    """
+    Memuat dataset dari setiap backend dan mencatat waktu load, jumlah
+    baris dan apakah dtype-nya identik dengan backend pertama yang berhasil.
+    Backend yang gagal (contoh: offline) dicatat errornya.
+    """
+    results = []
+    reference = None
+    for name in names:
+        source = make_source(name)
+        try:
+            frame = source.load()
+        except (OSError, urllib.error.URLError, ValueError) as e:
+            results.append({**source.describe(), "error": str(e)})
+            continue
+
+        dtypes = [str(t) for t in frame.dtypes]
+        reference = reference or dtypes
+        results.append(
+            {**source.describe(), "rows": len(frame), "same_dtypes": dtypes == reference}
+        )
+    return results
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or ["xlsx", "csv", "remote"]
+    print(json.dumps(compare_sources(names), indent=2, default=str))
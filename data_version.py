@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Versi Dataset BPP Berbasis Hash Isi
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Setiap kali dataset dimuat, DatasetVersion menghitung hash isi frame
+(tidak bergantung format sumber: XLSX, CSV, snapshot):
+- hash per bulan (kolom Bulan) dari semua baris bulan tersebut
+- hash per kolom
+- hash versi keseluruhan
+
+Hasil turunan dataset (matriks korelasi, kurva KDE, nilai default
+sidebar, dll.) di-cache dengan kunci hash kolom yang benar-benar
+dipakainya (lihat columns_key). Saat dataset di-refresh, hanya hasil
+yang bergantung pada kolom yang berubah yang dihitung ulang; sisanya
+tetap memakai cache tanpa st.cache_data.clear(). Hash per bulan dipakai
+diff_versions untuk melaporkan bulan yang berubah.
+
+diff_versions(lama, baru) melaporkan bulan yang ditambah/dihapus/berubah
+dan kolom yang berubah di antara dua versi.
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# Kolom kunci baris dataset BPP
+MONTH_COLUMN = "Bulan"
+
+# Panjang hash yang ditampilkan (statistik / UI)
+SHORT_HASH = 12
+
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _hash_values(series):
+    """Hash uint64 per sel; nilai sama dengan dtype berbeda (int/float) tetap sama."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        series = series.astype(np.float64)
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+class DatasetVersion:
+    """Hash isi dataset per baris, per kolom dan keseluruhan."""
+
+    def __init__(self, column_hashes, row_hashes, row_count):
+        self.column_hashes = column_hashes
+        self.row_hashes = row_hashes
+        self.row_count = row_count
+        self.hash = _digest(
+            row_count, *(f"{col}={h}" for col, h in column_hashes.items())
+        )
+
+    @classmethod
+    def from_frame(cls, frame):
+        cell_hashes = {col: _hash_values(frame[col]) for col in frame.columns}
+        column_hashes = {
+            col: _digest(hashes.tobytes()) for col, hashes in cell_hashes.items()
+        }
+
+        # Hash baris = gabungan hash sel (urutan kolom ikut diperhitungkan)
+        combined = np.zeros(len(frame), dtype=np.uint64)
+        for i, hashes in enumerate(cell_hashes.values()):
+            combined = combined * np.uint64(1_000_003) + hashes + np.uint64(i)
+
+        if MONTH_COLUMN not in frame.columns:
+            row_hashes = {str(i): f"{h:016x}" for i, h in enumerate(combined.tolist())}
+            return cls(column_hashes, row_hashes, len(frame))
+
+        # Data harian: satu bulan bisa berisi banyak baris, hash bulan =
+        # gabungan hash semua barisnya (urutan baris ikut diperhitungkan)
+        months = pd.to_datetime(frame[MONTH_COLUMN])
+        keys = (months.dt.year * 100 + months.dt.month).fillna(-1).astype(np.int64).to_numpy()
+        row_hashes = {}
+        for key, hashes in pd.Series(combined).groupby(keys, sort=False):
+            month = "NaT" if key < 0 else f"{key // 100:04d}-{key % 100:02d}"
+            row_hashes[month] = _digest(hashes.to_numpy().tobytes())[:16]
+        return cls(column_hashes, row_hashes, len(frame))
+
+    def to_dict(self):
+        """Bentuk JSON (disimpan di metadata snapshot dataset)."""
+        return {
+            "column_hashes": self.column_hashes,
+            "row_hashes": self.row_hashes,
+            "row_count": self.row_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["column_hashes"], data["row_hashes"], data["row_count"])
+
+    @property
+    def short_hash(self):
+        return self.hash[:SHORT_HASH]
+
+    def columns_key(self, columns):
+        """Kunci cache untuk hasil yang hanya bergantung pada kolom tertentu."""
+        if isinstance(columns, str):
+            columns = [columns]
+        return _digest(
+            self.row_count, *(f"{col}={self.column_hashes.get(col)}" for col in columns)
+        )
+
+
+def diff_versions(old, new):
+    """
+    Perbedaan dua DatasetVersion: bulan yang ditambah, dihapus, berubah dan
+    kolom yang berubah. old=None berarti semua bulan dianggap baru.
+    """
+    if old is None:
+        return {
+            "added_months": list(new.row_hashes),
+            "removed_months": [],
+            "changed_months": [],
+            "changed_columns": list(new.column_hashes),
+        }
+
+    return {
+        "added_months": [m for m in new.row_hashes if m not in old.row_hashes],
+        "removed_months": [m for m in old.row_hashes if m not in new.row_hashes],
+        "changed_months": [
+            m
+            for m, h in new.row_hashes.items()
+            if m in old.row_hashes and old.row_hashes[m] != h
+        ],
+        "changed_columns": [
+            col
+            for col, h in new.column_hashes.items()
+            if old.column_hashes.get(col) != h
+        ],
+    }
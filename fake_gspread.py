@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Fake Client & Worksheet gspread untuk test & benchmark (tanpa kredensial Google)
+PT. PLN Indonesia Power Suralaya Unit 8
+
+FakeWorksheet menyimpan isi sheet di memori dan meniru method gspread
+yang dipakai gsheet_handler (get_all_values, batch_get, batch_update,
+update, update_cell, append_row, delete_rows). Setiap method publik
+dihitung sebagai satu API call di calls, sehingga jumlah request per
+aksi user bisa diukur dan dibatasi.
+
+Setiap API call bisa diberi latency dan error buatan:
+- latency   : jeda per call (detik), ditambah jitter acak 0..jitter
+- error_rate: peluang call gagal dengan gspread APIError 429
+- fail_next : jumlah call berikutnya yang pasti gagal (deterministik)
+
+FakeClient / FakeSpreadsheet meniru gspread.Client (open_by_url,
+open_by_key) sehingga bisa dipasang lewat factory client gsheet_handler:
+    gsheet_handler.use_client_factory(lambda: FakeClient(rows))
+atau tanpa mengubah kode:
+    BPP_GSPREAD_CLIENT=fake_gspread:make_client streamlit run bpp_app.py
+(latency / error rate lewat BPP_FAKE_LATENCY & BPP_FAKE_ERROR_RATE).
+
+Modul ini berada di root repo agar tests/ dan benchmarks/ memakainya
+tanpa saling bergantung.
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+
+import requests
+from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import a1_to_rowcol
+
+# Batas kolom untuk range tanpa kolom akhir (contoh: "1:1")
+MAX_COLUMNS = 18278
+
+
+def quota_error(code=429, message="Quota exceeded for quota metric 'Read requests'"):
+    """APIError seperti yang dilempar gspread saat kuota habis."""
+    response = requests.Response()
+    response.status_code = code
+    response._content = json.dumps(
+        {"error": {"code": code, "message": message, "status": "RESOURCE_EXHAUSTED"}}
+    ).encode("utf-8")
+    return APIError(response)
+
+
+class FakeWorksheet:
+    def __init__(
+        self, rows=None, title="logs", latency=0.0, jitter=0.0, error_rate=0.0, seed=None
+    ):
+        self.title = title
+        self.rows = [[str(v) for v in row] for row in (rows or [])]
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.fail_next = 0
+        self.calls = Counter()
+        self.errors = Counter()
+        self.seconds = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # ============ INJEKSI LATENCY & ERROR ============
+    def _call(self, method):
+        """Mencatat satu API call, menunggu latency, lalu gagal sesuai konfigurasi."""
+        with self._lock:
+            self.calls[method] += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self.fail_next > 0 or self._random.random() < self.error_rate
+            if self.fail_next > 0:
+                self.fail_next -= 1
+        if delay:
+            time.sleep(delay)
+        self.seconds[method] += delay
+        if fail:
+            self.errors[method] += 1
+            raise quota_error()
+
+    # ============ HELPER ============
+    def _trim(self):
+        while self.rows and not any(self.rows[-1]):
+            self.rows.pop()
+
+    def _set(self, row, col, value):
+        while len(self.rows) < row:
+            self.rows.append([])
+        cells = self.rows[row - 1]
+        while len(cells) < col:
+            cells.append("")
+        cells[col - 1] = str(value)
+
+    def _bounds(self, range_name):
+        """(baris awal, kolom awal, baris akhir, kolom akhir) dari notasi A1."""
+        if re.fullmatch(r"\d+:\d+", range_name):
+            start, end = map(int, range_name.split(":"))
+            return start, 1, end, MAX_COLUMNS
+        start, _, end = range_name.partition(":")
+        row1, col1 = a1_to_rowcol(start)
+        row2, col2 = a1_to_rowcol(end) if end else (row1, col1)
+        return row1, col1, row2, col2
+
+    def _read(self, range_name):
+        row1, col1, row2, col2 = self._bounds(range_name)
+        values = []
+        for row in range(row1, row2 + 1):
+            cells = list(self.rows[row - 1][col1 - 1 : col2]) if row <= len(self.rows) else []
+            while cells and cells[-1] == "":
+                cells.pop()
+            values.append(cells)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def _write(self, range_name, values):
+        row, col = a1_to_rowcol(range_name.split(":")[0])
+        for i, cells in enumerate(values):
+            for j, value in enumerate(cells):
+                self._set(row + i, col + j, value)
+
+    def dump(self):
+        """Isi sheet seperti get_all_values, tanpa dihitung sebagai API call."""
+        self._trim()
+        width = max((len(row) for row in self.rows), default=0)
+        return [row + [""] * (width - len(row)) for row in self.rows]
+
+    # ============ API gspread ============
+    def get_all_values(self):
+        self._call("get_all_values")
+        return self.dump()
+
+    def batch_get(self, ranges, **kwargs):
+        self._call("batch_get")
+        return [self._read(range_name) for range_name in ranges]
+
+    def batch_update(self, data, **kwargs):
+        self._call("batch_update")
+        for item in data:
+            self._write(item["range"], item["values"])
+
+    def update(self, range_name, values=None, **kwargs):
+        self._call("update")
+        self._write(range_name, values)
+
+    def update_cell(self, row, col, value):
+        self._call("update_cell")
+        self._set(row, col, value)
+
+    def append_row(self, values, **kwargs):
+        self._call("append_row")
+        self._trim()
+        self.rows.append([str(v) for v in values])
+
+    def delete_rows(self, start_index, end_index=None):
+        self._call("delete_rows")
+        del self.rows[start_index - 1 : (end_index or start_index)]
+
+    @property
+    def api_calls(self):
+        return sum(self.calls.values())
+
+    def reset_counters(self):
+        self.calls.clear()
+        self.errors.clear()
+        self.seconds.clear()
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheets, url="https://docs.google.com/spreadsheets/d/fake"):
+        self.url = url
+        self._worksheets = {worksheet.title: worksheet for worksheet in worksheets}
+
+    def worksheet(self, title):
+        if title not in self._worksheets:
+            raise WorksheetNotFound(title)
+        return self._worksheets[title]
+
+    def worksheets(self):
+        return list(self._worksheets.values())
+
+
+class FakeClient:
+    """Pengganti gspread.Client: satu spreadsheet berisi worksheet palsu."""
+
+    def __init__(self, rows=None, worksheets=None, **options):
+        if worksheets is None:
+            worksheets = [FakeWorksheet(rows, **options)]
+        self.spreadsheet = FakeSpreadsheet(worksheets)
+        self.calls = Counter()
+
+    def open_by_url(self, url):
+        self.calls["open_by_url"] += 1
+        return self.spreadsheet
+
+    def open_by_key(self, key):
+        self.calls["open_by_key"] += 1
+        return self.spreadsheet
+
+    @property
+    def logs(self):
+        return self.spreadsheet.worksheet("logs")
+
+
+def make_sheet(columns, n_rows):
+    """Isi sheet logs: header columns + n_rows baris data (semua angka 1)."""
+    rows = [list(columns)]
+    for i in range(n_rows):
+        row = [f"2025-01-01 00:{i % 60:02d}:00"] + ["1"] * (len(columns) - 1)
+        rows.append(row)
+    return rows
+
+
+def make_client():
+    """
+    Factory untuk BPP_GSPREAD_CLIENT=fake_gspread:make_client. Sheet logs
+    awal kosong (hanya header), latency & error rate dari environment.
+    """
+    from gsheet_handler import COLUMNS
+
+    return FakeClient(
+        [COLUMNS],
+        latency=float(os.environ.get("BPP_FAKE_LATENCY", "0")),
+        error_rate=float(os.environ.get("BPP_FAKE_ERROR_RATE", "0")),
+    )
@@ -5,16 +5,35 @@ PT. PLN Indonesia Power Suralaya Unit 8
 
 Modul ini menangani semua operasi baca/tulis ke Google Sheets
 menggunakan gspread langsung untuk reliability yang lebih baik.
+
+Penyimpanan (update_component, update_detailed_row, reset) secara default
+lewat antrian write-behind (lihat write_behind.py): aksi user langsung
+selesai, tampilan memakai optimistic update dari intent yang masih antre,
+dan worker background menulis ke sheet dengan retry + backoff.
+Set BPP_WRITE_BEHIND=0 untuk kembali ke penulisan sinkron.
 """
 
 # Mengimpor beberapa library yang diperlukan
+import importlib
+import os
+import threading
 import streamlit as st
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from datetime import datetime
 import pytz
 
+from background_refresh import RefreshableValue, get_background_refresher
+from write_behind import WriteBehindQueue
+from sheet_metrics import get_sheet_metrics, instrument_worksheet, record_call, sheet_action
+from rate_limiter import get_rate_limiter, rate_limit_worksheet
+
+
 # Fungsi untuk mengambil waktu GMT+7
 def get_current_timestamp():
     """Mengembalikan timestamp string format YYYY-MM-DD HH:MM:SS (WIB)."""
@@ -63,6 +82,34 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive",
 ]
 
+# Umur maksimum salinan data sheet logs sebelum di-refresh di background (detik)
+LOGS_TTL = float(os.environ.get("BPP_LOGS_TTL", "10"))
+
+# Penyimpanan lewat antrian write-behind (0 = tulis sinkron seperti sebelumnya)
+WRITE_BEHIND = os.environ.get("BPP_WRITE_BEHIND", "1") != "0"
+
+# Journal antrian write-behind: simpan yang belum tertulis dilanjutkan
+# setelah restart ("" = antrian hanya di memori)
+WRITE_JOURNAL = os.environ.get(
+    "BPP_WRITE_JOURNAL",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "bpp_write_journal.json"),
+)
+
+# Factory client gspread pengganti, format "modul:fungsi" (contoh:
+# fake_gspread:make_client untuk menjalankan app / benchmark tanpa kredensial)
+CLIENT_FACTORY = os.environ.get("BPP_GSPREAD_CLIENT", "")
+
+# Budget API call per aksi (lihat sheet_metrics.sheet_action); pelanggaran
+# dicatat di panel admin, dan raise jika BPP_SHEETS_STRICT_BUDGET=1
+CALL_BUDGETS = {
+    "connect": 2,  # open_by_url + worksheet
+    "load_logs": 1,  # get_all_values
+    "update_component": 2,  # batch_get + batch_update
+    "update_detailed_row": 2,
+    "delete_current_period_row": 2,  # batch_get + delete_rows
+    "write_behind": 2,  # per percobaan flush satu intent
+}
+
 
 # ============ HELPER PARSING ANGKA ============
 def parse_id_numeric(val):
@@ -178,9 +225,92 @@ def parse_id_numeric(val):
         return 0.0
 
 
+# Angka yang bisa dibaca float() setelah karakter selain [0-9.,-] dibuang
+_FLOAT_TEXT = r"^-?(?:\d+\.?\d*|\.\d+)$"
+
+# Separator tunggal dibaca sebagai DESIMAL jika kiri = 0 / -0, atau hanya
+# ada satu separator dengan <= 2 digit di belakangnya (selain itu RIBUAN)
+_DECIMAL_DOT = r"^-?0\.|^[^.]*\.[^.]{0,2}$"
+_DECIMAL_COMMA = r"^-?0,|^[^,]*,[^,]{0,2}$"
 
+# Di bawah jumlah sel ini parser per sel lebih cepat daripada overhead
+# kernel pyarrow (contoh: satu baris baru / optimistic update)
+_VECTOR_MIN_ROWS = 64
 
 
+def parse_id_numeric_series(series):
+    """
+    Versi vectorized parse_id_numeric untuk satu kolom: aturan yang sama
+    dijalankan sekaligus per kolom lewat kernel string pyarrow.compute
+    (tanpa loop per sel di Python). Return Series float64.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(np.float64)
+    if len(series) < _VECTOR_MIN_ROWS:
+        return series.map(parse_id_numeric).astype(np.float64)
+
+    is_text = series.map(lambda v: isinstance(v, str))
+    if not is_text.all():
+        # Sel bukan teks (None / angka) jarang ada: pakai parser per sel
+        out = series.map(parse_id_numeric).astype(np.float64)
+        out[is_text] = parse_id_numeric_series(series[is_text].astype(str))
+        return out
+
+    text = pa.array(series.to_numpy(dtype=object), type=pa.string())
+
+    # Bersihkan karakter ilegal ("Rp", spasi, dll.) dan separator ganda
+    text = pc.replace_substring_regex(text, r"[^\d.,\-]", "")
+    text = pc.replace_substring_regex(text, r"\.+", ".")
+    text = pc.replace_substring_regex(text, r",+", ",")
+
+    has_dot = pc.match_substring(text, ".")
+    has_comma = pc.match_substring(text, ",")
+    no_dot = pc.replace_substring(text, ".", "")
+    no_comma = pc.replace_substring(text, ",", "")
+    comma_as_dot = pc.replace_substring(text, ",", ".")
+
+    # Ada titik & koma: separator terakhir = desimal (EN: 1,234.56 / ID: 1.234,56)
+    dot_last = pc.match_substring_regex(text, r"\.[^,]*$")
+    both = pc.if_else(dot_last, no_comma, pc.replace_substring(no_dot, ",", "."))
+
+    only_dot = pc.if_else(pc.match_substring_regex(text, _DECIMAL_DOT), text, no_dot)
+    only_comma = pc.if_else(
+        pc.match_substring_regex(text, _DECIMAL_COMMA), comma_as_dot, no_comma
+    )
+
+    text = pc.if_else(
+        has_dot,
+        pc.if_else(has_comma, both, only_dot),
+        pc.if_else(has_comma, only_comma, text),
+    )
+
+    # Teks yang gagal dibaca float() (termasuk kosong) menjadi 0
+    valid = pc.match_substring_regex(text, _FLOAT_TEXT)
+    values = pc.cast(pc.if_else(valid, text, "0"), pa.float64())
+    return pd.Series(values.to_numpy(), index=series.index, name=series.name)
+
+
+# Factory client yang sedang dipakai (None = kredensial dari st.secrets)
+_client_factory = None
+
+
+def use_client_factory(factory):
+    """
+    Mengganti pembuat client gspread, contoh FakeClient di benchmark.
+    factory=None kembali ke client asli. Koneksi & data yang sudah
+    di-cache dibuang agar semua pembacaan berikutnya memakai client baru.
+    """
+    global _client_factory
+    _client_factory = factory
+    get_gspread_client.clear()
+    get_logs_worksheet.clear()
+    get_logs_cache.clear()
+    _rerun_state.logs = None
+
+
+def _load_client_factory(path):
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr or "make_client")
 
 
 @st.cache_resource
@@ -190,6 +320,13 @@ def get_gspread_client():
     Menggunakan cache untuk efisiensi.
     """
     try:
+        # Client pengganti (fake / uji offline) tidak butuh kredensial
+        factory = _client_factory
+        if factory is None and CLIENT_FACTORY:
+            factory = _load_client_factory(CLIENT_FACTORY)
+        if factory is not None:
+            return factory()
+
         # Ambil kredensial dari Streamlit secrets
         creds_dict = {
             "type": st.secrets["connections"]["gsheets"]["type"],
@@ -225,58 +362,325 @@ def get_spreadsheet():
         return None
 
     try:
-        spreadsheet_url = st.secrets["connections"]["gsheets"]["spreadsheet"]
-        spreadsheet = client.open_by_url(spreadsheet_url)
+        if isinstance(client, gspread.Client):
+            spreadsheet_url = st.secrets["connections"]["gsheets"]["spreadsheet"]
+        else:
+            # Client pengganti (fake) tidak butuh URL spreadsheet asli
+            spreadsheet_url = ""
+        with record_call("open_by_url"):
+            spreadsheet = client.open_by_url(spreadsheet_url)
         return spreadsheet
     except Exception as e:
         st.error(f"Gagal membuka spreadsheet: {str(e)}")
         return None
 
 
+@sheet_action("connect", budget=CALL_BUDGETS["connect"])
 def get_worksheet():
     """
     Mendapatkan worksheet 'logs'.
+    Setiap request ke worksheet dicatat di sheet_metrics.
     """
     spreadsheet = get_spreadsheet()
     if spreadsheet is None:
         return None
 
     try:
-        worksheet = spreadsheet.worksheet(SHEET_NAME)
-        return worksheet
+        with record_call("worksheet"):
+            worksheet = spreadsheet.worksheet(SHEET_NAME)
+        # Kuota dicek sebelum request dicatat: request yang ditolak tidak dihitung
+        return rate_limit_worksheet(instrument_worksheet(worksheet))
     except Exception as e:
         st.error(f"Gagal membuka worksheet '{SHEET_NAME}': {str(e)}")
         return None
 
 
-@st.cache_data(ttl=10, show_spinner=False)
-def read_all_data():
+@st.cache_resource(validate=lambda worksheet: worksheet is not None, show_spinner=False)
+def get_logs_worksheet():
+    """
+    Worksheet 'logs' yang di-cache per proses, dipakai loader background
+    (tidak perlu open_by_url setiap kali data dibaca).
+    """
+    return get_worksheet()
+
+
+# Kolom params yang harus diperlakukan sebagai float (kolom lain bilangan bulat)
+FLOAT_COLUMNS = [
+    "price_a",
+    "eaf_a",
+    "daya_netto",
+    "price_b",
+    "eaf_b",
+    "price_d",
+    "vol_batubara_kg",
+    "vol_biomassa_kg",
+    "hhv_batubara",
+    "hhv_biomassa",
+    "koef_batubara",
+    "koef_biomassa",
+    "eio_val",
+    "vol_bb",
+    "vol_bio",
+    "harga_bb",
+    "harga_bio"  # Antisipasi nama pendek if any
+]
+
+
+# Kolom komponen (baris lengkap = semua komponen > 0) dan kolom harga
+COMPONENT_COLUMNS = [
+    "komponen_a",
+    "komponen_b",
+    "komponen_c_batubara",
+    "komponen_c_biomassa",
+    "komponen_d",
+]
+PRICE_COLUMNS = ["harga_batubara_rp", "harga_biomassa_rp"]
+
+
+def _last_true_index(mask, offset=0, carry=-1):
     """
-    Membaca semua data dari sheet.
+    Untuk setiap baris: indeks (offset + posisi) baris terakhir sampai baris
+    itu yang mask-nya True, atau carry jika belum ada.
     """
-    worksheet = get_worksheet()
+    idx = np.where(mask, np.arange(offset, offset + len(mask)), -1)
+    return np.maximum.accumulate(np.concatenate([[carry], idx]))[1:]
+
+
+def _common_prefix(rows, previous_rows):
+    """Jumlah baris awal yang sama persis di kedua daftar baris."""
+    for i, (row, previous_row) in enumerate(zip(rows, previous_rows)):
+        if row != previous_row:
+            return i
+    return min(len(rows), len(previous_rows))
+
+
+class LogsSnapshot:
+    """
+    Data sheet logs yang sudah di-parse sekali saat dimuat:
+    - kolom angka (COLUMNS selain timestamp) di-parse dengan
+      parse_id_numeric_series; kolom FLOAT_COLUMNS float64, kolom lain
+      int64 jika semua nilainya bulat (tanpa kehilangan nilai)
+    - kolom yang tidak ada di sheet bernilai 0
+
+    Beserta view termaterialisasi yang dipakai accessor (lookup O(1)):
+    - complete_upto[i]: indeks baris lengkap terakhir sampai baris i
+    - price_upto[col][i]: indeks baris terakhir dengan harga > 0 sampai baris i
+    View ini dipelihara secara inkremental: saat sheet di-refresh, hanya
+    baris yang ditambah / berubah sejak snapshot sebelumnya yang di-parse
+    dan di-scan.
+
+    Snapshot di-cache per proses dan dibagikan ke semua sesi tanpa copy:
+    frame bersifat read-only, pemanggil yang perlu mengubahnya harus
+    membuat salinan sendiri (lihat read_all_data).
+    """
+
+    def __init__(self, header, rows, frame, complete_upto, price_upto):
+        self.header = header
+        self.rows = rows
+        self.frame = frame
+        self.sheet_columns = frozenset(header)
+        self.complete_upto = complete_upto
+        self.price_upto = price_upto
+        self._current_row = None
+        self._latest_complete = None
+
+    @classmethod
+    def from_values(cls, data, previous=None):
+        """
+        Membangun snapshot dari hasil worksheet.get_all_values(). Jika
+        previous diberikan dan header-nya sama, baris awal yang tidak
+        berubah dipakai ulang dari previous.
+        """
+        header = list(data[0]) if data else list(COLUMNS)
+        rows = [list(row) for row in data[1:]]
+
+        start = 0
+        if previous is not None and previous.header == header:
+            start = _common_prefix(rows, previous.rows)
+        if start == 0:
+            previous = None
+        elif start == len(rows) == len(previous.rows):
+            return previous  # Tidak ada perubahan
+
+        new = cls._parse_rows(header, rows[start:], index_start=start)
+        if previous is None:
+            frame = new
+        elif new.empty:
+            frame = previous.frame.iloc[:start]
+        else:
+            frame = pd.concat([previous.frame.iloc[:start], new])
+
+        def extend(previous_upto, mask):
+            # View baris lama dipakai ulang, hanya baris baru yang di-scan
+            if previous is None:
+                return _last_true_index(mask)
+            head = previous_upto[:start]
+            return np.concatenate([head, _last_true_index(mask, start, head[-1])])
+
+        complete_mask = (new[COMPONENT_COLUMNS] > 0).all(axis=1).to_numpy()
+        complete_upto = extend(
+            previous.complete_upto if previous else None, complete_mask
+        )
+        price_upto = {
+            col: extend(
+                previous.price_upto[col] if previous else None, (new[col] > 0).to_numpy()
+            )
+            for col in PRICE_COLUMNS
+        }
+        return cls(header, rows, frame, complete_upto, price_upto)
+
+    @staticmethod
+    def _parse_rows(header, rows, index_start=0):
+        index = pd.RangeIndex(index_start, index_start + len(rows))
+        # Baris yang lebih pendek dari header (sheet lama / header dilebarkan
+        # overlay) diisi string kosong
+        width = len(header)
+        rows = [row if len(row) == width else (list(row) + [""] * width)[:width] for row in rows]
+        raw = pd.DataFrame(rows, columns=header, index=index) if rows else pd.DataFrame(
+            columns=header, index=index
+        )
+
+        columns = {
+            "timestamp": raw["timestamp"] if "timestamp" in raw.columns else None
+        }
+        for col in COLUMNS:
+            if col == "timestamp":
+                continue
+            if col not in raw.columns:
+                columns[col] = np.zeros(len(raw), dtype=np.int64)
+                continue
+            values = parse_id_numeric_series(raw[col]).to_numpy()
+            if col not in FLOAT_COLUMNS and np.array_equal(values, np.trunc(values)):
+                values = values.astype(np.int64)
+            columns[col] = values
+        return pd.DataFrame(columns, index=index)
+
+    @property
+    def empty(self):
+        return self.frame.empty
+
+    def current_row(self):
+        """Nilai baris terakhir dengan tipe final (float / int), dihitung sekali."""
+        if self._current_row is None:
+            last_row = self.frame.iloc[-1]
+            values = {}
+            for col in COLUMNS:
+                if col == "timestamp":
+                    continue
+                # Kolom integer (komponen_a, komponen_b, dll.) dikonversi ke int
+                value = last_row[col]
+                values[col] = float(value) if col in FLOAT_COLUMNS else int(value)
+            self._current_row = {"timestamp": last_row["timestamp"], **values}
+        return self._current_row
+
+    def latest_complete_row(self):
+        """Baris lengkap terakhir (semua komponen > 0), atau None."""
+        if self._latest_complete is None:
+            i = int(self.complete_upto[-1]) if len(self.complete_upto) else -1
+            if i < 0:
+                self._latest_complete = {}
+            else:
+                row = self.frame.iloc[i]
+                self._latest_complete = {
+                    "timestamp": row["timestamp"],
+                    **{col: int(row[col]) for col in COMPONENT_COLUMNS},
+                }
+        return self._latest_complete or None
+
+    def last_valid_price(self, col):
+        """Harga terakhir yang > 0 di kolom col, atau None."""
+        upto = self.price_upto[col]
+        i = int(upto[-1]) if len(upto) else -1
+        return None if i < 0 else float(self.frame[col].iat[i])
+
+
+@sheet_action("load_logs", budget=CALL_BUDGETS["load_logs"])
+def _load_logs_snapshot(previous=None):
+    """Membaca & mem-parse data sheet (dijalankan di background), inkremental dari previous."""
+    worksheet = get_logs_worksheet()
     if worksheet is None:
-        return pd.DataFrame(columns=COLUMNS)
+        raise ConnectionError(f"Worksheet '{SHEET_NAME}' tidak tersedia")
 
-    try:
-        data = worksheet.get_all_values()
-        if len(data) <= 1:  # Hanya header atau kosong
-            return pd.DataFrame(columns=COLUMNS)
+    return LogsSnapshot.from_values(worksheet.get_all_values(), previous)
+
+
+@st.cache_resource
+def get_logs_cache():
+    """
+    Snapshot sheet logs bersama per proses (stale-while-revalidate):
+    setelah LOGS_TTL habis, data di-refresh di background sementara
+    pembaca tetap memakai snapshot terakhir.
+    """
+    def load():
+        # Snapshot baru dibangun inkremental dari snapshot terakhir
+        if cache.updated_at is None:
+            # Belum ada salinan untuk disajikan: load pertama menunggu kuota baca
+            with get_rate_limiter().blocking():
+                return _load_logs_snapshot(cache.value)
+        # Kuota baca habis -> QuotaExhausted, snapshot lama tetap dipakai
+        return _load_logs_snapshot(cache.value)
+
+    cache = RefreshableValue(
+        SHEET_NAME, load, ttl=LOGS_TTL, initial=LogsSnapshot.from_values([])
+    )
+    return get_background_refresher().register(SHEET_NAME, cache)
+
+
+def read_all_data():
+    """
+    Membaca semua data dari sheet (sudah di-parse, dari snapshot terakhir).
+    Return salinan frame agar pemanggil bebas mengubahnya.
+    """
+    return get_logs_snapshot().frame.copy()
+
+
+# Snapshot logs per rerun (per thread script Streamlit)
+_rerun_state = threading.local()
+
+
+def begin_rerun():
+    """
+    Dipanggil sekali di awal setiap rerun app. Semua accessor dalam rerun
+    ini memakai satu snapshot logs yang diambil & di-parse saat pertama dibaca.
+    """
+    _rerun_state.active = True
+    _rerun_state.logs = None
+    get_sheet_metrics().begin_rerun()
+
+
+def get_logs_snapshot():
+    """
+    Snapshot logs untuk rerun berjalan. Di luar rerun app (begin_rerun
+    tidak dipanggil), snapshot terbaru di cache yang dipakai.
+    """
+    snapshot = getattr(_rerun_state, "logs", None)
+    if snapshot is None:
+        snapshot = get_logs_cache().get()
+        if WRITE_BEHIND:
+            snapshot = _with_pending_writes(snapshot, get_write_queue().pending())
+        if getattr(_rerun_state, "active", False):
+            _rerun_state.logs = snapshot
+    return snapshot
 
-        df = pd.DataFrame(data[1:], columns=data[0])  # Skip header row
-        return df
-    except Exception as e:
-        st.error(f"Gagal membaca data: {str(e)}")
-        return pd.DataFrame(columns=COLUMNS)
+
+def logs_updated_at():
+    """Waktu (epoch detik) data sheet logs terakhir berhasil dibaca."""
+    return get_logs_cache().updated_at
+
+
+def invalidate_logs():
+    """Dipanggil setelah menulis ke sheet: pembacaan berikutnya menunggu data baru."""
+    get_logs_cache().invalidate()
+    _rerun_state.logs = None
 
 
 def get_current_period_row():
     """
     Mendapatkan baris periode saat ini (baris terakhir dalam sheet).
     """
-    df = read_all_data()
+    snapshot = get_logs_snapshot()
 
-    if df.empty:
+    if snapshot.empty:
         return {
             "timestamp": None,
             "komponen_a":0,
@@ -305,91 +709,15 @@ def get_current_period_row():
             "is_complete": False
         }
 
-    # Ambil baris terakhir
-    last_row = df.iloc[-1]
-
-    # Kolom params yang harus diperlakukan sebagai float
-    float_cols = [
-        "price_a",
-        "eaf_a",
-        "daya_netto",
-        "price_b",
-        "eaf_b",
-        "price_d",
-        "vol_batubara_kg",
-        "vol_biomassa_kg",
-        "hhv_batubara",
-        "hhv_biomassa",
-        "koef_batubara",
-        "koef_biomassa",
-        "eio_val",
-        "vol_bb",
-        "vol_bio",
-        "harga_bb",
-        "harga_bio"  # Antisipasi nama pendek if any
-    ]
-
-    values = {}
-    # Iterate semua kolom di COLUMNS (kecuali timestamp)
-    for col in COLUMNS:
-        if col == "timestamp":
-            continue
-
-        val = last_row.get(col, 0)
-        # Use the global parse_id_numeric which is already robust
-        parsed_val = parse_id_numeric(val)
-
-        # For integer columns (komponen_a, komponen_b, etc.), convert to int
-        if col in float_cols:
-            values[col] = parsed_val
-        else:
-            values[col] = int(parsed_val)
-
-    return {
-        "timestamp": last_row.get("timestamp", None),
-        **values,
-        "is_complete": True,
-    }
+    return {**snapshot.current_row(), "is_complete": True}
 
 
 def get_latest_complete_row():
     """
     Mendapatkan baris terakhir yang SEMUA kolomnya terisi.
     """
-    df = read_all_data()
-
-    if df.empty:
-        return None
-
-    component_cols = [
-        "komponen_a",
-        "komponen_b",
-        "komponen_c_batubara",
-        "komponen_c_biomassa",
-        "komponen_d",
-    ]
-
-    # Konversi ke numeric dengan parser yang robust
-    for col in component_cols:
-        df[col] = df[col].apply(parse_id_numeric)
-
-    # Cari baris yang semua komponen > 0
-    complete_mask = (df[component_cols] > 0).all(axis=1)
-    complete_rows = df[complete_mask]
-
-    if complete_rows.empty:
-        return None
-
-    last_complete = complete_rows.iloc[-1]
-
-    return {
-        "timestamp": last_complete["timestamp"],
-        "komponen_a": int(last_complete["komponen_a"]),
-        "komponen_b": int(last_complete["komponen_b"]),
-        "komponen_c_batubara": int(last_complete["komponen_c_batubara"]),
-        "komponen_c_biomassa": int(last_complete["komponen_c_biomassa"]),
-        "komponen_d": int(last_complete["komponen_d"]),
-    }
+    # View termaterialisasi di snapshot (lookup O(1))
+    return get_logs_snapshot().latest_complete_row()
 
 
 def get_last_valid_prices():
@@ -400,31 +728,24 @@ def get_last_valid_prices():
     - harga_batubara_rp: float
     - harga_biomassa_rp: float
     """
-    df = read_all_data()
+    snapshot = get_logs_snapshot()
 
     default_prices = {
         "harga_batubara_rp": 1000.0,  # Default fallback jika tidak ada data
         "harga_biomassa_rp": 615.0,  # Default fallback
     }
 
-    if df.empty:
+    if snapshot.empty:
         return default_prices
 
-    # Cek apakah kolom harga ada
-    price_cols = ["harga_batubara_rp", "harga_biomassa_rp"]
-    for col in price_cols:
-        if col not in df.columns:
+    # Cek apakah kolom harga ada, lalu ambil harga terakhir yang > 0 (view O(1))
+    for col in PRICE_COLUMNS:
+        if col not in snapshot.sheet_columns:
             continue
 
-        # Parse kolom ke numeric
-        df[col] = df[col].apply(parse_id_numeric)
-
-        # Cari nilai terakhir yang > 0
-        valid_mask = df[col] > 0
-        valid_rows = df.loc[valid_mask, col]
-
-        if not valid_rows.empty:
-            default_prices[col] = float(valid_rows.iloc[-1])
+        price = snapshot.last_valid_price(col)
+        if price is not None:
+            default_prices[col] = price
 
     return default_prices
 
@@ -444,61 +765,341 @@ def get_component_status():
     }
 
 
+# ============ JALUR TULIS ============
+def _locate_last_row(worksheet):
+    """
+    Header dan baris terakhir sheet untuk jalur tulis, tanpa mengunduh
+    seluruh sheet.
+
+    Jumlah baris diambil dari snapshot logs di cache, lalu divalidasi
+    dengan satu batch_get kecil (header + baris n dan n+1): valid jika
+    baris n terisi dan baris n+1 kosong. Jika tidak cocok (sheet diubah
+    dari luar), baru seluruh sheet dibaca.
+
+    Return (header, jumlah baris termasuk header, isi baris terakhir).
+    """
+    # Baca di jalur tulis menunggu kuota (tidak ditolak seperti baca biasa)
+    with get_rate_limiter().blocking():
+        snapshot = get_logs_cache().value
+        n_rows = len(snapshot.rows) + 1
+        width = max(len(COLUMNS), len(snapshot.header))
+
+        header_range, rows_range = worksheet.batch_get(
+            ["1:1", f"A{n_rows}:{rowcol_to_a1(n_rows + 1, width)}"]
+        )
+        header = list(header_range[0]) if header_range else []
+        rows = [list(row) for row in rows_range]
+        last_row = rows[0] if rows else []
+        next_row = rows[1] if len(rows) > 1 else []
+        if header and any(last_row) and not any(next_row):
+            # Samakan dengan get_all_values: sel kosong di akhir baris diisi ""
+            return header, n_rows, last_row + [""] * (len(header) - len(last_row))
+
+        # Cache tidak sesuai isi sheet: baca ulang seluruh sheet
+        invalidate_logs()
+        all_data = worksheet.get_all_values()
+        if not all_data:
+            return [], 0, []
+        return all_data[0], len(all_data), all_data[-1]
+
+
+class SheetWriteBatch:
+    """
+    Kumpulan perubahan sel untuk satu aksi user. Perubahan ke sel yang
+    sama digabung (nilai terakhir menang), sel bersebelahan dalam satu
+    baris digabung menjadi satu range, lalu semuanya dikirim dengan satu
+    request worksheet.batch_update.
+    """
+
+    def __init__(self, worksheet, value_input_option="USER_ENTERED"):
+        self.worksheet = worksheet
+        self.value_input_option = value_input_option
+        self._cells = {}
+
+    def set_cell(self, row, col, value):
+        """row & col 1-based, seperti gspread."""
+        self._cells[(row, col)] = value
+
+    def set_row(self, row, values, col=1):
+        for offset, value in enumerate(values):
+            self.set_cell(row, col + offset, value)
+
+    def ranges(self):
+        """Daftar {"range", "values"} untuk batch_update."""
+        data = []
+        for row, col in sorted(self._cells):
+            last = data[-1] if data else None
+            if last and last["row"] == row and last["end"] == col - 1:
+                last["values"][0].append(self._cells[(row, col)])
+                last["end"] = col
+            else:
+                data.append(
+                    {"row": row, "start": col, "end": col, "values": [[self._cells[(row, col)]]]}
+                )
+        return [
+            {
+                "range": f"{rowcol_to_a1(d['row'], d['start'])}:{rowcol_to_a1(d['row'], d['end'])}",
+                "values": d["values"],
+            }
+            for d in data
+        ]
+
+    def commit(self):
+        """Mengirim semua perubahan (satu API call). Return jumlah range yang ditulis."""
+        data = self.ranges()
+        if data:
+            self.worksheet.batch_update(data, value_input_option=self.value_input_option)
+        return len(data)
+
+
+def _fix_header(batch, header):
+    """
+    Schema check: jika sheet kosong atau jumlah kolomnya lebih sedikit dari
+    skema kode, header (A1) ikut ditulis dalam batch yang sama.
+    """
+    if len(header) < len(COLUMNS):
+        batch.set_row(1, COLUMNS)
+        return True
+    return False
+
+
+def _save_component(worksheet, changes):
+    """
+    Menulis nilai komponen (changes: kolom -> nilai, termasuk timestamp)
+    ke baris periode terakhir dalam satu request. Raise jika gagal.
+    """
+    # Header & jumlah baris dari cache (divalidasi, tanpa unduh seluruh sheet)
+    header, n_rows, _ = _locate_last_row(worksheet)
+
+    # Siapkan container baris (sesuai panjang total kolom)
+    # Default 0 atau string osong
+    if n_rows <= 1:
+        # Sheet kosong (hanya header), buat baris baru (ditulis RAW seperti append_row)
+        batch = SheetWriteBatch(worksheet, value_input_option="RAW")
+        new_row = [0, 0, 0, 0, 0, 0]
+        width = max(COLUMNS.index(col) + 1 for col in changes)
+        new_row += [0] * (width - len(new_row))
+        for col, value in changes.items():
+            new_row[COLUMNS.index(col)] = value
+        batch.set_row(2, new_row)
+    else:
+        # Update baris terakhir: nilai komponen & timestamp
+        batch = SheetWriteBatch(worksheet)
+        for col, value in changes.items():
+            batch.set_cell(n_rows, COLUMNS.index(col) + 1, value)  # 1-based index
+
+    # 1. CEK HEADER (Schema Check) ikut dalam batch yang sama
+    _fix_header(batch, header)
+
+    # Semua perubahan dikirim dalam satu request
+    batch.commit()
+
+
+def _save_detail(worksheet, changes):
+    """
+    Menulis banyak kolom sekaligus ke baris periode terakhir (baris
+    lengkap, RAW). Raise jika gagal.
+    """
+    # Header, jumlah baris & isi baris terakhir (divalidasi, tanpa unduh seluruh sheet)
+    header, n_rows, current_row = _locate_last_row(worksheet)
+
+    # 1. CEK HEADER (Schema Check) ikut dalam batch yang sama dengan baris data
+    batch = SheetWriteBatch(worksheet, value_input_option="RAW")
+    _fix_header(batch, header)
+
+    # Siapkan container baris
+    row_values = [0] * len(COLUMNS)
+
+    # Timestamp update
+    timestamp_idx = COLUMNS.index("timestamp")
+    row_values[timestamp_idx] = get_current_timestamp()
+
+    target_row_idx = 0
+
+    if n_rows > 1:
+        # Update baris terakhir
+        target_row_idx = n_rows
+
+        # Map data lama
+        for i, val in enumerate(current_row):
+            if i < len(row_values):
+                row_values[i] = val
+    else:
+        # Row 2 (Baris data pertama)
+        target_row_idx = 2
+
+    # Apply Updates (termasuk timestamp saat user menyimpan)
+    for key, val in changes.items():
+        if key in COLUMNS:
+            idx = COLUMNS.index(key)
+            row_values[idx] = val
+        # else: pdate baris terakhir ignore key not in columns
+
+    # Write Row (header + baris dalam satu request)
+    batch.set_row(target_row_idx, row_values)
+    batch.commit()
+
+
+def _delete_row(worksheet, expected_rows=None):
+    """
+    Menghapus baris terakhir. expected_rows = jumlah baris (termasuk
+    header) saat user menekan Reset: jika sheet sudah lebih pendek, baris
+    itu sudah terhapus (contoh: retry setelah timeout) dan tidak ada yang
+    dihapus lagi. Return True jika ada baris yang dihapus.
+    """
+    _, n_rows, _ = _locate_last_row(worksheet)
+    target = n_rows if expected_rows is None else expected_rows
+    if 1 < target <= n_rows:
+        worksheet.delete_rows(target)
+        return True
+    return False
+
+
+# ============ WRITE-BEHIND ============
+@sheet_action("write_behind", budget=CALL_BUDGETS["write_behind"])
+def _flush_write(intent):
+    """Menulis satu intent dari antrian ke sheet (dijalankan worker background)."""
+    worksheet = get_logs_worksheet()
+    if worksheet is None:
+        raise ConnectionError(f"Worksheet '{SHEET_NAME}' tidak tersedia")
+
+    if intent.kind == "component":
+        _save_component(worksheet, intent.changes)
+    elif intent.kind == "detail":
+        _save_detail(worksheet, intent.changes)
+    elif intent.kind == "reset":
+        _delete_row(worksheet, intent.target)
+
+
+def _refresh_after_write(intent):
+    """
+    Snapshot logs dibaca ulang sebelum intent dilepas dari antrian, agar
+    optimistic update digantikan data sheet tanpa sempat "berkedip".
+    """
+    cache = get_logs_cache()
+    updated_at = cache.updated_at
+    # Baca ulang ini bagian dari jalur tulis: menunggu kuota, tidak ditolak
+    with get_rate_limiter().blocking():
+        while not cache.refresh(wait=True):
+            pass
+    if cache.updated_at == updated_at:
+        # Baca ulang gagal: pembaca berikutnya menunggu data baru
+        cache.invalidate()
+
+
+@st.cache_resource
+def get_write_queue():
+    """
+    Antrian write-behind bersama per proses (satu worker untuk semua sesi).
+    Intent dari journal (simpan yang belum tertulis sebelum restart)
+    langsung dilanjutkan.
+    """
+    return WriteBehindQueue(
+        _flush_write, after_flush=_refresh_after_write, journal=WRITE_JOURNAL or None
+    )
+
+
+def _submit_write(kind, changes=None, target=None):
+    get_write_queue().submit(kind, changes, target)
+    # Rerun berjalan langsung melihat intent baru (optimistic update)
+    _rerun_state.logs = None
+    return True
+
+
+# Overlay terakhir: (base, versi intent, snapshot) dipakai ulang oleh semua
+# rerun selama base & intent yang antre tidak berubah
+_overlay = (None, None, None)
+_overlay_lock = threading.Lock()
+
+
+def _with_pending_writes(base, intents):
+    """
+    Snapshot base ditambah intent yang belum tertulis (urut). Intent yang
+    sudah tercermin di base (menunggu dilepas worker) aman diterapkan lagi:
+    perubahan kolom idempoten, reset hanya berlaku jika jumlah barisnya cocok.
+    """
+    global _overlay
+    if not intents:
+        return base
+
+    # Intent yang digabung (coalesce) menaikkan merged, jadi ikut versi
+    key = tuple((intent.id, intent.merged) for intent in intents)
+    cached_base, cached_key, cached = _overlay
+    if cached_base is base and cached_key == key:
+        return cached
+
+    # Satu sesi yang membangun overlay, sesi lain memakai hasilnya
+    with _overlay_lock:
+        cached_base, cached_key, cached = _overlay
+        if cached_base is base and cached_key == key:
+            return cached
+        snapshot = _build_overlay(base, intents)
+        _overlay = (base, key, snapshot)
+        return snapshot
+
+
+def _build_overlay(base, intents):
+    header = list(base.header)
+    rows = list(base.rows)
+    for intent in intents:
+        if intent.kind == "reset":
+            if len(rows) + 1 == intent.target:
+                rows.pop()
+            continue
+
+        # Sama dengan _fix_header: header sheet yang lebih pendek dari skema
+        # ditimpa COLUMNS, nilai lama tetap di posisinya (dilebarkan di _parse_rows)
+        if len(header) < len(COLUMNS):
+            header = list(COLUMNS)
+        row = list(rows.pop()) if rows else []
+        row += [""] * (len(header) - len(row))
+        # Nilai ditulis di posisi skema seperti _save_component / _save_detail
+        for col, value in intent.changes.items():
+            if col in COLUMNS:
+                row[COLUMNS.index(col)] = str(value)
+        rows.append(row)
+
+    # Hanya baris terakhir yang di-parse ulang jika header sama dengan base
+    return LogsSnapshot.from_values([header] + rows, previous=base)
+
+
+def write_queue_status():
+    """Ringkasan antrian simpan untuk UI: jumlah menunggu / gagal & daftar intent."""
+    queue = get_write_queue()
+    stats = queue.stats()
+    return {
+        "enabled": WRITE_BEHIND,
+        "waiting": stats["pending"] + stats["flushing"] + stats["retrying"],
+        **stats,
+        "intents": [intent.describe() for intent in queue.pending()],
+    }
+
+
+def retry_failed_writes():
+    """Mengantrekan ulang penyimpanan yang gagal. Return jumlah intent."""
+    return get_write_queue().retry_failed()
+
+
+@sheet_action("update_component", budget=CALL_BUDGETS["update_component"])
 def update_component(component_name: str, value: int):
     """
     Update nilai satu komponen di Google Sheet.
     Menggunakan gspread langsung untuk reliability.
     """
-    worksheet = get_worksheet()
+    changes = {component_name: value, "timestamp": get_current_timestamp()}
+    if WRITE_BEHIND:
+        return _submit_write("component", changes)
+
+    worksheet = get_logs_worksheet()
     if worksheet is None:
         st.error("Tidak dapat terhubung ke Google Sheet")
         return False
 
     try:
-        # Ambil semua data
-        all_data = worksheet.get_all_values()
-
-        # 1. CEK HEADER (Schema Check)
-        # Jika jumlah kolom di sheet lebih sedikit dari skema kode, update header
-        if len(all_data) > 0:
-            header_row = all_data[0]
-            if len(header_row) < len(COLUMNS):
-                # Update Header Row (A1)
-                worksheet.update("A1", [COLUMNS])
-        elif len(all_data) == 0:
-            # Jika kosong sama sekali, tulis header
-            worksheet.update("A1", [COLUMNS])
-            all_data = [COLUMNS]  # Simulate header for next logic
-
-        # Siapkan container baris (sesuai panjang total kolom)
-        # Default 0 atau string osong
-        if len(all_data) <= 1:
-            # Sheet kosong (hanya header), buat baris baru
-            col_index = COLUMNS.index(component_name) + 1  # gspread uses 1-based index
-            new_row = [get_current_timestamp(), 0, 0, 0, 0, 0]
-            new_row[COLUMNS.index(component_name)] = value
-            worksheet.append_row(new_row)
-            # st.success removed
-        else:
-            # Update baris terakhir
-            last_row_index = len(all_data)  # 1-based index
-            col_index = COLUMNS.index(component_name) + 1  # 1-based index
-
-            # Update nilai komponen
-            worksheet.update_cell(last_row_index, col_index, value)
-
-            # Update timestamp
-            timestamp_col = COLUMNS.index("timestamp") + 1
-            worksheet.update_cell(
-                last_row_index,
-                timestamp_col,
-                get_current_timestamp(),
-            )
+        _save_component(worksheet, changes)
 
-            # st.success removed to avoid double alert in modal
-
-        # Clear cache data agar UI langsung update
-        read_all_data.clear()
+        # Tandai cache basi agar UI langsung menampilkan data baru
+        invalidate_logs()
         # st.cache_resource.clear() # Jangan clear resource connection
 
         return True
@@ -506,7 +1107,6 @@ def update_component(component_name: str, value: int):
         st.error(f"Gagal menyimpan data: {str(e)}")
         return False
 
-
 def get_penjualan_value():
     """
     Mendapatkan nilai total Penjualan (kWh) yang akan digunakan model.
@@ -575,21 +1175,26 @@ def get_penjualan_value():
         }
 
 
+@sheet_action("delete_current_period_row", budget=CALL_BUDGETS["delete_current_period_row"])
 def delete_current_period_row():
     """
     Menghapus baris terakhir (periode saat ini) dari sheet.
     Digunakan untuk fitur Reset Data.
     """
-    worksheet = get_worksheet()
+    if WRITE_BEHIND:
+        snapshot = get_logs_snapshot()
+        if snapshot.empty:
+            return False
+        # Jumlah baris dicatat agar retry tidak menghapus baris lain
+        return _submit_write("reset", target=len(snapshot.rows) + 1)
+
+    worksheet = get_logs_worksheet()
     if worksheet is None:
         return False
 
     try:
-        all_data = worksheet.get_all_values()
-        if len(all_data) > 1:
-            # Delete last row
-            worksheet.delete_rows(len(all_data))
-            st.cache_resource.clear()
+        if _delete_row(worksheet):
+            invalidate_logs()
             return True
         return False
     except Exception as e:
@@ -597,67 +1202,27 @@ def delete_current_period_row():
         return False
 
 
+@sheet_action("update_detailed_row", budget=CALL_BUDGETS["update_detailed_row"])
 def update_detailed_row(data_dict: dict):
     """
     Update banyak kolom sekaligus dalam satu baris (Batch Update).
     Digunakan untuk input detail Komponen C (Volume, Harga, dll).
     Memastikan Header Row sinkron dengan COLUMNS.
     """
-    worksheet = get_worksheet()
+    changes = {"timestamp": get_current_timestamp(), **data_dict}
+    if WRITE_BEHIND:
+        return _submit_write("detail", changes)
+
+    worksheet = get_logs_worksheet()
     if worksheet is None:
         st.error("Tidak dapat terhubung ke Google Sheet")
         return False
 
     try:
-        # Ambil semua data
-        all_data = worksheet.get_all_values()
+        _save_detail(worksheet, changes)
 
-        # 1. CEK HEADER (Schema Check)
-        if len(all_data) > 0:
-            header_row = all_data[0]
-            # Jika kolom fisik kurang dari definisi kode, update header
-            if len(header_row) < len(COLUMNS):
-                worksheet.update("A1", [COLUMNS])
-        elif len(all_data) == 0:
-            # Kosong total, tulis header
-            worksheet.update("A1", [COLUMNS])
-            all_data = [COLUMNS]
-
-        # Siapkan container baris
-        row_values = [0] * len(COLUMNS)
-
-        # Timestamp update
-        timestamp_idx = COLUMNS.index("timestamp")
-        row_values[timestamp_idx] = get_current_timestamp()
-
-        target_row_idx = 0
-
-        if len(all_data) > 1:
-            # U
-            target_row_idx = len(all_data)
-            current_row = all_data[-1]
-
-            # Map data lama
-            for i, val in enumerate(current_row):
-                if i < len(row_values):
-                    row_values[i] = val
-        else:
-            # Row 2 (Baris data pertama)
-            target_row_idx = 2
-
-        # Apply Updates
-        for key, val in data_dict.items():
-            if key in COLUMNS:
-                idx = COLUMNS.index(key)
-                row_values[idx] = val
-            # else: pdate baris terakhir ignore key not in columns
-
-        # Write Row
-        range_name = f"A{target_row_idx}"
-        worksheet.update(range_name, [row_values])
-
-        # Clear cache
-        read_all_data.clear()
+        # Tandai cache basi
+        invalidate_logs()
         return True
 
     except Exception as e:
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy Import Library Berat
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Library seperti TensorFlow, SHAP, seaborn, scipy dan matplotlib baru
+di-import saat atribut pertamanya diakses, bukan di bagian atas
+bpp_app.py. Karena st.tabs menjalankan isi semua tab di setiap rerun,
+hanya grafik yang memakai seaborn, matplotlib atau shap (scatter plot &
+heatmap tab1, plot SHAP tab2/tab3) yang berada di balik toggle
+"Tampilkan ..."; sesi yang hanya mengisi input tidak pernah meng-import
+library tersebut. Kurva KDE (scipy) tetap selalu tampil karena
+scipy.stats sudah ikut dimuat oleh scikit-learn saat model dimuat.
+
+Setiap import dicatat waktunya agar regresi cold start bisa dipantau:
+    python lazy_imports.py            # ukur import dingin tiap library
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import importlib
+import json
+import subprocess
+import sys
+import threading
+import time
+import types
+
+# Waktu referensi (saat modul ini pertama kali di-import oleh proses)
+_T0 = time.perf_counter()
+
+# Catatan import yang sudah terjadi: nama modul -> info
+_IMPORT_LOG = {}
+_lock = threading.Lock()
+
+# Library berat yang dipakai dashboard
+HEAVY_MODULES = [
+    "tensorflow",
+    "shap",
+    "seaborn",
+    "scipy.stats",
+    "matplotlib.pyplot",
+    "sklearn",
+]
+
+
+def import_now(name):
+    """
+    Import modul sekarang juga dan catat durasinya di laporan import.
+    Jika modul sudah ada di sys.modules, durasinya hampir nol.
+    """
+    module = sys.modules.get(name)
+    if module is not None and name in _IMPORT_LOG:
+        return module
+
+    with _lock:
+        if name in _IMPORT_LOG:
+            return sys.modules[name]
+
+        was_loaded = name in sys.modules
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        elapsed = time.perf_counter() - start
+
+        _IMPORT_LOG[name] = {
+            "module": name,
+            "import_seconds": elapsed,
+            "since_start_seconds": start - _T0,
+            "already_loaded": was_loaded,
+        }
+        return module
+
+
+class LazyModule(types.ModuleType):
+    """
+    Proxy modul yang menunda import sampai atribut pertama diakses.
+    Contoh: shap = LazyModule("shap"); shap.plots.bar(...)
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = import_now(self.__dict__["_lazy_name"])
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "lazy"
+        return f"<LazyModule {self.__dict__['_lazy_name']!r} ({state})>"
+
+
+def lazy_import(name):
+    """Membuat proxy LazyModule untuk nama modul yang diberikan."""
+    return LazyModule(name)
+
+
+def import_report():
+    """
+    Laporan import library berat yang sudah terjadi di proses ini,
+    diurutkan berdasarkan waktu kejadian.
+    """
+    with _lock:
+        rows = [dict(info) for info in _IMPORT_LOG.values()]
+    return sorted(rows, key=lambda r: r["since_start_seconds"])
+
+
+def measure_cold_imports(modules=None):
+    """
+    Mengukur waktu import DINGIN setiap library di subprocess terpisah,
+    sehingga hasilnya tidak terpengaruh modul yang sudah dimuat.
+    """
+    results = []
+    for name in modules or HEAVY_MODULES:
+        code = (
+            "import time; t = time.perf_counter(); "
+            f"import {name}; print(time.perf_counter() - t)"
+        )
+        proc = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True
+        )
+        seconds = None
+        if proc.returncode == 0:
+            try:
+                seconds = float(proc.stdout.strip().splitlines()[-1])
+            except (ValueError, IndexError):
+                pass
+        results.append({"module": name, "cold_import_seconds": seconds})
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(measure_cold_imports(sys.argv[1:] or None), indent=2))
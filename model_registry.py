@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Registry Model BPP (Process-Wide)
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Modul ini memuat artefak model (pickle & keras) SEKALI per proses.
+Streamlit menjalankan ulang bpp_app.py setiap ada interaksi widget,
+sedangkan modul yang di-import tetap hidup di sys.modules, sehingga
+registry di sini tidak ikut dideserialisasi ulang pada setiap rerun.
+
+Model dimuat secara lazy: hanya artefak yang benar-benar diminta
+(misalnya sesuai pilihan_model di tab2) yang dideserialisasi.
+Jika model_bpp_bundle.zip tersedia, semua artefak dibaca & diverifikasi
+checksum-nya dari bundle tersebut dalam satu pass (lihat artifact_bundle.py).
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import hashlib
+import os
+import pickle
+import threading
+import time
+
+import streamlit as st
+
+from artifact_bundle import BUNDLE_FILE, load_bundle
+from nn_engine import load_compiled_keras, load_numpy_network
+
+# Folder tempat artefak disimpan (root repo)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Backend model Neural Network: "numpy" (default, tanpa TensorFlow)
+# atau "tensorflow" (model keras asli)
+NN_BACKEND = os.environ.get("BPP_NN_BACKEND", "numpy").lower()
+
+# Bundle artefak terverifikasi (kosongkan untuk memakai file artefak lepas)
+BUNDLE_PATH = os.environ.get("BPP_BUNDLE_FILE", BUNDLE_FILE)
+
+# Mapping pilihan model di UI -> key artefak
+MODEL_KEYS = {
+    "Neural Network": "keras",
+    "Elastic": "elastic",
+    "Ridge": "ridge",
+    "KNN": "knn",
+}
+
+# Mapping key artefak -> nama file
+ARTIFACT_FILES = {
+    # Model prediksi
+    "keras": "model_bpp.keras" if NN_BACKEND == "tensorflow" else "model_bpp_nn.npz",
+    "elastic": "model_bpp_elastic.pkl",
+    "ridge": "model_bpp_ridge.pkl",
+    "knn": "model_bpp_knn.pkl",
+    # Scaler khusus untuk model keras
+    "scaler": "preprocess_bpp_columntransformer.pkl",
+    # Nilai SHAP hasil training
+    "shap_keras": "shap_values_keras.pkl",
+    "shap_elastic": "shap_values_elastic.pkl",
+    "shap_ridge": "shap_values_ridge.pkl",
+    "shap_knn": "shap_values_knn.pkl",
+    # Model keras asli (selalu TensorFlow), untuk verifikasi & benchmark
+    "keras_tf": "model_bpp.keras",
+}
+
+
+# ============ LOADER PER JENIS ARTEFAK ============
+def _load_pickle(path):
+    """Membuka artefak pickle (model sklearn, scaler, nilai SHAP)."""
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# Loader berdasarkan ekstensi file (default: pickle)
+LOADERS = {
+    ".keras": load_compiled_keras,
+    ".npz": load_numpy_network,
+}
+
+
+def _current_rss():
+    """
+    Mengembalikan Resident Set Size proses (byte) dari /proc.
+    Return None jika platform tidak mendukung (non-Linux).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# ============ REGISTRY ============
+class ModelRegistry:
+    """
+    Penyimpan artefak model yang dimuat sekali per proses.
+    Aman dipakai bersama oleh banyak session Streamlit (thread-safe).
+    """
+
+    def __init__(self, base_dir=BASE_DIR, bundle_path=BUNDLE_PATH):
+        self.base_dir = base_dir
+        self._lock = threading.RLock()
+        self._artifacts = {}
+        self._stats = {}
+        self._versions = {}
+
+        # Bundle baru dibaca saat artefak pertama diminta
+        self._bundle = None
+        self._bundle_path = None
+        if bundle_path:
+            path = os.path.join(base_dir, bundle_path)
+            if os.path.exists(path):
+                self._bundle_path = path
+
+    @property
+    def bundle(self):
+        """Bundle artefak terverifikasi, atau None jika memakai file lepas."""
+        if self._bundle is None and self._bundle_path is not None:
+            with self._lock:
+                if self._bundle is None:
+                    self._bundle = load_bundle(self._bundle_path)
+        return self._bundle
+
+    @property
+    def manifest(self):
+        bundle = self.bundle
+        return bundle.manifest if bundle is not None else None
+
+    def get(self, key):
+        """
+        Mengambil artefak berdasarkan key. Artefak dimuat dari disk
+        hanya pada pemanggilan pertama, selanjutnya diambil dari memori.
+        """
+        if key in self._artifacts:
+            return self._artifacts[key]
+
+        if key not in ARTIFACT_FILES:
+            raise KeyError(f"Artefak tidak dikenal: {key}")
+
+        with self._lock:
+            # Cek ulang: bisa jadi sudah dimuat thread lain selama menunggu lock
+            if key in self._artifacts:
+                return self._artifacts[key]
+
+            file_name = ARTIFACT_FILES[key]
+            bundle = self.bundle
+
+            rss_before = _current_rss()
+            start = time.perf_counter()
+            if bundle is not None:
+                artifact = bundle.load(file_name)
+                file_bytes = len(bundle.read(file_name))
+            else:
+                path = os.path.join(self.base_dir, file_name)
+                loader = LOADERS.get(os.path.splitext(path)[1], _load_pickle)
+                artifact = loader(path)
+                file_bytes = os.path.getsize(path)
+            load_seconds = time.perf_counter() - start
+            rss_after = _current_rss()
+
+            memory_bytes = None
+            if rss_before is not None and rss_after is not None:
+                memory_bytes = max(rss_after - rss_before, 0)
+
+            self._stats[key] = {
+                "artifact": key,
+                "file": file_name,
+                "source": "bundle" if bundle is not None else "file",
+                "load_seconds": load_seconds,
+                "memory_bytes": memory_bytes,
+                "file_bytes": file_bytes,
+                "version": self.version(key),
+            }
+            self._artifacts[key] = artifact
+            return artifact
+
+    def version(self, key):
+        """
+        Versi artefak = SHA-256 (12 karakter awal) dari isi file.
+        Diambil dari manifest bundle, atau dihitung sekali dari file lepas,
+        tanpa perlu mendeserialisasi artefaknya.
+        """
+        if key not in self._versions and self.bundle is not None:
+            self._versions[key] = self.bundle.version(ARTIFACT_FILES[key])
+        if key not in self._versions:
+            digest = hashlib.sha256()
+            path = os.path.join(self.base_dir, ARTIFACT_FILES[key])
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._versions[key] = digest.hexdigest()[:12]
+        return self._versions[key]
+
+    def get_model(self, pilihan_model):
+        """Mengambil model sesuai label pilihan_model di UI."""
+        return self.get(MODEL_KEYS[pilihan_model])
+
+    def get_scaler(self):
+        """Mengambil ColumnTransformer untuk input model keras."""
+        return self.get("scaler")
+
+    def get_shap_values(self, model_key):
+        """Mengambil nilai SHAP untuk key model (keras/elastic/ridge/knn)."""
+        return self.get(f"shap_{model_key}")
+
+    def is_loaded(self, key):
+        return key in self._artifacts
+
+    def stats(self):
+        """
+        Statistik pemuatan setiap artefak yang sudah dimuat:
+        waktu load (detik), tambahan memori RSS (byte) dan ukuran file.
+        """
+        return [dict(s) for s in self._stats.values()]
+
+    def bundle_stats(self):
+        """Statistik pembacaan bundle (jumlah member, byte, durasi baca)."""
+        bundle = self.bundle
+        return bundle.stats() if bundle is not None else None
+
+
+@st.cache_resource
+def get_model_registry():
+    """
+    Mendapatkan registry model bersama untuk seluruh proses.
+    Menggunakan cache_resource agar tidak dibuat ulang setiap rerun.
+    """
+    return ModelRegistry()
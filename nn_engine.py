@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+Engine Inferensi Neural Network Berbasis NumPy
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Model NN BPP hanya terdiri dari beberapa layer Dense kecil
+(16 -> 32 -> 16 -> 8 -> 1). Menjalankannya lewat runtime TensorFlow
+membuat overhead graph dispatch jauh lebih besar dari perhitungannya.
+
+Modul ini berisi:
+- Exporter: mengekstrak bobot & aktivasi dari model_bpp.keras ke file .npz
+- NumpyDenseNetwork: forward pass murni NumPy dengan output setara Keras
+- CompiledKerasModel: model keras asli yang dibungkus tf.function dengan
+  signature tetap (None, n_fitur) float32 dan di-warm-up saat load,
+  dipakai jika BPP_NN_BACKEND=tensorflow
+
+Cara export ulang & ukur latency (butuh TensorFlow, cukup di mesin developer):
+    python nn_engine.py export model_bpp.keras model_bpp_nn.npz
+    python nn_engine.py bench
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import hashlib
+import json
+import sys
+import time
+
+import numpy as np
+
+# Toleransi selisih output NumPy vs Keras (nilai BPP dalam Rp/kWh)
+DEFAULT_RTOL = 1e-5
+DEFAULT_ATOL = 1e-3
+
+# Fungsi aktivasi yang didukung engine
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "tanh": np.tanh,
+}
+
+
+# ============ ENGINE FORWARD PASS ============
+class NumpyDenseNetwork:
+    """
+    Jaringan Dense sekuensial yang dijalankan dengan NumPy.
+    predict() mengembalikan array (n, 1) seperti model.predict() Keras.
+    """
+
+    def __init__(self, weights, biases, activations, metadata=None):
+        if not (len(weights) == len(biases) == len(activations)):
+            raise ValueError("Jumlah weights, biases dan activations harus sama")
+
+        for act in activations:
+            if act not in ACTIVATIONS:
+                raise ValueError(f"Aktivasi tidak didukung: {act}")
+
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self._act_funcs = [ACTIVATIONS[a] for a in self.activations]
+        self.metadata = metadata or {}
+
+    @property
+    def n_features(self):
+        return self.weights[0].shape[0]
+
+    def predict(self, X, verbose=0):
+        """
+        Forward pass untuk input 2-D (n_sampel, n_fitur).
+        Parameter verbose diterima agar kompatibel dengan pemanggilan Keras.
+        """
+        x = np.asarray(X, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        if x.shape[1] != self.n_features:
+            raise ValueError(
+                f"Jumlah fitur input {x.shape[1]} tidak sesuai model ({self.n_features})"
+            )
+
+        for w, b, act in zip(self.weights, self.biases, self._act_funcs):
+            x = act(x @ w + b)
+        return x
+
+    def __call__(self, X):
+        return self.predict(X)
+
+
+def load_numpy_network(path):
+    """Membuka file .npz hasil export menjadi NumpyDenseNetwork."""
+    with np.load(path, allow_pickle=False) as data:
+        n_layers = int(data["n_layers"])
+        weights = [data[f"W{i}"] for i in range(n_layers)]
+        biases = [data[f"b{i}"] for i in range(n_layers)]
+        activations = [str(a) for a in data["activations"]]
+        metadata = json.loads(str(data["metadata"]))
+    return NumpyDenseNetwork(weights, biases, activations, metadata)
+
+
+# ============ KERAS TER-KOMPILASI ============
+class CompiledKerasModel:
+    """
+    Membungkus model keras dalam tf.function dengan input_signature tetap
+    (None, n_fitur) float32. Tracing hanya terjadi sekali (saat warm-up),
+    sehingga tidak ada retracing maupun pembuatan data adapter predict()
+    untuk setiap panggilan satu baris.
+    """
+
+    def __init__(self, keras_model, warm_up=True):
+        import tensorflow as tf
+
+        self._tf = tf
+        self.model = keras_model
+        self.n_features = int(keras_model.inputs[0].shape[-1])
+        self._forward = tf.function(
+            lambda x: keras_model(x, training=False),
+            input_signature=[
+                tf.TensorSpec(shape=(None, self.n_features), dtype=tf.float32)
+            ],
+        )
+        self.warmup_seconds = self.warm_up() if warm_up else None
+
+    def warm_up(self):
+        """Menjalankan satu prediksi dummy agar trace terjadi saat load."""
+        start = time.perf_counter()
+        self.predict(np.zeros((1, self.n_features), dtype=np.float32))
+        return time.perf_counter() - start
+
+    def predict(self, X, verbose=0):
+        """Prediksi (n, 1) seperti model.predict() Keras."""
+        x = np.asarray(X, dtype=np.float32)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        return self._forward(self._tf.constant(x)).numpy()
+
+    def __call__(self, X):
+        return self.predict(X)
+
+
+def load_compiled_keras(path):
+    """Membuka model keras, membungkusnya dengan tf.function lalu warm-up."""
+    from lazy_imports import import_now
+
+    tf = import_now("tensorflow")
+    tf.keras.utils.set_random_seed(0)
+    return CompiledKerasModel(tf.keras.models.load_model(path))
+
+
+# ============ EXPORTER ============
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def network_from_keras(keras_model):
+    """Mengekstrak bobot, bias dan aktivasi dari model keras sekuensial Dense."""
+    weights, biases, activations = [], [], []
+    for layer in keras_model.layers:
+        if layer.__class__.__name__ != "Dense":
+            raise ValueError(f"Layer {layer.name} ({layer.__class__.__name__}) tidak didukung")
+        kernel, bias = layer.get_weights()
+        weights.append(kernel)
+        biases.append(bias)
+        activations.append(layer.activation.__name__)
+    return NumpyDenseNetwork(weights, biases, activations)
+
+
+def verify_against_keras(network, keras_model, X, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL):
+    """
+    Membandingkan output NumPy vs Keras untuk input X.
+    Mengembalikan selisih absolut maksimum, raise AssertionError jika
+    selisih melebihi toleransi.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    expected = keras_model.predict(X, verbose=0)
+    actual = network.predict(X)
+    np.testing.assert_allclose(actual, expected, rtol=rtol, atol=atol)
+    return float(np.max(np.abs(actual - expected)))
+
+
+def export_keras_model(
+    src="model_bpp.keras",
+    dst="model_bpp_nn.npz",
+    n_check=1000,
+    rtol=DEFAULT_RTOL,
+    atol=DEFAULT_ATOL,
+):
+    """
+    Export model keras ke file .npz dan verifikasi hasilnya.
+    Verifikasi memakai input acak di rentang skala MinMax [0, 1]
+    (ditambah sedikit di luar rentang) terhadap output Keras asli.
+    """
+    import tensorflow as tf
+
+    keras_model = tf.keras.models.load_model(src)
+    network = network_from_keras(keras_model)
+
+    rng = np.random.default_rng(0)
+    X_check = rng.uniform(-0.25, 1.25, size=(n_check, network.n_features))
+    max_abs_error = verify_against_keras(network, keras_model, X_check, rtol, atol)
+
+    metadata = {
+        "source_file": src,
+        "source_sha256": _file_sha256(src),
+        "keras_version": tf.keras.__version__,
+        "n_features": network.n_features,
+        "rtol": rtol,
+        "atol": atol,
+        "max_abs_error": max_abs_error,
+        "n_check": n_check,
+    }
+
+    arrays = {"n_layers": np.array(len(network.weights))}
+    for i, (w, b) in enumerate(zip(network.weights, network.biases)):
+        arrays[f"W{i}"] = w
+        arrays[f"b{i}"] = b
+    arrays["activations"] = np.array(network.activations)
+    arrays["metadata"] = np.array(json.dumps(metadata))
+
+    np.savez(dst, **arrays)
+    network.metadata = metadata
+    return network
+
+
+# ============ PENGUKURAN LATENCY ============
+def _time_calls(func, X, repeat):
+    """Mengembalikan (durasi panggilan pertama, median panggilan berikutnya) dalam ms."""
+    start = time.perf_counter()
+    func(X)
+    first = (time.perf_counter() - start) * 1e3
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(X)
+        durations.append((time.perf_counter() - start) * 1e3)
+    return first, float(np.median(durations))
+
+
+def benchmark_backends(
+    keras_path="model_bpp.keras",
+    npz_path="model_bpp_nn.npz",
+    batch_size=1024,
+    repeat=50,
+):
+    """
+    Membandingkan latency model.predict() Keras biasa, CompiledKerasModel
+    (tf.function + warm-up) dan NumpyDenseNetwork pada jalur satu baris
+    dan jalur batch. Waktu load (termasuk warm-up) ikut dicatat.
+    """
+    import tensorflow as tf
+
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    keras_model = tf.keras.models.load_model(keras_path)
+    load_keras = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = CompiledKerasModel(keras_model)
+    load_compiled = load_keras + time.perf_counter() - start
+
+    start = time.perf_counter()
+    network = load_numpy_network(npz_path)
+    load_numpy = time.perf_counter() - start
+
+    backends = [
+        ("keras.predict", lambda X: keras_model.predict(X, verbose=0), load_keras),
+        ("tf.function", compiled.predict, load_compiled),
+        ("numpy", network.predict, load_numpy),
+    ]
+
+    results = []
+    for path, n_rows in [("single", 1), ("batch", batch_size)]:
+        X = rng.uniform(0, 1, size=(n_rows, network.n_features)).astype(np.float32)
+        for name, func, load_seconds in backends:
+            first_ms, median_ms = _time_calls(func, X, repeat)
+            results.append(
+                {
+                    "backend": name,
+                    "path": path,
+                    "rows": n_rows,
+                    "load_ms": load_seconds * 1e3,
+                    "first_call_ms": first_ms,
+                    "median_ms": median_ms,
+                }
+            )
+    return results
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "export"
+    args = sys.argv[2:]
+    if command == "export":
+        network = export_keras_model(*args[:2])
+        print(json.dumps(network.metadata, indent=2))
+    elif command == "bench":
+        print(json.dumps(benchmark_backends(*args[:2]), indent=2))
+    else:
+        sys.exit(f"Perintah tidak dikenal: {command} (gunakan export/bench)")
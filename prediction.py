@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+API Prediksi BPP Batch (Vectorized)
+PT. PLN Indonesia Power Suralaya Unit 8
+
+predict_bpp(frame) menerima DataFrame / array 2-D berisi N skenario input
+dan mengembalikan prediksi keempat model (Neural Network, Elastic Net,
+Ridge, KNN) dalam satu kali jalan. Transformasi scaler hanya dijalankan
+sekali per batch, dan preprocessing pipeline sklearn yang identik
+(elastic/ridge/knn) juga hanya dijalankan sekali.
+
+Dipakai bersama oleh simulasi satu baris di tab2 dan batch job offline
+(batch_score.py).
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from model_registry import get_model_registry
+
+# Urutan fitur kanonik (sama dengan feature_names_in_ milik scaler)
+FEATURE_COLUMNS = [
+    "Penjualan (kWh)",
+    "Beban Pembelian Tenaga Listrik",
+    "Beban Sewa",
+    "Beban Bio Solar",
+    "Beban Batubara",
+    "Beban Biomassa",
+    "Beban Kimia",
+    "Beban Minyak Pelumas",
+    "Beban Pemeliharaan",
+    "Beban Kepegawaian",
+    "Beban Penyusutan Aset Tetap",
+    "Beban Penyusutan Aset Tetap (Sewa)",
+    "Beban Administrasi",
+    "Beban Emisi Carbon",
+    "Beban Fee EPI",
+    "Beban Lain-lain",
+]
+
+# Kolom target
+TARGET_COLUMN = "BPP"
+
+# Urutan kolom output (key model di registry)
+MODEL_ORDER = ["keras", "elastic", "ridge", "knn"]
+
+# Kapasitas cache prediksi (jumlah entri baris x model)
+PREDICTION_CACHE_SIZE = int(os.environ.get("BPP_PREDICTION_CACHE_SIZE", "1024"))
+
+
+def to_feature_frame(frame):
+    """
+    Menyusun input menjadi DataFrame float64 dengan urutan FEATURE_COLUMNS.
+    - DataFrame: kolom dipilih berdasarkan nama (kolom lain diabaikan)
+    - Array 2-D: kolom diasumsikan sudah dalam urutan FEATURE_COLUMNS
+    """
+    if isinstance(frame, pd.DataFrame):
+        missing = [c for c in FEATURE_COLUMNS if c not in frame.columns]
+        if missing:
+            raise KeyError(f"Kolom input tidak ditemukan: {missing}")
+        return frame[FEATURE_COLUMNS].astype(np.float64)
+
+    values = np.asarray(frame, dtype=np.float64)
+    if values.ndim == 1:
+        values = values.reshape(1, -1)
+    if values.ndim != 2 or values.shape[1] != len(FEATURE_COLUMNS):
+        raise ValueError(
+            f"Input harus 2-D dengan {len(FEATURE_COLUMNS)} kolom, didapat {values.shape}"
+        )
+    return pd.DataFrame(values, columns=FEATURE_COLUMNS)
+
+
+def row_digests(X):
+    """
+    Hash setiap baris vektor fitur (urutan kanonik, float64).
+    -0.0 dinormalisasi menjadi 0.0 agar skenario yang sama selalu
+    menghasilkan hash yang sama.
+    """
+    values = np.ascontiguousarray(X.to_numpy(dtype=np.float64) + 0.0)
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in values]
+
+
+# ============ CACHE PREDIKSI ============
+class PredictionCache:
+    """
+    Cache LRU hasil prediksi per (hash vektor fitur, model, versi model).
+    Ukurannya dibatasi dan dilengkapi counter hit/miss.
+    """
+
+    def __init__(self, maxsize=PREDICTION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+class BatchPredictor:
+    """
+    Menjalankan prediksi semua model untuk N skenario sekaligus.
+    Model diambil dari registry secara lazy sesuai model yang diminta.
+    """
+
+    def __init__(self, registry, cache=None):
+        # Urutan fitur di manifest bundle harus sama dengan urutan kanonik
+        manifest = registry.manifest
+        if manifest is not None and manifest.get("feature_columns") != FEATURE_COLUMNS:
+            raise ValueError(
+                "Urutan fitur di bundle artefak tidak sesuai FEATURE_COLUMNS"
+            )
+
+        self._registry = registry
+        self._lock = threading.Lock()
+        self._pipelines = {}
+        self.cache = cache if cache is not None else PredictionCache()
+
+    def _split_pipeline(self, key):
+        """
+        Memecah pipeline sklearn menjadi (preprocessing, estimator, fingerprint).
+        Fingerprint dipakai untuk mendeteksi preprocessing yang identik
+        sehingga cukup ditransformasi sekali untuk beberapa model.
+        """
+        if key in self._pipelines:
+            return self._pipelines[key]
+
+        with self._lock:
+            if key not in self._pipelines:
+                model = self._registry.get(key)
+                if hasattr(model, "steps") and len(model.steps) > 1:
+                    pre = model[:-1]
+                    estimator = model.steps[-1][1]
+                    fingerprint = hashlib.sha256(pickle.dumps(pre)).hexdigest()
+                else:
+                    pre, estimator, fingerprint = None, model, None
+                self._pipelines[key] = (pre, estimator, fingerprint)
+        return self._pipelines[key]
+
+    def _run_models(self, X, keys):
+        """Menjalankan model untuk seluruh baris X (tanpa cache)."""
+        results = {}
+        transformed = {}
+        for key in keys:
+            if key == "keras":
+                # Scaler khusus NN dijalankan sekali untuk seluruh batch
+                X_scaled = self._registry.get_scaler().transform(X)
+                y = self._registry.get("keras").predict(X_scaled, verbose=0)
+            else:
+                pre, estimator, fingerprint = self._split_pipeline(key)
+                if pre is None:
+                    y = estimator.predict(X)
+                else:
+                    if fingerprint not in transformed:
+                        transformed[fingerprint] = pre.transform(X)
+                    y = estimator.predict(transformed[fingerprint])
+
+            results[key] = np.asarray(y, dtype=np.float64).reshape(-1)
+        return results
+
+    def predict(self, frame, models=None, use_cache=True):
+        """
+        Prediksi BPP untuk setiap baris input.
+        Return DataFrame dengan satu kolom per model (index mengikuti input).
+
+        Dengan use_cache=True, baris yang sudah pernah diprediksi (vektor
+        fitur, model & versi model sama) diambil dari cache tanpa
+        menyentuh model. Sisanya tetap diprediksi sekaligus (vectorized).
+        """
+        X = to_feature_frame(frame)
+        keys = list(models) if models is not None else MODEL_ORDER
+        for key in keys:
+            if key not in MODEL_ORDER:
+                raise KeyError(f"Model tidak dikenal: {key}")
+
+        if not use_cache:
+            results = self._run_models(X, keys)
+            return pd.DataFrame(results, index=X.index, columns=keys)
+
+        digests = row_digests(X)
+        results, cache_keys, missing = {}, {}, {}
+        for key in keys:
+            version = self._registry.version(key)
+            cache_keys[key] = [(digest, key, version) for digest in digests]
+            results[key] = np.empty(len(X), dtype=np.float64)
+            missing[key] = []
+            for i, cache_key in enumerate(cache_keys[key]):
+                cached = self.cache.get(cache_key)
+                if cached is None:
+                    missing[key].append(i)
+                else:
+                    results[key][i] = cached
+
+        # Baris yang miss di model mana pun diprediksi dalam satu pass untuk
+        # semua model tersebut (preprocessing yang sama tetap sekali per batch)
+        missed_keys = [key for key in keys if missing[key]]
+        if missed_keys:
+            rows = sorted(set().union(*(missing[key] for key in missed_keys)))
+            position = {i: j for j, i in enumerate(rows)}
+            computed = self._run_models(X.iloc[rows], missed_keys)
+            for key in missed_keys:
+                values = computed[key][[position[i] for i in missing[key]]]
+                results[key][missing[key]] = values
+                for i, value in zip(missing[key], values):
+                    self.cache.put(cache_keys[key][i], float(value))
+
+        return pd.DataFrame(results, index=X.index, columns=keys)
+
+
+@st.cache_resource
+def get_batch_predictor():
+    """Predictor bersama untuk seluruh proses (memakai registry model bersama)."""
+    return BatchPredictor(get_model_registry())
+
+
+def predict_bpp(frame, models=None, use_cache=True):
+    """
+    Prediksi BPP untuk N skenario sekaligus dengan semua model
+    (atau hanya model di parameter models, misalnya ["elastic"]).
+    Batch job besar sebaiknya memakai use_cache=False.
+    """
+    return get_batch_predictor().predict(frame, models=models, use_cache=use_cache)
+
+
+def prediction_cache_stats():
+    """Statistik cache prediksi (ukuran, hit, miss, eviction, hit rate)."""
+    return get_batch_predictor().cache.stats()
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Rate Limiter Kuota Google Sheets (Token Bucket)
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Google Sheets membatasi request baca dan tulis per menit (per user /
+service account). Semua request worksheet melewati satu limiter per
+proses dengan dua token bucket terpisah (baca & tulis):
+
+- tulis selalu menunggu token (maks BPP_SHEETS_QUOTA_TIMEOUT detik) dan
+  diprioritaskan: selama ada tulis yang menunggu, baca biasa tidak
+  mengambil token
+- baca biasa (refresh cache di background, rerun) tidak pernah menunggu:
+  jika token habis, request ditolak dengan QuotaExhausted dan pemanggil
+  tetap memakai salinan data di cache
+- baca yang memang harus terjadi (load pertama, baca di jalur tulis,
+  refresh setelah menulis) dijalankan di dalam limiter.blocking() dan
+  menunggu token seperti tulis
+
+Dengan begitu, saat banyak sesi aktif throughput turun perlahan (data
+sedikit lebih basi, simpan sedikit tertunda) alih-alih gagal karena 429.
+
+Konfigurasi lewat environment (0 = tanpa batas):
+- BPP_SHEETS_READ_QUOTA  : request baca per menit (default 60)
+- BPP_SHEETS_WRITE_QUOTA : request tulis per menit (default 60)
+- BPP_SHEETS_QUOTA_BURST : kapasitas bucket / burst (default 10)
+- BPP_SHEETS_QUOTA_TIMEOUT: batas tunggu token dalam detik (default 60)
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import contextlib
+import os
+import threading
+import time
+
+import streamlit as st
+
+READ_QUOTA = float(os.environ.get("BPP_SHEETS_READ_QUOTA", "60"))
+WRITE_QUOTA = float(os.environ.get("BPP_SHEETS_WRITE_QUOTA", "60"))
+QUOTA_BURST = float(os.environ.get("BPP_SHEETS_QUOTA_BURST", "10"))
+QUOTA_TIMEOUT = float(os.environ.get("BPP_SHEETS_QUOTA_TIMEOUT", "60"))
+
+# Method worksheet gspread per jenis kuota
+READ_METHODS = ("get_all_values", "batch_get")
+WRITE_METHODS = ("batch_update", "update", "update_cell", "append_row", "delete_rows")
+
+
+class QuotaExhausted(ConnectionError):
+    """Token kuota Google Sheets habis; request tidak dikirim."""
+
+
+class TokenBucket:
+    """Bucket berisi maksimal capacity token, terisi per_minute token per menit."""
+
+    def __init__(self, per_minute, capacity):
+        self.per_minute = per_minute
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self):
+        return self.per_minute <= 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.per_minute / 60.0
+        )
+        self._updated = now
+
+    def try_take(self):
+        if self.unlimited:
+            return True
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_seconds(self):
+        """Perkiraan waktu sampai satu token tersedia."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        return max(0.0, (1 - self.tokens) * 60.0 / self.per_minute)
+
+
+class SheetsRateLimiter:
+    """Limiter baca & tulis bersama per proses, tulis diprioritaskan."""
+
+    def __init__(
+        self,
+        read_per_minute=READ_QUOTA,
+        write_per_minute=WRITE_QUOTA,
+        burst=QUOTA_BURST,
+        timeout=QUOTA_TIMEOUT,
+    ):
+        self.read = TokenBucket(read_per_minute, burst)
+        self.write = TokenBucket(write_per_minute, burst)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes_waiting = 0
+        self._stats = {
+            "reads": 0,
+            "reads_denied": 0,
+            "writes": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+        }
+
+    # ============ MODE BLOCKING ============
+    @contextlib.contextmanager
+    def blocking(self):
+        """Baca di dalam blok ini menunggu token (tidak ditolak)."""
+        depth = getattr(self._local, "blocking", 0)
+        self._local.blocking = depth + 1
+        try:
+            yield
+        finally:
+            self._local.blocking = depth
+
+    def is_blocking(self):
+        return getattr(self._local, "blocking", 0) > 0
+
+    # ============ AKUISISI TOKEN ============
+    def acquire(self, kind):
+        """
+        Mengambil satu token untuk request kind ("read" / "write").
+        Raise QuotaExhausted jika baca biasa kehabisan token atau waktu
+        tunggu melewati timeout.
+        """
+        if kind == "read" and not self.is_blocking():
+            with self._lock:
+                # Tulis yang sedang menunggu didahulukan
+                if self._writes_waiting == 0 and self.read.try_take():
+                    self._stats["reads"] += 1
+                    return
+                self._stats["reads_denied"] += 1
+            raise QuotaExhausted("Kuota baca Google Sheets habis, memakai data cache")
+        self._wait_for(self.read if kind == "read" else self.write, kind)
+
+    def _wait_for(self, bucket, kind):
+        deadline = time.monotonic() + self.timeout
+        start = time.monotonic()
+        with self._lock:
+            if kind == "write":
+                self._writes_waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    if bucket.try_take():
+                        self._stats["reads" if kind == "read" else "writes"] += 1
+                        self._stats["wait_seconds"] += time.monotonic() - start
+                        return
+                    delay = bucket.wait_seconds()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    with self._lock:
+                        self._stats["timeouts"] += 1
+                    raise QuotaExhausted(
+                        f"Kuota {'tulis' if kind == 'write' else 'baca'} Google Sheets "
+                        f"habis selama {self.timeout:.0f} detik"
+                    )
+                time.sleep(min(max(delay, 0.005), remaining))
+        finally:
+            if kind == "write":
+                with self._lock:
+                    self._writes_waiting -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "read_quota_per_minute": self.read.per_minute,
+                "write_quota_per_minute": self.write.per_minute,
+                "read_tokens": None if self.read.unlimited else round(self.read.tokens, 2),
+                "write_tokens": None if self.write.unlimited else round(self.write.tokens, 2),
+                "writes_waiting": self._writes_waiting,
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in self._stats.items()},
+            }
+
+
+@st.cache_resource
+def get_rate_limiter():
+    """Limiter kuota Google Sheets bersama untuk seluruh proses."""
+    return SheetsRateLimiter()
+
+
+class RateLimitedWorksheet:
+    """
+    Proxy worksheet: setiap method baca/tulis mengambil token dari
+    limiter dulu; atribut lain diteruskan apa adanya.
+    """
+
+    def __init__(self, worksheet, limiter=None):
+        self._worksheet = worksheet
+        self._limiter = limiter
+
+    @property
+    def wrapped(self):
+        return self._worksheet
+
+    def __getattr__(self, name):
+        attr = getattr(self._worksheet, name)
+        if name in READ_METHODS:
+            kind = "read"
+        elif name in WRITE_METHODS:
+            kind = "write"
+        else:
+            return attr
+
+        def call(*args, **kwargs):
+            (self._limiter or get_rate_limiter()).acquire(kind)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+def rate_limit_worksheet(worksheet):
+    if worksheet is None or isinstance(worksheet, RateLimitedWorksheet):
+        return worksheet
+    return RateLimitedWorksheet(worksheet)
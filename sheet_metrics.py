@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentasi Panggilan Google Sheets
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Setiap request gspread (client, spreadsheet & worksheet) dicatat:
+durasi, label call-site (aksi handler yang memanggil), ukuran payload
+kirim/terima dan error.
+
+- SheetMetrics      : agregat per proses (jumlah call, error, byte dan
+  histogram latency per label & method) serta ringkasan per rerun app
+  (berapa call & berapa detik satu rerun menunggu Google)
+- InstrumentedWorksheet: proxy worksheet gspread yang mencatat setiap
+  method API; record_call untuk request lain (open_by_url, worksheet)
+- sheet_action(label, budget): menandai call-site (context manager /
+  decorator) dan membatasi jumlah call per aksi. Pelanggaran budget
+  selalu dicatat; dengan BPP_SHEETS_STRICT_BUDGET=1 atau
+  get_sheet_metrics().strict_budget = True (benchmark / test) aksi
+  tersebut raise SheetCallBudgetExceeded.
+- log terstruktur: satu baris JSON per call / pelanggaran budget ke file
+  BPP_SHEETS_LOG ("-" = stdout). Default mati.
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import contextlib
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+# File log JSON lines (kosong = tidak menulis log, "-" = stdout)
+LOG_PATH = os.environ.get("BPP_SHEETS_LOG", "")
+
+# Aksi yang melebihi budget API call langsung raise (untuk benchmark / test)
+STRICT_BUDGET = os.environ.get("BPP_SHEETS_STRICT_BUDGET", "").lower() in ("1", "true", "yes")
+
+# Batas atas bucket histogram latency (milidetik); bucket terakhir = sisanya
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Jumlah ringkasan rerun terakhir yang disimpan untuk histogram per rerun
+RERUN_HISTORY = 200
+
+# Method worksheet gspread yang berupa request ke Google API
+WORKSHEET_METHODS = (
+    "get_all_values",
+    "batch_get",
+    "batch_update",
+    "update",
+    "update_cell",
+    "append_row",
+    "delete_rows",
+)
+
+# Label call di luar sheet_action mana pun
+UNLABELED = "(tanpa label)"
+
+_rerun_ids = itertools.count(1)
+
+
+class SheetCallBudgetExceeded(RuntimeError):
+    """Satu aksi memakai lebih banyak API call daripada budget-nya."""
+
+
+def payload_size(value):
+    """Perkiraan ukuran payload (byte UTF-8 isi sel) untuk list / dict nilai sel."""
+    if value is None:
+        return 0
+    if isinstance(value, dict):
+        return sum(payload_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(v) for v in value)
+    return len(str(value).encode("utf-8"))
+
+
+def bucket_label(i):
+    if i < len(LATENCY_BUCKETS_MS):
+        return f"<= {LATENCY_BUCKETS_MS[i]} ms"
+    return f"> {LATENCY_BUCKETS_MS[-1]} ms"
+
+
+def _bucket_index(seconds):
+    ms = seconds * 1000
+    for i, limit in enumerate(LATENCY_BUCKETS_MS):
+        if ms <= limit:
+            return i
+    return len(LATENCY_BUCKETS_MS)
+
+
+class _CallStats:
+    """Agregat untuk satu pasangan (label, method)."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, seconds, sent, received, error):
+        self.count += 1
+        self.errors += error is not None
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.buckets[_bucket_index(seconds)] += 1
+
+    def percentile_ms(self, q):
+        """Perkiraan persentil dari histogram (batas atas bucket)."""
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                if i < len(LATENCY_BUCKETS_MS):
+                    return LATENCY_BUCKETS_MS[i]
+                return round(self.max_seconds * 1000, 1)
+        return None
+
+
+class RerunMetrics:
+    """Call Google Sheets selama satu rerun app (thread script Streamlit)."""
+
+    def __init__(self):
+        self.id = next(_rerun_ids)
+        self.started_at = time.time()
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.by_label = {}
+
+    def add(self, label, seconds, error):
+        self.calls += 1
+        self.errors += error is not None
+        self.seconds += seconds
+        self.by_label[label] = self.by_label.get(label, 0) + 1
+
+    def summary(self):
+        return {
+            "rerun": self.id,
+            "calls": self.calls,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 4),
+            "by_label": dict(self.by_label),
+        }
+
+
+class _ActionScope:
+    def __init__(self, label, budget):
+        self.label = label
+        self.budget = budget
+        self.calls = 0
+
+
+class SheetMetrics:
+    """Agregat call Google Sheets per proses + per rerun (thread-local)."""
+
+    def __init__(self, log_path=LOG_PATH, strict_budget=STRICT_BUDGET):
+        self.log_path = log_path
+        self.strict_budget = strict_budget
+        self._stats = {}
+        self._violations = []
+        self._reruns = deque(maxlen=RERUN_HISTORY)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._log_file = None
+
+    # ============ CALL-SITE & RERUN ============
+    def _scopes(self):
+        scopes = getattr(self._local, "scopes", None)
+        if scopes is None:
+            scopes = self._local.scopes = []
+        return scopes
+
+    def current_label(self):
+        scopes = self._scopes()
+        return scopes[-1].label if scopes else UNLABELED
+
+    @contextlib.contextmanager
+    def action(self, label, budget=None):
+        """Call di dalam blok ini diberi label; jumlahnya dicek terhadap budget."""
+        scope = _ActionScope(label, budget)
+        scopes = self._scopes()
+        scopes.append(scope)
+        ok = False
+        try:
+            yield scope
+            ok = True
+        finally:
+            scopes.pop()
+            if budget is not None and scope.calls > budget:
+                self._budget_exceeded(scope, raise_error=ok and self.strict_budget)
+
+    def _budget_exceeded(self, scope, raise_error):
+        violation = {
+            "event": "budget_exceeded",
+            "label": scope.label,
+            "calls": scope.calls,
+            "budget": scope.budget,
+            "ts": time.time(),
+        }
+        with self._lock:
+            self._violations.append(violation)
+            del self._violations[:-100]
+        self._log(violation)
+        if raise_error:
+            raise SheetCallBudgetExceeded(
+                f"Aksi '{scope.label}' memakai {scope.calls} API call (budget {scope.budget})"
+            )
+
+    def begin_rerun(self):
+        """Dipanggil di awal setiap rerun app: call berikutnya di thread ini masuk rerun baru."""
+        rerun = RerunMetrics()
+        self._local.rerun = rerun
+        with self._lock:
+            self._reruns.append(rerun)
+        return rerun
+
+    def current_rerun(self):
+        return getattr(self._local, "rerun", None)
+
+    # ============ PENCATATAN ============
+    @contextlib.contextmanager
+    def record(self, method, sent=0):
+        """
+        Mencatat satu request API. Blok boleh mengisi call["received"]
+        (ukuran respons). Error diteruskan setelah dicatat.
+        """
+        call = {"received": 0}
+        error = None
+        start = time.perf_counter()
+        try:
+            yield call
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._add(method, time.perf_counter() - start, sent, call["received"], error)
+
+    def _add(self, method, seconds, sent, received, error):
+        scopes = self._scopes()
+        label = scopes[-1].label if scopes else UNLABELED
+        if scopes:
+            scopes[-1].calls += 1
+        rerun = self.current_rerun()
+        if rerun is not None:
+            rerun.add(label, seconds, error)
+
+        with self._lock:
+            stats = self._stats.get((label, method))
+            if stats is None:
+                stats = self._stats[(label, method)] = _CallStats()
+            stats.add(seconds, sent, received, error)
+
+        if self.log_path:
+            self._log(
+                {
+                    "event": "sheets_call",
+                    "ts": time.time(),
+                    "label": label,
+                    "method": method,
+                    "seconds": round(seconds, 6),
+                    "bytes_sent": sent,
+                    "bytes_received": received,
+                    "error": None if error is None else f"{type(error).__name__}: {error}",
+                    "rerun": None if rerun is None else rerun.id,
+                    "thread": threading.current_thread().name,
+                }
+            )
+
+    def _log(self, record):
+        if not self.log_path:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            if self.log_path == "-":
+                print(line, flush=True)
+                return
+            if self._log_file is None:
+                self._log_file = open(self.log_path, "a", encoding="utf-8")
+            self._log_file.write(line + "\n")
+            self._log_file.flush()
+
+    # ============ LAPORAN ============
+    def call_stats(self):
+        """Satu baris per (label, method): jumlah, error, latency & byte."""
+        with self._lock:
+            items = sorted(self._stats.items())
+        rows = []
+        for (label, method), s in items:
+            rows.append(
+                {
+                    "label": label,
+                    "method": method,
+                    "calls": s.count,
+                    "errors": s.errors,
+                    "mean_ms": round(s.seconds / s.count * 1000, 1),
+                    "p50_ms": s.percentile_ms(0.5),
+                    "p95_ms": s.percentile_ms(0.95),
+                    "max_ms": round(s.max_seconds * 1000, 1),
+                    "bytes_sent": s.bytes_sent,
+                    "bytes_received": s.bytes_received,
+                }
+            )
+        return rows
+
+    def latency_histogram(self):
+        """Histogram latency per proses: satu baris per bucket, kolom per method."""
+        with self._lock:
+            items = list(self._stats.items())
+        rows = []
+        for i in range(len(LATENCY_BUCKETS_MS) + 1):
+            row = {"latency": bucket_label(i)}
+            for (_, method), s in items:
+                row[method] = row.get(method, 0) + s.buckets[i]
+            rows.append(row)
+        return rows
+
+    def rerun_histogram(self):
+        """Sebaran jumlah call per rerun (rerun terakhir sebanyak RERUN_HISTORY)."""
+        with self._lock:
+            reruns = list(self._reruns)
+        counts = {}
+        for rerun in reruns:
+            counts[rerun.calls] = counts.get(rerun.calls, 0) + 1
+        return [{"calls_per_rerun": n, "reruns": counts[n]} for n in sorted(counts)]
+
+    def recent_reruns(self, n=20):
+        with self._lock:
+            reruns = list(self._reruns)[-n:]
+        return [rerun.summary() for rerun in reversed(reruns)]
+
+    def budget_violations(self):
+        with self._lock:
+            return list(self._violations)
+
+    def totals(self):
+        with self._lock:
+            stats = list(self._stats.values())
+        return {
+            "calls": sum(s.count for s in stats),
+            "errors": sum(s.errors for s in stats),
+            "seconds": round(sum(s.seconds for s in stats), 4),
+            "budget_violations": len(self._violations),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._violations.clear()
+            self._reruns.clear()
+
+
+@st.cache_resource
+def get_sheet_metrics():
+    """Metrik call Google Sheets bersama untuk seluruh proses."""
+    return SheetMetrics()
+
+
+def sheet_action(label, budget=None):
+    """Context manager / decorator: label call-site + budget API call aksi tersebut."""
+    return _SheetAction(label, budget)
+
+
+class _SheetAction(contextlib.ContextDecorator):
+    def __init__(self, label, budget):
+        self.label = label
+        self.budget = budget
+        self._contexts = threading.local()
+
+    def __enter__(self):
+        context = get_sheet_metrics().action(self.label, self.budget)
+        stack = getattr(self._contexts, "stack", None)
+        if stack is None:
+            stack = self._contexts.stack = []
+        stack.append(context)
+        return context.__enter__()
+
+    def __exit__(self, *exc):
+        return self._contexts.stack.pop().__exit__(*exc)
+
+
+def record_call(method, sent=0):
+    """Mencatat request API selain method worksheet (contoh: open_by_url)."""
+    return get_sheet_metrics().record(method, sent)
+
+
+class InstrumentedWorksheet:
+    """
+    Proxy worksheet gspread: method di WORKSHEET_METHODS dicatat di
+    SheetMetrics, atribut lain diteruskan apa adanya.
+    """
+
+    def __init__(self, worksheet):
+        self._worksheet = worksheet
+
+    @property
+    def wrapped(self):
+        return self._worksheet
+
+    def __getattr__(self, name):
+        attr = getattr(self._worksheet, name)
+        if name not in WORKSHEET_METHODS:
+            return attr
+
+        def call(*args, **kwargs):
+            sent = payload_size(args) + payload_size(kwargs.get("values"))
+            with record_call(name, sent) as record:
+                result = attr(*args, **kwargs)
+                if name in ("get_all_values", "batch_get"):
+                    record["received"] = payload_size(result)
+                return result
+
+        return call
+
+
+def instrument_worksheet(worksheet):
+    if worksheet is None or isinstance(worksheet, InstrumentedWorksheet):
+        return worksheet
+    return InstrumentedWorksheet(worksheet)
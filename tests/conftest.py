@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Fixture bersama untuk test
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Test berjalan tanpa kredensial Google: gsheet_handler memakai FakeClient
+(fake_gspread.py) yang dipasang lewat use_client_factory, dan
+rate limiter kuota dimatikan agar jumlah API call tidak bergantung waktu.
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+# Konfigurasi dibaca modul saat import
+os.environ.setdefault("BPP_SHEETS_READ_QUOTA", "0")
+os.environ.setdefault("BPP_SHEETS_WRITE_QUOTA", "0")
+os.environ.setdefault("BPP_WRITE_JOURNAL", "")
+
+
+@pytest.fixture
+def fake_sheet():
+    """Worksheet logs palsu berisi 10 baris data, sinkron (tanpa write-behind)."""
+    import gsheet_handler
+    from fake_gspread import FakeClient, make_sheet
+    from sheet_metrics import get_sheet_metrics
+
+    client = FakeClient(make_sheet(gsheet_handler.COLUMNS, 10))
+    gsheet_handler.use_client_factory(lambda: client)
+    write_behind = gsheet_handler.WRITE_BEHIND
+    gsheet_handler.WRITE_BEHIND = False
+    get_sheet_metrics().reset()
+    yield client.logs
+    gsheet_handler.WRITE_BEHIND = write_behind
+    gsheet_handler.use_client_factory(None)
+    get_sheet_metrics().strict_budget = False
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Test parser angka format akuntansi (accounting_parser)."""
+
+# Mengimpor beberapa library yang diperlukan
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from accounting_parser import normalize_header, parse_accounting_column, read_accounting_csv
+
+
+def parse(values):
+    series = pd.Series(values, dtype="string[pyarrow]")
+    return parse_accounting_column(series, downcast_int=False)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("  1,958,599,245 ", 1958599245),
+        ("  (135,948,923)", -135948923),
+        ("( 1,958 )", -1958),
+        ("12.5", 12.5),
+        ("-7", -7),
+        ("  -   ", 0),
+        ("(-)", 0),
+    ],
+)
+def test_valid_cells(text, expected):
+    values, invalid = parse([text])
+    assert not invalid[0]
+    assert values[0] == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["(5", "1,958)", "(-5)", "((5))", "()", "5)(", "1,95,8", "abc"],
+)
+def test_invalid_cells(text):
+    values, invalid = parse([text])
+    assert invalid[0]
+    assert np.isnan(values[0])
+
+
+def test_missing_cells_are_not_errors():
+    values, invalid = parse(["", None, "3"])
+    assert invalid.tolist() == [False, False, False]
+    assert np.isnan(values[0]) and np.isnan(values[1]) and values[2] == 3
+
+
+def test_read_csv_reports_invalid_cells():
+    csv = io.StringIO(' Produksi  (kWh) ,Biaya\n"1,000","(5"\n"(2,000)", - \n"3","(7)"\n')
+    frame, report = read_accounting_csv(csv)
+
+    assert normalize_header(" Produksi  (kWh) ") in frame.columns
+    assert frame["Produksi (kWh)"].tolist() == [1000, -2000, 3]
+    assert report[["row", "column", "value"]].values.tolist() == [[0, "Biaya", "(5"]]
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Test render pertama dashboard tidak meng-import library plot berat."""
+
+# Mengimpor beberapa library yang diperlukan
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Render di proses baru agar sys.modules tidak terpengaruh test lain
+SCRIPT = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("bpp_app.py", default_timeout=300).run()
+loaded = [m for m in ("seaborn", "shap", "matplotlib.pyplot", "tensorflow") if m in sys.modules]
+print(json.dumps({"exceptions": [str(e.value) for e in at.exception], "loaded": loaded}))
+"""
+
+
+def test_first_render_skips_heavy_plot_libraries():
+    env = dict(
+        os.environ,
+        PYTHONPATH=REPO_DIR,
+        BPP_DATASET_OFFLINE="1",
+        BPP_GSPREAD_CLIENT="fake_gspread:make_client",
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=REPO_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=600,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert result["exceptions"] == []
+    assert result["loaded"] == []
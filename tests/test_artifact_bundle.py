@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""Test bundle artefak sama dengan file artefak lepas (artifact_bundle)."""
+
+# Mengimpor beberapa library yang diperlukan
+import os
+
+from artifact_bundle import verify_bundle
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_bundle_matches_loose_artifacts():
+    # Registry memuat bundle lebih dulu: artefak lepas yang diperbarui tanpa
+    # build ulang bundle akan diam-diam menyajikan model lama
+    bundle, mismatched = verify_bundle(REPO_DIR)
+    assert mismatched == [], (
+        f"Artefak berbeda dengan bundle, jalankan `python artifact_bundle.py build`: {mismatched}"
+    )
+    for name in bundle.manifest["artifacts"]:
+        assert os.path.exists(os.path.join(REPO_DIR, name)), name
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Test ringkasan batch scoring (batch_score)."""
+
+# Mengimpor beberapa library yang diperlukan
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch_score import score_file
+from prediction import TARGET_COLUMN
+
+
+class FixedPredictor:
+    """Predictor dengan prediksi tetap (termasuk NaN) untuk menguji ringkasan."""
+
+    def __init__(self, predictions):
+        self.predictions = predictions
+
+    def predict(self, frame, models=None, use_cache=True):
+        return pd.DataFrame({key: self.predictions[key] for key in models}, index=frame.index)
+
+
+def test_mae_counts_only_rows_with_actual_and_prediction(tmp_path):
+    source = tmp_path / "input.csv"
+    pd.DataFrame(
+        {"Bulan": ["Jan-23", "Feb-23", "Mar-23", "Apr-23"], TARGET_COLUMN: [10, 20, None, 40]}
+    ).to_csv(source, index=False)
+    predictor = FixedPredictor(
+        {"ridge": [12.0, np.nan, 5.0, 36.0], "knn": [np.nan, np.nan, np.nan, np.nan]}
+    )
+
+    summary = score_file(
+        str(source), str(tmp_path / "output.csv"), models=["ridge", "knn"], predictor=predictor
+    )
+
+    # Baris 2 (prediksi kosong) dan baris 3 (BPP kosong) tidak dihitung
+    assert summary["mae_rows"] == {"ridge": 2, "knn": 0}
+    assert summary["mae"] == {"ridge": pytest.approx(3.0)}
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Test frame tampilan & snapshot dataset (data_loader)."""
+
+# Mengimpor beberapa library yang diperlukan
+import numpy as np
+import pandas as pd
+
+from data_loader import format_amount_column, format_display_frame
+
+
+def format_amount(value, decimals):
+    """Format akuntansi per sel (acuan untuk versi vectorized)."""
+    if pd.isna(value):
+        return ""
+    if value == 0:
+        return "-"
+    text = f"{abs(value):,.{decimals}f}"
+    return f"({text})" if value < 0 else text
+
+
+def test_format_amount_column_matches_scalar_format():
+    values = pd.Series(
+        [0, np.nan, 5, -5, 999, 1000, -1005, 1958599245, -135948923, 0.4, 807.8491, -0.25]
+    )
+    for decimals in (0, 3):
+        expected = [format_amount(v, decimals) for v in values]
+        assert format_amount_column(values, decimals).tolist() == expected
+
+
+def test_format_display_frame():
+    frame = pd.DataFrame(
+        {
+            "Bulan": pd.to_datetime(["2023-01-01", "2023-02-01"]),
+            "Produksi (kWh)": [299218080, 0],
+            "BPP": [807.8491, -1.5],
+        }
+    )
+    display = format_display_frame(frame)
+    assert display["Bulan"].tolist() == ["Jan-23", "Feb-23"]
+    assert display["Produksi (kWh)"].tolist() == ["299,218,080", "-"]
+    assert display["BPP"].tolist() == ["807.849", "(1.500)"]
+
+
+def test_snapshot_start_reuses_stored_views(tmp_path):
+    from data_loader import DatasetLoader, write_snapshot
+    from data_sources import LocalXlsxSource
+
+    source = LocalXlsxSource()
+    frame = source.load()
+    path = str(tmp_path / "snapshot.arrow")
+    built = DatasetLoader(source, views={"display": format_display_frame})._build_views(frame)
+    info = {"content_hash": "test", "location": source.location}
+    write_snapshot(frame, path, info, views=built)
+
+    def not_called(frame):
+        raise AssertionError("view dihitung ulang saat start dari snapshot")
+
+    loader = DatasetLoader(source, views={"display": not_called}, snapshot_path=path)
+    assert loader._load_snapshot()
+    loaded, views = loader._current
+    assert loaded.equals(frame)
+    assert views["version"].hash == built["version"].hash
+    assert views["display"].equals(built["display"])
+
+
+def test_revalidate_failure_keeps_last_snapshot():
+    import zipfile
+
+    from data_loader import DatasetLoader
+    from data_sources import InMemorySource, LocalXlsxSource
+
+    source = InMemorySource(LocalXlsxSource().load())
+    loader = DatasetLoader(source, snapshot_path=None)
+    loader.refresh(wait=True)
+    frame = loader.frame
+
+    # Isi sumber berubah tetapi rusak saat di-parse (contoh: XLSX terpotong)
+    def corrupt(body):
+        raise zipfile.BadZipFile("File is not a zip file")
+
+    source.frame = source.frame.iloc[:-1]
+    source._parse = corrupt
+    loader.refresh(wait=True)
+
+    assert loader.frame is frame
+    stats = loader.stats()
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "File is not a zip file"
+    assert not stats["refreshing"]
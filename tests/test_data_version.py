@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Test versi dataset berbasis hash isi (data_version)."""
+
+# Mengimpor beberapa library yang diperlukan
+import pandas as pd
+
+from data_version import DatasetVersion, diff_versions
+
+
+def daily_frame():
+    days = pd.date_range("2023-01-01", "2023-03-31", freq="D")
+    return pd.DataFrame({"Bulan": days, "BPP": range(len(days))})
+
+
+def test_change_in_any_row_of_month_is_detected():
+    frame = daily_frame()
+    old = DatasetVersion.from_frame(frame)
+    assert list(old.row_hashes) == ["2023-01", "2023-02", "2023-03"]
+
+    # Baris pertama (bukan terakhir) bulan Februari berubah
+    changed = frame.copy()
+    changed.loc[changed["Bulan"] == "2023-02-01", "BPP"] = -1
+    diff = diff_versions(old, DatasetVersion.from_frame(changed))
+    assert diff["changed_months"] == ["2023-02"]
+    assert diff["changed_columns"] == ["BPP"]
+    assert diff["added_months"] == diff["removed_months"] == []
+
+
+def test_same_data_with_different_dtype_has_same_version():
+    frame = daily_frame()
+    as_float = frame.assign(BPP=frame["BPP"].astype(float))
+    assert DatasetVersion.from_frame(frame).hash == DatasetVersion.from_frame(as_float).hash
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Test kecocokan engine NumPy (model_bpp_nn.npz) dengan model Keras asli."""
+
+# Mengimpor beberapa library yang diperlukan
+import os
+
+import numpy as np
+import pytest
+
+from nn_engine import DEFAULT_ATOL, DEFAULT_RTOL, _file_sha256, load_numpy_network
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KERAS_FILE = os.path.join(REPO_DIR, "model_bpp.keras")
+NUMPY_FILE = os.path.join(REPO_DIR, "model_bpp_nn.npz")
+
+
+def test_numpy_export_matches_keras_file():
+    # Export harus diulang (python nn_engine.py export) setiap model keras berubah
+    network = load_numpy_network(NUMPY_FILE)
+    assert network.metadata["source_sha256"] == _file_sha256(KERAS_FILE)
+
+
+def test_numpy_predictions_match_keras():
+    tf = pytest.importorskip("tensorflow")
+    from data_sources import LocalXlsxSource
+    from model_registry import get_model_registry
+    from prediction import to_feature_frame
+
+    network = load_numpy_network(NUMPY_FILE)
+    keras_model = tf.keras.models.load_model(KERAS_FILE)
+
+    scaler = get_model_registry().get_scaler()
+    X_dataset = scaler.transform(to_feature_frame(LocalXlsxSource().load()))
+    rng = np.random.default_rng(1)
+    X_random = rng.uniform(-0.25, 1.25, size=(500, network.n_features))
+    X = np.vstack([X_dataset, X_random]).astype(np.float32)
+
+    np.testing.assert_allclose(
+        network.predict(X), keras_model.predict(X, verbose=0), rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL
+    )
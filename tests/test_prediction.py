@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Test prediksi batch & cache prediksi (prediction)."""
+
+# Mengimpor beberapa library yang diperlukan
+import pandas as pd
+
+from data_sources import LocalXlsxSource
+from model_registry import get_model_registry
+from prediction import MODEL_ORDER, BatchPredictor, PredictionCache
+
+
+def scenarios():
+    return LocalXlsxSource().load()
+
+
+def test_cache_misses_run_in_one_pass(monkeypatch):
+    predictor = BatchPredictor(get_model_registry(), cache=PredictionCache())
+    frame = scenarios()
+    expected = predictor.predict(frame, use_cache=False)
+
+    passes = []
+    run_models = predictor._run_models
+
+    def counting(X, keys):
+        passes.append((len(X), list(keys)))
+        return run_models(X, keys)
+
+    monkeypatch.setattr(predictor, "_run_models", counting)
+    first = predictor.predict(frame)
+    assert passes == [(len(frame), MODEL_ORDER)]
+    pd.testing.assert_frame_equal(first, expected)
+
+    # Sebagian baris sudah di-cache untuk satu model saja: tetap satu pass
+    predictor.cache.clear()
+    predictor.predict(frame.iloc[:5], models=["ridge"])
+    passes.clear()
+    second = predictor.predict(frame)
+    assert passes == [(len(frame), MODEL_ORDER)]
+    pd.testing.assert_frame_equal(second, expected)
+
+    # Semua baris sudah di-cache: model tidak dijalankan
+    passes.clear()
+    predictor.predict(frame)
+    assert passes == []
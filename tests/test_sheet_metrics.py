@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Test budget API call per aksi handler sheet logs (sheet_metrics, strict)."""
+
+# Mengimpor beberapa library yang diperlukan
+import pytest
+
+import gsheet_handler
+from sheet_metrics import SheetCallBudgetExceeded, get_sheet_metrics, sheet_action
+
+
+@pytest.fixture
+def strict_metrics(fake_sheet):
+    metrics = get_sheet_metrics()
+    metrics.strict_budget = True
+    return metrics
+
+
+def test_handler_actions_within_budget(fake_sheet, strict_metrics):
+    # connect + load_logs
+    gsheet_handler.begin_rerun()
+    assert gsheet_handler.get_penjualan_value() is not None
+    gsheet_handler.invalidate_logs()
+    gsheet_handler.read_all_data()
+
+    assert gsheet_handler.update_component("komponen_a", 111)
+    assert gsheet_handler.update_detailed_row({"komponen_b": 222, "price_b": 1.5})
+    assert gsheet_handler.delete_current_period_row()
+
+    labels = {row["label"] for row in strict_metrics.call_stats()}
+    assert set(gsheet_handler.CALL_BUDGETS) - {"write_behind"} <= labels
+    assert strict_metrics.budget_violations() == []
+
+
+def test_write_behind_flush_within_budget(fake_sheet, strict_metrics):
+    gsheet_handler.get_write_queue.clear()
+    gsheet_handler.WRITE_BEHIND = True
+    gsheet_handler.get_logs_snapshot()
+
+    assert gsheet_handler.update_component("komponen_d", 444)
+    queue = gsheet_handler.get_write_queue()
+    assert queue.wait_idle(10)
+
+    assert queue.failed() == []
+    data = fake_sheet.dump()
+    assert dict(zip(data[0], data[-1]))["komponen_d"] == "444"
+    assert "write_behind" in {row["label"] for row in strict_metrics.call_stats()}
+    assert strict_metrics.budget_violations() == []
+
+
+def test_action_over_budget_raises(fake_sheet, strict_metrics):
+    worksheet = gsheet_handler.get_logs_worksheet()
+
+    with pytest.raises(SheetCallBudgetExceeded):
+        with sheet_action("baca_dobel", budget=1):
+            worksheet.get_all_values()
+            worksheet.get_all_values()
+
+    violation = strict_metrics.budget_violations()[-1]
+    assert (violation["label"], violation["calls"], violation["budget"]) == ("baca_dobel", 2, 1)
+
+
+def test_action_over_budget_only_recorded_when_not_strict(fake_sheet):
+    metrics = get_sheet_metrics()
+    worksheet = gsheet_handler.get_logs_worksheet()
+
+    with sheet_action("baca_dobel", budget=1):
+        worksheet.get_all_values()
+        worksheet.get_all_values()
+
+    assert metrics.budget_violations()[-1]["label"] == "baca_dobel"
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Test jumlah API call & isi sel per aksi simpan / baca sheet logs (gsheet_handler)."""
+
+# Mengimpor beberapa library yang diperlukan
+import pytest
+
+import gsheet_handler
+
+# Batas API call Google Sheets per aksi (koneksi worksheet sudah di-cache)
+MAX_CALLS_PER_SAVE = 2
+MAX_CALLS_PER_READ = 1
+
+
+def last_row(worksheet):
+    data = worksheet.dump()
+    return dict(zip(data[0], data[-1]))
+
+
+def calls_during(worksheet, action):
+    # Seperti rerun app: snapshot logs & koneksi sudah ada sebelum user menyimpan
+    gsheet_handler.get_logs_snapshot()
+    before = worksheet.api_calls
+    result = action()
+    return result, worksheet.api_calls - before
+
+
+def test_update_component(fake_sheet):
+    ok, calls = calls_during(fake_sheet, lambda: gsheet_handler.update_component("komponen_a", 111))
+    assert ok
+    assert calls <= MAX_CALLS_PER_SAVE
+    assert fake_sheet.calls["batch_update"] == 1
+    assert last_row(fake_sheet)["komponen_a"] == "111"
+    assert len(fake_sheet.dump()) == 11
+
+
+def test_update_detailed_row(fake_sheet):
+    changes = {"komponen_c_batubara": 333, "vol_batubara_kg": "1.500", "harga_batubara_rp": 1023}
+    ok, calls = calls_during(fake_sheet, lambda: gsheet_handler.update_detailed_row(changes))
+    assert ok
+    assert calls <= MAX_CALLS_PER_SAVE
+    row = last_row(fake_sheet)
+    assert (row["komponen_c_batubara"], row["vol_batubara_kg"], row["harga_batubara_rp"]) == (
+        "333",
+        "1.500",
+        "1023",
+    )
+    # Kolom lain di baris yang sama tidak ikut berubah
+    assert row["komponen_a"] == "1"
+
+
+def test_delete_current_period_row(fake_sheet):
+    before = fake_sheet.dump()
+    ok, calls = calls_during(fake_sheet, gsheet_handler.delete_current_period_row)
+    assert ok
+    assert calls <= MAX_CALLS_PER_SAVE
+    assert fake_sheet.dump() == before[:-1]
+
+
+@pytest.mark.parametrize(
+    "read, expected_calls",
+    [
+        # Cache ditandai basi: pembacaan berikutnya memuat ulang sheet
+        (lambda: (gsheet_handler.invalidate_logs(), gsheet_handler.read_all_data())[1], 1),
+        # Nilai diambil dari snapshot yang sudah di-cache
+        (gsheet_handler.get_penjualan_value, 0),
+    ],
+    ids=["read_all_data", "get_penjualan_value"],
+)
+def test_read_calls(fake_sheet, read, expected_calls):
+    data, calls = calls_during(fake_sheet, read)
+    assert data is not None
+    assert calls == expected_calls <= MAX_CALLS_PER_READ
+
+
+def test_update_component_on_empty_sheet(fake_sheet):
+    del fake_sheet.rows[1:]
+    gsheet_handler.invalidate_logs()
+    ok, calls = calls_during(fake_sheet, lambda: gsheet_handler.update_component("komponen_d", 444))
+    assert ok
+    assert calls <= MAX_CALLS_PER_SAVE
+    data = fake_sheet.dump()
+    assert len(data) == 2
+    assert dict(zip(data[0], data[1]))["komponen_d"] == "444"
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Test optimistic update & journal antrian write-behind (gsheet_handler)."""
+
+# Mengimpor beberapa library yang diperlukan
+import pandas as pd
+import pytest
+
+import gsheet_handler
+from fake_gspread import FakeClient
+from write_behind import FAILED, WriteBehindQueue, WriteIntent
+
+# Sheet lama: header lebih pendek dari COLUMNS
+LEGACY_HEADER = ["timestamp", "komponen_a", "komponen_b", "komponen_c", "komponen_d", "penjualan"]
+
+
+@pytest.fixture
+def legacy_sheet(fake_sheet):
+    """Worksheet logs palsu dengan header lama (6 kolom) dan 2 baris data."""
+    client = FakeClient(
+        [
+            LEGACY_HEADER,
+            ["2025-01-01 00:00:00", "1", "2", "3", "4", "5"],
+            ["2025-02-01 00:00:00", "6", "7", "8", "9", "10"],
+        ]
+    )
+    gsheet_handler.use_client_factory(lambda: client)
+    return client.logs
+
+
+def assert_overlay_matches_flush(intent):
+    """Overlay sebelum intent ditulis harus sama dengan isi sheet setelah ditulis."""
+    base = gsheet_handler.get_logs_snapshot()
+    overlay = gsheet_handler._with_pending_writes(base, [intent])
+
+    gsheet_handler._flush_write(intent)
+    gsheet_handler.invalidate_logs()
+    flushed = gsheet_handler.get_logs_snapshot()
+
+    assert overlay.header == flushed.header
+    pd.testing.assert_frame_equal(overlay.frame, flushed.frame)
+    return flushed
+
+
+def test_pending_reset_on_short_header(legacy_sheet):
+    flushed = assert_overlay_matches_flush(WriteIntent("reset", target=3))
+
+    assert len(flushed.frame) == 1
+    row = flushed.current_row()
+    assert (row["komponen_a"], row["komponen_d"]) == (1, 4)
+    # Kolom yang tidak ada di sheet lama bernilai 0
+    assert row["price_a"] == 0
+
+
+def test_pending_change_on_short_header_matches_fixed_header(legacy_sheet):
+    intent = WriteIntent(
+        "component", {"komponen_a": 99, "price_a": 1.5, "timestamp": "2025-02-02 00:00:00"}
+    )
+    flushed = assert_overlay_matches_flush(intent)
+
+    # Header ditimpa COLUMNS (_fix_header), nilai lama tetap di posisinya
+    assert flushed.header == gsheet_handler.COLUMNS
+    assert legacy_sheet.rows[2][: len(LEGACY_HEADER)] == ["2025-02-02 00:00:00", "99", "1.5", "8", "9", "10"]
+    row = flushed.current_row()
+    assert (row["komponen_a"], row["price_a"]) == (99, 1.5)
+    assert len(flushed.frame) == 2
+
+
+def test_pending_returns_copies():
+    queue = WriteBehindQueue(lambda intent: None)
+    queue._ensure_started = lambda: None  # Worker tidak dijalankan
+    queue.submit("component", {"komponen_a": 1})
+    intent = queue.pending()[0]
+
+    queue.submit("component", {"komponen_b": 2})
+    assert intent.changes == {"komponen_a": 1}
+    assert queue.pending()[0].changes == {"komponen_a": 1, "komponen_b": 2}
+
+
+def test_journal_restores_failed_and_pending(tmp_path):
+    journal = str(tmp_path / "journal.json")
+
+    def fail(intent):
+        raise ConnectionError("sheet tidak tersedia")
+
+    queue = WriteBehindQueue(fail, max_attempts=1, journal=journal)
+    queue.submit("component", {"komponen_a": 1})
+    queue.submit("reset", target=3)
+    assert queue.wait_idle(5)
+    assert [i.status for i in queue.pending()] == [FAILED, "pending"]
+
+    # Proses baru: intent dari journal dimuat ulang, yang gagal tetap menunggu retry
+    written = []
+    restored = WriteBehindQueue(written.append, journal=journal)
+    assert restored.stats()["restored"] == 2
+    assert [(i.kind, i.changes, i.status) for i in restored.failed()] == [
+        ("component", {"komponen_a": 1}, FAILED)
+    ]
+
+    restored.retry_failed()
+    assert restored.wait_idle(5)
+    assert [(i.kind, i.changes, i.target) for i in written] == [
+        ("component", {"komponen_a": 1}, None),
+        ("reset", None, 3),
+    ]
+    assert WriteBehindQueue(fail, journal=journal).pending() == []
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Antrian Write-Behind untuk Penyimpanan ke Google Sheets
+PT. PLN Indonesia Power Suralaya Unit 8
+
+Simpan komponen dari beberapa divisi tidak lagi memblok sesi Streamlit
+menunggu gspread. Setiap simpan menjadi "intent" yang langsung di-ack
+(tampilan memakai optimistic update), lalu satu thread worker per proses
+menuliskannya ke sheet:
+
+- intent berisi perubahan kolom (changes) dengan jenis yang sama yang
+  antre berurutan digabung menjadi satu penulisan (nilai terakhir menang)
+- intent tanpa changes (contoh: reset) menjadi pembatas; urutan antar
+  intent selalu dipertahankan
+- gagal (contoh: 429 / error jaringan) diulang dengan exponential backoff
+  + jitter; setelah BPP_WRITE_MAX_ATTEMPTS percobaan intent ditandai
+  "failed" dan antrian berhenti di intent itu (agar urutan tidak tertukar)
+  sampai diulang lewat retry_failed. Tidak ada penulisan yang dibuang.
+- jika journal diberikan, isi antrian (termasuk intent "failed") disimpan
+  ke file JSON lokal setiap kali berubah dan dimuat ulang saat antrian
+  dibuat, sehingga simpan yang belum tertulis tidak hilang saat proses
+  restart. Intent yang sudah tertulis tetapi belum sempat dihapus dari
+  journal akan ditulis ulang; aman karena perubahan kolom idempoten dan
+  reset hanya menghapus baris yang jumlahnya cocok.
+
+Batasan: journal bersifat lokal per instance. Pada hosting tanpa disk
+persisten (contoh: container yang dibuat ulang) intent yang antre tetap
+hilang, dan selama ada intent "failed" semua simpan berikutnya ikut
+menunggu sampai admin menekan "Coba Simpan Lagi".
+
+Konfigurasi lewat environment:
+- BPP_WRITE_MAX_ATTEMPTS  : jumlah percobaan per intent (default 6)
+- BPP_WRITE_BACKOFF       : jeda awal backoff dalam detik (default 1)
+- BPP_WRITE_BACKOFF_MAX   : jeda maksimum backoff dalam detik (default 60)
+"""
+
+# Mengimpor beberapa library yang diperlukan
+import copy
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+MAX_ATTEMPTS = int(os.environ.get("BPP_WRITE_MAX_ATTEMPTS", "6"))
+BACKOFF_SECONDS = float(os.environ.get("BPP_WRITE_BACKOFF", "1"))
+BACKOFF_MAX_SECONDS = float(os.environ.get("BPP_WRITE_BACKOFF_MAX", "60"))
+
+# Status intent
+PENDING = "pending"
+FLUSHING = "flushing"
+RETRYING = "retrying"
+FAILED = "failed"
+DONE = "done"
+
+_ids = itertools.count(1)
+
+
+class WriteIntent:
+    """
+    Satu aksi simpan user.
+    - kind  : jenis penulisan (ditentukan pemakai antrian)
+    - changes: kolom -> nilai, atau None untuk aksi tanpa data (reset)
+    - target : data tambahan aksi (contoh: nomor baris yang dihapus)
+    """
+
+    def __init__(self, kind, changes=None, target=None):
+        self.id = next(_ids)
+        self.kind = kind
+        self.changes = None if changes is None else dict(changes)
+        self.target = target
+        self.status = PENDING
+        self.attempts = 0
+        self.error = None
+        self.created_at = time.time()
+        self.merged = 1
+
+    def describe(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "columns": None if self.changes is None else ", ".join(self.changes),
+            "status": self.status,
+            "attempts": self.attempts,
+            "merged": self.merged,
+            "error": self.error,
+        }
+
+    def snapshot(self):
+        """Salinan intent (changes ikut disalin) untuk dibaca di luar lock antrian."""
+        intent = copy.copy(self)
+        if self.changes is not None:
+            intent.changes = dict(self.changes)
+        return intent
+
+    def to_journal(self):
+        # Intent yang sedang / akan diulang ditulis ulang dari awal setelah restart
+        return {
+            "kind": self.kind,
+            "changes": self.changes,
+            "target": self.target,
+            "status": FAILED if self.status == FAILED else PENDING,
+            "error": self.error,
+            "created_at": self.created_at,
+            "merged": self.merged,
+        }
+
+    @classmethod
+    def from_journal(cls, data):
+        intent = cls(data["kind"], data.get("changes"), data.get("target"))
+        intent.status = data.get("status", PENDING)
+        intent.error = data.get("error")
+        intent.created_at = data.get("created_at", intent.created_at)
+        intent.merged = data.get("merged", 1)
+        return intent
+
+
+def backoff_delay(attempt, base=BACKOFF_SECONDS, maximum=BACKOFF_MAX_SECONDS):
+    """Exponential backoff dengan jitter (50-100% dari jeda penuh)."""
+    return min(maximum, base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+def _json_value(value):
+    # Nilai numpy (contoh: np.int64 dari frame) disimpan sebagai angka Python
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class WriteBehindQueue:
+    """
+    Antrian intent dengan satu thread worker.
+
+    apply(intent)      : menulis intent ke sheet, raise jika gagal
+    after_flush(intent): dipanggil setelah intent tertulis (contoh: refresh
+                         cache baca) sebelum intent dilepas dari antrian,
+                         sehingga optimistic update tidak pernah "hilang"
+    journal            : path file JSON untuk menyimpan isi antrian (None =
+                         hanya di memori)
+    """
+
+    def __init__(
+        self,
+        apply,
+        after_flush=None,
+        max_attempts=MAX_ATTEMPTS,
+        backoff=backoff_delay,
+        journal=None,
+    ):
+        self.apply = apply
+        self.after_flush = after_flush
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.journal = journal
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = None
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "flushed": 0,
+            "retries": 0,
+            "failures": 0,
+            "restored": 0,
+            "journal_errors": 0,
+        }
+        self.journal_error = None
+
+        # Intent yang belum tertulis sebelum proses restart dilanjutkan
+        self._intents = self._load_journal()
+        self._stats["restored"] = len(self._intents)
+        if self._intents:
+            self._idle.clear()
+            self._ensure_started()
+            self._wakeup.set()
+
+    # ============ JOURNAL ============
+    def _load_journal(self):
+        if not self.journal or not os.path.exists(self.journal):
+            return []
+        try:
+            with open(self.journal, encoding="utf-8") as f:
+                return [WriteIntent.from_journal(item) for item in json.load(f)]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Journal rusak tidak boleh menghentikan app; file dibiarkan untuk diperiksa
+            self.journal_error = f"Journal tidak dapat dibaca: {e}"
+            self._stats["journal_errors"] += 1
+            return []
+
+    def _save_journal(self):
+        """Menulis isi antrian ke journal (dipanggil dengan _lock dipegang)."""
+        if not self.journal:
+            return
+        tmp_path = f"{self.journal}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump([i.to_journal() for i in self._intents], f, default=_json_value)
+            os.replace(tmp_path, self.journal)
+        except (OSError, TypeError, ValueError) as e:
+            # Simpan tetap diterima (di memori); kegagalan journal dicatat untuk admin
+            self.journal_error = f"Journal tidak dapat ditulis: {e}"
+            self._stats["journal_errors"] += 1
+
+    # ============ PRODUSEN ============
+    def submit(self, kind, changes=None, target=None):
+        """
+        Menambahkan intent dan langsung kembali (tidak menunggu sheet).
+        Jika intent terakhir di antrian berjenis sama dan belum mulai
+        ditulis, changes digabung ke intent itu.
+        """
+        with self._lock:
+            self._stats["submitted"] += 1
+            last = self._intents[-1] if self._intents else None
+            if (
+                changes is not None
+                and last is not None
+                and last.kind == kind
+                and last.changes is not None
+                and last.status == PENDING
+            ):
+                last.changes.update(changes)
+                last.merged += 1
+                self._stats["coalesced"] += 1
+                intent = last
+            else:
+                intent = WriteIntent(kind, changes, target)
+                self._intents.append(intent)
+            self._save_journal()
+            self._idle.clear()
+        self._ensure_started()
+        self._wakeup.set()
+        return intent
+
+    def pending(self):
+        """
+        Salinan semua intent yang belum tertulis (urut), dipakai untuk
+        optimistic update. Disalin di bawah lock agar changes tidak berubah
+        (digabung submit lain) saat dibaca.
+        """
+        with self._lock:
+            return [intent.snapshot() for intent in self._intents]
+
+    def failed(self):
+        with self._lock:
+            return [i.snapshot() for i in self._intents if i.status == FAILED]
+
+    def retry_failed(self):
+        """Mengantrekan ulang semua intent yang gagal (urutan tetap)."""
+        with self._lock:
+            failed = [i for i in self._intents if i.status == FAILED]
+            for intent in failed:
+                intent.status, intent.attempts, intent.error = PENDING, 0, None
+            if failed:
+                self._save_journal()
+                self._idle.clear()
+        self._ensure_started()
+        self._wakeup.set()
+        return len(failed)
+
+    def wait_idle(self, timeout=None):
+        """Menunggu sampai worker tidak punya intent yang bisa ditulis."""
+        return self._idle.wait(timeout)
+
+    # ============ WORKER ============
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="bpp-write-behind", daemon=True
+                )
+                self._thread.start()
+
+    def _next(self):
+        with self._lock:
+            # Intent ditulis berurutan: berhenti di intent gagal pertama
+            intent = self._intents[0] if self._intents else None
+            if intent is None or intent.status != PENDING:
+                self._idle.set()
+                return None
+            intent.status = FLUSHING
+            return intent
+
+    def _run(self):
+        while True:
+            intent = self._next()
+            if intent is None:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            self._flush(intent)
+
+    def _flush(self, intent):
+        while True:
+            intent.attempts += 1
+            try:
+                self.apply(intent)
+                break
+            except Exception as e:
+                intent.error = str(e)
+                if intent.attempts >= self.max_attempts:
+                    with self._lock:
+                        intent.status = FAILED
+                        self._stats["failures"] += 1
+                        self._save_journal()
+                    return
+                intent.status = RETRYING
+                self._stats["retries"] += 1
+                time.sleep(self.backoff(intent.attempts))
+
+        if self.after_flush is not None:
+            try:
+                self.after_flush(intent)
+            except Exception as e:
+                intent.error = str(e)
+        with self._lock:
+            intent.status = DONE
+            self._intents.remove(intent)
+            self._stats["flushed"] += 1
+            self._save_journal()
+
+    def stats(self):
+        with self._lock:
+            counts = {
+                status: sum(i.status == status for i in self._intents)
+                for status in (PENDING, FLUSHING, RETRYING, FAILED)
+            }
+        return {**counts, **self._stats, "journal_error": self.journal_error}